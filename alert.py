@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-19 20:12:37 krylon>
+#
+# /data/code/python/wetterfrosch/alert.py
+# created on 19. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+wetterfrosch.alert
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import logging
+import sys
+import time
+from queue import Empty, SimpleQueue
+from threading import Thread
+from typing import Any, Callable, Final, Optional
+
+from wetterfrosch import common
+from wetterfrosch.data import WeatherWarning
+
+# The time (in seconds) to wait for more warnings after the first one
+# arrived, so they can be shown together.
+WINDOW: Final[float] = 2.0
+
+# The minimum time (in seconds) between two batches of notifications.
+GAP: Final[float] = 30.0
+
+# The maximum number of notifications per batch. If there are more groups
+# of warnings, the rest is summarized in one more notification.
+LIMIT: Final[int] = 3
+
+# After the first failure to display a notification, wait this many seconds
+# before trying again. The delay doubles with each failure, up to MAX_BACKOFF.
+BACKOFF: Final[float] = 30.0
+MAX_BACKOFF: Final[float] = 900.0
+
+# The maximum number of regions to list in a summary.
+MAX_NAMES: Final[int] = 5
+
+
+def by_event(w: WeatherWarning) -> str:
+    """Group warnings by event."""
+    return w.event
+
+
+def by_region(w: WeatherWarning) -> str:
+    """Group warnings by region."""
+    return w.region_name
+
+
+# pylint: disable-msg=R0902
+class Alerter:
+    """Alerter displays desktop notifications for new warnings in a
+    background thread, so a slow or unavailable notification daemon does not
+    block the UI.
+    Warnings arriving within <window> seconds of each other are grouped
+    by <key> (by event, unless given otherwise). Each group gets one
+    notification. A batch holds at most <limit> notifications, and batches
+    are at least <gap> seconds apart. If displaying a notification fails,
+    the notifications of the following <backoff> seconds are dropped.
+    <send> is called on the Alerter's thread. If the notification library
+    must be used from the UI thread, <send> has to hand the notification
+    over and raise if showing it fails."""
+
+    __slots__ = [
+        "log",
+        "send",
+        "key",
+        "window",
+        "gap",
+        "limit",
+        "backoff",
+        "queue",
+        "last_batch",
+        "delay",
+        "mute_until",
+        "worker",
+    ]
+
+    log: logging.Logger
+    send: Callable[[str, str], Any]
+    key: Callable[[WeatherWarning], str]
+    window: float
+    gap: float
+    limit: int
+    backoff: float
+    queue: SimpleQueue[Optional[WeatherWarning]]
+    last_batch: float
+    delay: float
+    mute_until: float
+    worker: Optional[Thread]
+
+    # pylint: disable-msg=R0913,R0917
+    def __init__(self,
+                 send: Callable[[str, str], Any],
+                 key: Callable[[WeatherWarning], str] = by_event,
+                 window: float = WINDOW,
+                 gap: float = GAP,
+                 limit: int = LIMIT,
+                 backoff: float = BACKOFF) -> None:
+        self.log = common.get_logger("alert")
+        self.send = send
+        self.key = key
+        self.window = window
+        self.gap = gap
+        self.limit = limit
+        self.backoff = backoff
+        self.queue = SimpleQueue()
+        self.last_batch = -gap
+        self.delay = 0.0
+        self.mute_until = 0.0
+        self.worker = None
+
+    def start(self) -> None:
+        """Start the background thread."""
+        self.worker = Thread(target=self._worker, daemon=True)
+        self.worker.start()
+
+    def stop(self) -> None:
+        """Stop the background thread. Warnings that have not been shown,
+        yet, are dropped."""
+        self.queue.put(None)
+
+    def alert(self, w: WeatherWarning) -> None:
+        """Show a notification for <w>, eventually."""
+        self.queue.put(w)
+
+    def messages(self, batch: list[WeatherWarning]) -> list[tuple[str, str]]:
+        """Turn a batch of warnings into at most <limit> notifications, each
+        consisting of a summary and a body."""
+        groups: dict[str, list[WeatherWarning]] = {}
+        for w in batch:
+            groups.setdefault(self.key(w), []).append(w)
+        # The most severe warnings go first.
+        ranked: Final[list[list[WeatherWarning]]] = \
+            sorted(groups.values(), key=lambda g: -max(w.level for w in g))
+
+        # If there are too many groups, keep one notification for the rest.
+        cut: Final[int] = len(ranked) if len(ranked) <= self.limit else self.limit - 1
+        msg: list[tuple[str, str]] = []
+        for group in ranked[:cut]:
+            if len(group) == 1:
+                msg.append((group[0].headline, group[0].description))
+            else:
+                msg.append((f"{len(group)} Warnungen: {self.key(group[0])}",
+                            self.__names(sorted({w.region_name for w in group}))))
+        rest: Final[list[list[WeatherWarning]]] = ranked[len(msg):]
+        if len(rest) > 0:
+            msg.append((f"{sum(len(g) for g in rest)} weitere Warnungen",
+                        self.__names([self.key(g[0]) for g in rest])))
+        return msg
+
+    @staticmethod
+    def __names(names: list[str]) -> str:
+        if len(names) <= MAX_NAMES:
+            return ", ".join(names)
+        return ", ".join(names[:MAX_NAMES]) + f" und {len(names) - MAX_NAMES} weitere"
+
+    def _collect(self, first: WeatherWarning) -> Optional[list[WeatherWarning]]:
+        """Collect the warnings arriving until the batch is due.
+        Returns None if the Alerter was stopped in the meantime."""
+        batch: Final[list[WeatherWarning]] = [first]
+        due: Final[float] = max(time.monotonic() + self.window,
+                                self.last_batch + self.gap)
+        while (remaining := due - time.monotonic()) > 0:
+            try:
+                w = self.queue.get(timeout=remaining)
+            except Empty:
+                break
+            if w is None:
+                return None
+            batch.append(w)
+        return batch
+
+    def _dispatch(self, batch: list[WeatherWarning]) -> None:
+        """Display the notifications for a batch of warnings."""
+        now: Final[float] = time.monotonic()
+        self.last_batch = now
+        if now < self.mute_until:
+            self.log.info("Drop notifications for %d warnings, notifications failed recently",  # noqa: E501
+                          len(batch))
+            return
+        for summary, body in self.messages(batch):
+            try:
+                self.send(summary, body)
+            except:  # noqa: E722,B001  pylint: disable-msg=W0702
+                self.delay = min(max(self.delay * 2, self.backoff), MAX_BACKOFF)
+                self.mute_until = time.monotonic() + self.delay
+                self.log.error("Failed to display notification, pause for %d seconds: %s",  # noqa: E501
+                               self.delay,
+                               sys.exception())
+                return
+        self.delay = 0.0
+
+    def _worker(self) -> None:
+        while (first := self.queue.get()) is not None:
+            batch = self._collect(first)
+            if batch is None:
+                break
+            try:
+                self._dispatch(batch)
+            except:  # noqa: E722,B001  pylint: disable-msg=W0702
+                self.log.error("Failed to process %d warnings: %s",
+                               len(batch),
+                               sys.exception())
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
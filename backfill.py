@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-19 11:27:05 krylon>
+#
+# /data/code/python/wetterfrosch/backfill.py
+# created on 19. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+wetterfrosch.backfill
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import json
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Final, Iterator, Optional
+
+from wetterfrosch import common
+from wetterfrosch.client import ENVELOPE_PAT
+from wetterfrosch.data import WeatherWarning
+from wetterfrosch.database import Database
+
+# The number of warnings to insert per transaction.
+BATCH_SIZE: Final[int] = 50_000
+
+# Log progress every so many files.
+PROGRESS_INTERVAL: Final[int] = 100
+
+# The number of files per worker process that are parsed ahead of the
+# import. Parsed warnings wait in memory until they are imported, so this
+# bounds the memory used by a large backfill.
+READ_AHEAD: Final[int] = 4
+
+
+def parse_file(path: str) -> tuple[str, list[WeatherWarning], str]:
+    """Parse an archived payload from the DWD.
+    The file may contain either plain JSON or the JSONP envelope the DWD
+    serves the data in.
+    This runs in a worker process, so instead of raising exceptions,
+    it returns the path, the warnings and an error message, which is empty
+    on success."""
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            body: str = fh.read().strip().strip("'")
+        m = ENVELOPE_PAT.match(body)  # pylint: disable-msg=C0103
+        if m is not None:
+            body = m[1]
+        records: Final[dict] = json.loads(body)
+        seen: set[str] = set()
+        warnings: list[WeatherWarning] = []
+        for block in records["warnings"].values():
+            for item in block:
+                w = WeatherWarning(item)
+                if w.cksum() not in seen:
+                    seen.add(w.cksum())
+                    warnings.append(w)
+        return (path, warnings, "")
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        return (path, [], f"{type(e).__name__}: {e}")
+
+
+def find_files(paths: list[str]) -> list[str]:
+    """Expand the given list of files and directories into a sorted list
+    of JSON files. Directories are searched recursively."""
+    files: list[str] = []
+    for p in paths:
+        if os.path.isdir(p):
+            for folder, _, names in os.walk(p):
+                files.extend(os.path.join(folder, n)
+                             for n in names if n.endswith(".json"))
+        else:
+            files.append(p)
+    return sorted(files)
+
+
+# pylint: disable-msg=R0903
+class Backfill:
+    """Backfill imports archived warnings into the database.
+    Parsing is spread across a pool of worker processes, while the
+    calling process is the only one writing to the database.
+    Warnings that are in the database already, or that were found in an
+    earlier file, are skipped, since the archived payloads of the DWD
+    overlap a lot.
+    If the import is interrupted while the indices are deferred, they are
+    re-created the next time the database is opened."""
+
+    __slots__ = [
+        "log",
+        "db",
+        "workers",
+        "batch",
+        "defer_index",
+    ]
+
+    log: logging.Logger
+    db: Database
+    workers: Optional[int]
+    batch: int
+    defer_index: bool
+
+    def __init__(self,
+                 db: Optional[Database] = None,
+                 workers: Optional[int] = None,
+                 batch: int = BATCH_SIZE,
+                 defer_index: bool = False) -> None:
+        self.log = common.get_logger("backfill")
+        self.db = db if db is not None else Database()
+        self.workers = workers
+        self.batch = batch
+        self.defer_index = defer_index
+
+    def run(self, paths: list[str]) -> int:
+        """Import all warnings from the files (or directories) in <paths>.
+        Returns the number of warnings that were added to the database."""
+        files: Final[list[str]] = find_files(paths)
+        self.log.info("Importing warnings from %d files", len(files))
+        indices: list[str] = []
+        with self.db.bulk_mode():
+            if self.defer_index:
+                indices = self.db.index_drop("warning")
+            try:
+                return self._import(files)
+            finally:
+                if len(indices) > 0:
+                    t1: Final[float] = time.time()
+                    self.db.index_create(indices)
+                    self.log.info("Re-created %d indices in %.2f seconds",
+                                  len(indices),
+                                  time.time() - t1)
+
+    def _parse(self, files: list[str]) -> \
+            Iterator[tuple[str, list[WeatherWarning], str]]:
+        """Parse <files> in the worker processes and yield the results in
+        order. Only a few files per worker are submitted ahead of the one
+        being consumed, so parsed warnings do not pile up in memory while
+        the database is busy."""
+        ahead: Final[int] = READ_AHEAD * (self.workers or os.cpu_count() or 1)
+        queue: Final[deque[Future]] = deque()
+        remaining: Final[Iterator[str]] = iter(files)
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            for path in islice(remaining, ahead):
+                queue.append(pool.submit(parse_file, path))
+            while len(queue) > 0:
+                future: Future = queue.popleft()
+                following: Optional[str] = next(remaining, None)
+                if following is not None:
+                    queue.append(pool.submit(parse_file, following))
+                yield future.result()
+
+    def _import(self, files: list[str]) -> int:
+        t_start: Final[float] = time.time()
+        seen: Final[set[str]] = self.db.warning_get_keys()
+        pending: list[WeatherWarning] = []
+        parsed: int = 0
+        added: int = 0
+        errors: int = 0
+        for idx, (path, warnings, err) in enumerate(self._parse(files), 1):
+            if err != "":
+                self.log.error("Failed to parse %s: %s", path, err)
+                errors += 1
+            parsed += len(warnings)
+            for w in warnings:
+                if w.cksum() not in seen:
+                    seen.add(w.cksum())
+                    pending.append(w)
+            if len(pending) >= self.batch:
+                added += self.db.warning_add_batch(pending)
+                pending = []
+            if idx % PROGRESS_INTERVAL == 0:
+                self._progress(idx, len(files), parsed, added, t_start)
+        if len(pending) > 0:
+            added += self.db.warning_add_batch(pending)
+        self._progress(len(files), len(files), parsed, added, t_start)
+        if errors > 0:
+            self.log.warning("%d of %d files could not be imported",
+                             errors,
+                             len(files))
+        return added
+
+    # pylint: disable-msg=R0913
+    def _progress(self,
+                  done: int,
+                  total: int,
+                  parsed: int,
+                  added: int,
+                  t_start: float) -> None:
+        elapsed: Final[float] = max(time.time() - t_start, 0.001)
+        self.log.info("%d/%d files, %d warnings parsed, %d added, "
+                      "%.1f files/s, %.0f warnings/s",
+                      done,
+                      total,
+                      parsed,
+                      added,
+                      done / elapsed,
+                      parsed / elapsed)
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-19 17:22:08 krylon>
+#
+# /data/code/python/wetterfrosch/backup.py
+# created on 19. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+wetterfrosch.backup
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import gzip
+import logging
+import os
+import re
+import shutil
+import sys
+import time
+from datetime import datetime
+from threading import Event, Thread
+from typing import Final
+
+from wetterfrosch import common
+from wetterfrosch.database import Database
+
+# The number of backups to keep.
+KEEP: Final[int] = 7
+
+# The number of pages to copy per step.
+PAGES: Final[int] = 256
+
+# The pause (in seconds) between two steps, so the backup does not hog the
+# disk while the workers are writing to the database.
+PAUSE: Final[float] = 0.05
+
+# The interval (in seconds) between two scheduled backups.
+INTERVAL: Final[int] = 86400
+
+BACKUP_PAT: Final[re.Pattern] = \
+    re.compile(rf"^{common.APP_NAME.lower()}-\d{{8}}_\d{{6}}_\d{{6}}\.db\.gz$")
+
+
+# pylint: disable-msg=R0902
+class Backup:
+    """Backup creates compressed copies of the database while it is in use,
+    using SQLite's online backup API, and deletes old copies so that only
+    the most recent ones are kept."""
+
+    __slots__ = [
+        "log",
+        "path",
+        "folder",
+        "keep",
+        "pages",
+        "pause",
+        "interval",
+        "stop_evt",
+    ]
+
+    log: logging.Logger
+    path: str
+    folder: str
+    keep: int
+    pages: int
+    pause: float
+    interval: int
+    stop_evt: Event
+
+    # pylint: disable-msg=R0913,R0917
+    def __init__(self,
+                 path: str = "",
+                 folder: str = "",
+                 keep: int = KEEP,
+                 pages: int = PAGES,
+                 pause: float = PAUSE,
+                 interval: int = INTERVAL) -> None:
+        self.log = common.get_logger("backup")
+        self.path = path
+        self.folder = folder if folder != "" else common.path.backup()
+        self.keep = keep
+        self.pages = pages
+        self.pause = pause
+        self.interval = interval
+        self.stop_evt = Event()
+
+    def backups(self) -> list[str]:
+        """Return the paths of all existing backups, oldest first."""
+        if not os.path.isdir(self.folder):
+            return []
+        return [os.path.join(self.folder, name)
+                for name in sorted(os.listdir(self.folder))
+                if BACKUP_PAT.match(name)]
+
+    def run(self) -> str:
+        """Create a new backup, then remove old ones.
+        Returns the path of the new backup."""
+        if not os.path.isdir(self.folder):
+            os.makedirs(self.folder)
+        stamp: Final[str] = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        copy: Final[str] = os.path.join(self.folder,
+                                        f"{common.APP_NAME.lower()}-{stamp}.db")
+        t1: Final[float] = time.time()
+        # The backup uses a connection of its own, so it does not get in the
+        # way of anyone else.
+        db: Final[Database] = Database(self.path)
+        try:
+            db.snapshot(copy, self.pages, self._progress)
+        finally:
+            db.close()
+
+        archive: Final[str] = f"{copy}.gz"
+        try:
+            with open(copy, "rb") as src, \
+                 gzip.open(f"{archive}.tmp", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.replace(f"{archive}.tmp", archive)
+        finally:
+            os.remove(copy)
+        self.log.info("Created backup %s (%d KiB) in %.2f seconds",
+                      archive,
+                      os.path.getsize(archive) // 1024,
+                      time.time() - t1)
+        self.rotate()
+        return archive
+
+    def rotate(self) -> list[str]:
+        """Delete all but the <keep> most recent backups.
+        Returns the paths of the deleted backups."""
+        files: Final[list[str]] = self.backups()
+        stale: Final[list[str]] = files[:max(len(files) - self.keep, 0)]
+        for path in stale:
+            self.log.debug("Remove old backup %s", path)
+            os.remove(path)
+        return stale
+
+    def _progress(self, _status: int, remaining: int, total: int) -> None:
+        self.log.debug("Backup: %d of %d pages copied", total - remaining, total)
+        if remaining > 0:
+            time.sleep(self.pause)
+
+    def start(self) -> None:
+        """Create backups regularly in a background thread."""
+        self.stop_evt.clear()
+        worker = Thread(target=self._worker, daemon=True)
+        worker.start()
+
+    def stop(self) -> None:
+        """Stop the background thread."""
+        self.stop_evt.set()
+
+    def _worker(self) -> None:
+        while not self.stop_evt.wait(self.interval):
+            try:
+                self.run()
+            except:  # noqa: E722,B001  pylint: disable-msg=W0702
+                self.log.error("Backup failed: %s", sys.exception())
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-19 14:58:44 krylon>
+#
+# /data/code/python/wetterfrosch/bench.py
+# created on 19. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+wetterfrosch.bench
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import timedelta
+from typing import Any, Final
+
+from wetterfrosch import common
+from wetterfrosch.database import Database
+from wetterfrosch.generator import Generator
+
+
+def _throughput(rows: int, seconds: float) -> dict[str, Any]:
+    return {
+        "rows": rows,
+        "seconds": seconds,
+        "rows_per_sec": rows / max(seconds, 1e-9),
+    }
+
+
+# pylint: disable-msg=R0902,R0903
+class Benchmark:
+    """Benchmark measures the performance of the storage layer on a
+    synthetic data set of configurable size."""
+
+    __slots__ = [
+        "log",
+        "folder",
+        "warnings",
+        "forecasts",
+        "hours",
+        "queries",
+        "batch",
+        "seed",
+    ]
+
+    log: logging.Logger
+    folder: str
+    warnings: int
+    forecasts: int
+    hours: int
+    queries: int
+    batch: int
+    seed: int
+
+    # pylint: disable-msg=R0913,R0917
+    def __init__(self,
+                 warnings: int = 10_000,
+                 forecasts: int = 200,
+                 hours: int = 48,
+                 queries: int = 100,
+                 batch: int = 1000,
+                 seed: int = 42,
+                 folder: str = "") -> None:
+        self.log = common.get_logger("bench")
+        self.folder = folder
+        self.warnings = warnings
+        self.forecasts = forecasts
+        self.hours = hours
+        self.queries = queries
+        self.batch = batch
+        self.seed = seed
+
+    def run(self) -> dict[str, Any]:
+        """Run the benchmark and return the results."""
+        root: str = self.folder
+        if root == "":
+            # Same as the tests, use a RAM disk if there is one.
+            parent = "/data/ram" if os.path.isdir("/data/ram") else None
+            root = tempfile.mkdtemp(prefix="wetterfrosch_bench_", dir=parent)
+        path: Final[str] = os.path.join(root, "bench.db")
+        # Logging every single insert would dominate the results.
+        dblog: Final[logging.Logger] = common.get_logger("database")
+        level: Final[int] = dblog.level
+        dblog.setLevel(logging.INFO)
+        try:
+            db = Database(path)
+            results: dict[str, Any] = {
+                "warning_add": self._ingest_warnings(db),
+                "hourly_add": self._ingest_forecasts(db),
+                "warning_get_by_period": self._query_period(db),
+            }
+            db.close()
+            results["warning_get_keys"] = self._startup_keys(path)
+            results["db_size"] = sum(os.path.getsize(path + suffix)
+                                     for suffix in ("", "-wal")
+                                     if os.path.exists(path + suffix))
+        finally:
+            dblog.setLevel(level)
+            if self.folder == "":
+                shutil.rmtree(root, ignore_errors=True)
+
+        return {
+            "timestamp": int(time.time()),
+            "version": common.APP_VERSION,
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "scale": {
+                "warnings": self.warnings,
+                "forecasts": self.forecasts,
+                "hours": self.hours,
+                "batch": self.batch,
+                "seed": self.seed,
+            },
+            "results": results,
+        }
+
+    def _ingest_warnings(self, db: Database) -> dict[str, Any]:
+        gen: Final[Generator] = Generator(self.seed)
+        elapsed: float = 0.0
+        cnt: int = 0
+        cur: Final[sqlite3.Cursor] = db.db.cursor()
+        pending: list = []
+        for w in gen.warnings(self.warnings):
+            pending.append(w)
+            if len(pending) == self.batch:
+                elapsed += self._insert_warnings(db, cur, pending)
+                cnt += len(pending)
+                pending = []
+        if len(pending) > 0:
+            elapsed += self._insert_warnings(db, cur, pending)
+            cnt += len(pending)
+        self.log.info("Added %d warnings in %.2f seconds", cnt, elapsed)
+        return _throughput(cnt, elapsed)
+
+    @staticmethod
+    def _insert_warnings(db: Database, cur: sqlite3.Cursor, warnings: list) -> float:
+        t1: Final[float] = time.perf_counter()
+        cur.execute("BEGIN")
+        for w in warnings:
+            db.warning_add(w)
+        cur.execute("COMMIT")
+        return time.perf_counter() - t1
+
+    def _ingest_forecasts(self, db: Database) -> dict[str, Any]:
+        gen: Final[Generator] = Generator(self.seed)
+        elapsed: float = 0.0
+        cnt: int = 0
+        cur: Final[sqlite3.Cursor] = db.db.cursor()
+        for fc in gen.forecasts(self.forecasts, self.hours):
+            t1 = time.perf_counter()
+            cur.execute("BEGIN")
+            db.forecast_add(fc)
+            db.hourly_add(fc)
+            cur.execute("COMMIT")
+            elapsed += time.perf_counter() - t1
+            cnt += len(fc.hourly)
+        self.log.info("Added %d hourly data points in %.2f seconds",
+                      cnt,
+                      elapsed)
+        return _throughput(cnt, elapsed)
+
+    def _query_period(self, db: Database) -> dict[str, Any]:
+        gen: Final[Generator] = Generator(self.seed)
+        # The warnings span roughly 5 minutes per warning, on average.
+        span: Final[int] = max(self.warnings * 300, 1)
+        latencies: list[float] = []
+        rows: int = 0
+        for _ in range(self.queries):
+            t1 = gen.start + timedelta(seconds=gen.rnd.randint(0, span))
+            # The GUI asks for the period from two hours ago to 12 hours
+            # from now.
+            t2 = t1 + timedelta(hours=14)
+            started = time.perf_counter()
+            rows += len(db.warning_get_by_period(t1, t2))
+            latencies.append(time.perf_counter() - started)
+        if len(latencies) < 2:
+            latencies = latencies * 2
+        pct: Final[list[float]] = statistics.quantiles(latencies, n=100)
+        return {
+            "queries": self.queries,
+            "rows": rows,
+            "p50": pct[49],
+            "p95": pct[94],
+            "max": max(latencies),
+        }
+
+    @staticmethod
+    def _startup_keys(path: str) -> dict[str, Any]:
+        t1: Final[float] = time.perf_counter()
+        db: Final[Database] = Database(path)
+        keys: Final[set[str]] = db.warning_get_keys()
+        elapsed: Final[float] = time.perf_counter() - t1
+        db.close()
+        return {
+            "keys": len(keys),
+            "seconds": elapsed,
+        }
+
+
+def main() -> None:
+    """Run the benchmark from the command line."""
+    argp: argparse.ArgumentParser = argparse.ArgumentParser()
+    argp.add_argument("-w", "--warnings",
+                      type=int,
+                      default=10_000,
+                      help="The number of warnings to generate")
+    argp.add_argument("-f", "--forecasts",
+                      type=int,
+                      default=200,
+                      help="The number of forecasts to generate")
+    argp.add_argument("--hours",
+                      type=int,
+                      default=48,
+                      help="The number of hourly data points per forecast")
+    argp.add_argument("-q", "--queries",
+                      type=int,
+                      default=100,
+                      help="The number of period queries to run")
+    argp.add_argument("-b", "--batch",
+                      type=int,
+                      default=1000,
+                      help="The number of warnings to insert per transaction")
+    argp.add_argument("--seed",
+                      type=int,
+                      default=42,
+                      help="The seed for the random number generator")
+    argp.add_argument("-d", "--dir",
+                      default="",
+                      help="The directory to create the database in (default: a temporary one)")  # noqa: E501
+    argp.add_argument("-o", "--output",
+                      default="",
+                      help="Append the results as one line of JSON to this file (default: stdout)")  # noqa: E501
+
+    args = argp.parse_args()
+
+    bench: Final[Benchmark] = Benchmark(warnings=args.warnings,
+                                        forecasts=args.forecasts,
+                                        hours=args.hours,
+                                        queries=args.queries,
+                                        batch=args.batch,
+                                        seed=args.seed,
+                                        folder=args.dir)
+    line: Final[str] = json.dumps(bench.run())
+    if args.output == "":
+        print(line)
+    else:
+        with open(args.output, "a", encoding="utf-8") as fh:
+            print(line, file=fh)
+
+
+if __name__ == "__main__":
+    main()
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-19 21:47:30 krylon>
+#
+# /data/code/python/wetterfrosch/chart.py
+# created on 19. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+wetterfrosch.chart
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+from collections import OrderedDict
+from enum import Enum
+from typing import Any, Final, Optional
+
+from wetterfrosch.data import Forecast
+
+# A value at a point in time, given as a Unix timestamp.
+Point = tuple[float, float]
+
+# The number of Forecasts whose series are cached.
+CACHE_SIZE: Final[int] = 64
+
+# The interval (in seconds) at which earlier Forecasts are overlaid on the
+# current one.
+OVERLAY_STEP: Final[int] = 6 * 3600
+
+# The space (in pixels) around each panel, and left of it for the labels.
+MARGIN: Final[float] = 6.0
+LABEL_WIDTH: Final[float] = 110.0
+
+
+class Metric(Enum):
+    """The quantities displayed in charts, each in a panel of its own. The
+    value is the name of the corresponding attribute of Datapoint."""
+    TEMPERATURE = "temperature"
+    RAIN = "rain_amt"
+    HUMIDITY = "humidity"
+
+
+LABELS: Final[dict[Metric, tuple[str, str]]] = {
+    Metric.TEMPERATURE: ("Temperatur", "°C"),
+    Metric.RAIN: ("Regenmenge", "mm"),
+    Metric.HUMIDITY: ("Luftfeuchtigkeit", "%"),
+}
+
+COLORS: Final[dict[Metric, tuple[float, float, float]]] = {
+    Metric.TEMPERATURE: (0.85, 0.25, 0.15),
+    Metric.RAIN: (0.15, 0.35, 0.85),
+    Metric.HUMIDITY: (0.15, 0.6, 0.3),
+}
+
+# Metrics with a fixed range. The others are scaled to their values.
+RANGES: Final[dict[Metric, tuple[float, float]]] = {
+    Metric.HUMIDITY: (0.0, 100.0),
+}
+
+Series = dict[Metric, list[Point]]
+
+
+def series_of(fc: Forecast) -> Series:
+    """Extract the series of all Metrics from the hourly data of <fc>."""
+    stamps: Final[list[float]] = [h.timestamp.timestamp() for h in fc.hourly]
+    return {m: [(t, float(getattr(h, m.value))) for t, h in zip(stamps, fc.hourly)]
+            for m in Metric}
+
+
+def thin(forecasts: list[Forecast], step: int = OVERLAY_STEP) -> list[Forecast]:
+    """Pick one Forecast per <step> seconds out of <forecasts>, which must be
+    ordered by time, always keeping the last one."""
+    picked: list[Forecast] = []
+    bucket: Optional[int] = None
+    for fc in forecasts[:-1]:
+        b: int = int(fc.timestamp.timestamp()) // step
+        if b != bucket:
+            picked.append(fc)
+            bucket = b
+    return picked + forecasts[-1:]
+
+
+def panel_of(m: Metric,
+             all_series: list[Series],
+             box: tuple[float, float, float, float],
+             t0: float,
+             span: float) -> dict[str, Any]:
+    """Project the series of metric <m> onto the panel at <box>, given as
+    (x, y, width, height). The time axis starts at <t0> and covers <span>
+    seconds."""
+    x0, y0, w, h = box
+    values: Final[list[float]] = [v for s in all_series for _, v in s[m]]
+    lo, hi = RANGES.get(m, (min(values), max(values)))
+    if m == Metric.RAIN:
+        lo, hi = 0.0, max(hi, 1.0)
+    if hi - lo < 1.0:
+        lo, hi = lo - 0.5, hi + 0.5
+    return {
+        "metric": m,
+        "box": box,
+        "range": (lo, hi),
+        "lines": [[(x0 + (t - t0) / span * w, y0 + h - (v - lo) / (hi - lo) * h)
+                   for t, v in s[m]]
+                  for s in all_series],
+    }
+
+
+# pylint: disable-msg=R0903
+class SeriesCache:
+    """SeriesCache keeps the series of the <size> most recently used
+    Forecasts, so they are computed only once per Forecast."""
+
+    __slots__ = [
+        "size",
+        "cache",
+        "misses",
+    ]
+
+    size: int
+    cache: OrderedDict[int, Series]
+    misses: int
+
+    def __init__(self, size: int = CACHE_SIZE) -> None:
+        self.size = size
+        self.cache = OrderedDict()
+        self.misses = 0
+
+    def get(self, fc: Forecast) -> Series:
+        """Return the series of <fc>."""
+        series: Optional[Series] = self.cache.get(fc.fid)
+        if series is not None:
+            self.cache.move_to_end(fc.fid)
+            return series
+        self.misses += 1
+        series = series_of(fc)
+        self.cache[fc.fid] = series
+        if len(self.cache) > self.size:
+            self.cache.popitem(last=False)
+        return series
+
+
+# pylint: disable-msg=R0902
+class Plot:
+    """Plot draws the charts for a Forecast, with earlier Forecasts overlaid
+    in fainter colors, into a Cairo context.
+    The series are taken from a SeriesCache, and their projection onto the
+    panels is kept until the Forecasts or the size change, so repainting the
+    same Plot costs little more than stroking the lines."""
+
+    __slots__ = [
+        "cache",
+        "forecasts",
+        "version",
+        "key",
+        "geometry",
+    ]
+
+    cache: SeriesCache
+    forecasts: list[Forecast]
+    version: int
+    key: Optional[tuple[int, int, int]]
+    geometry: list[dict[str, Any]]
+
+    def __init__(self, cache: Optional[SeriesCache] = None) -> None:
+        self.cache = cache if cache is not None else SeriesCache()
+        self.forecasts = []
+        self.version = 0
+        self.key = None
+        self.geometry = []
+
+    def set_forecasts(self, forecasts: list[Forecast]) -> bool:
+        """Display <forecasts>, ordered by time, the last one being the
+        current Forecast.
+        Returns True if that changes the Plot, i.e. it needs to be redrawn."""
+        if [fc.fid for fc in forecasts] == [fc.fid for fc in self.forecasts]:
+            return False
+        self.forecasts = list(forecasts)
+        self.version += 1
+        return True
+
+    def layout(self, width: int, height: int) -> list[dict[str, Any]]:
+        """Compute the panels and the lines in them for the given size."""
+        key: Final[tuple[int, int, int]] = (width, height, self.version)
+        if key == self.key:
+            return self.geometry
+        self.key = key
+        self.geometry = []
+        all_series: Final[list[Series]] = \
+            [self.cache.get(fc) for fc in self.forecasts if len(fc.hourly) > 0]
+        if len(all_series) == 0:
+            return self.geometry
+
+        t0: Final[float] = min(s[Metric.TEMPERATURE][0][0] for s in all_series)
+        t1: Final[float] = max(s[Metric.TEMPERATURE][-1][0] for s in all_series)
+        span: Final[float] = max(t1 - t0, 1.0)
+        panel_h: Final[float] = height / len(Metric)
+        x0: Final[float] = LABEL_WIDTH
+        w: Final[float] = max(width - x0 - MARGIN, 1.0)
+        for idx, m in enumerate(Metric):
+            self.geometry.append(panel_of(m,
+                                          all_series,
+                                          (x0,
+                                           idx * panel_h + MARGIN,
+                                           w,
+                                           max(panel_h - 2 * MARGIN, 1.0)),
+                                          t0,
+                                          span))
+        return self.geometry
+
+    def paint(self, cr: Any, width: int, height: int) -> None:
+        """Draw the Plot into the Cairo context <cr>."""
+        cr.set_source_rgb(1.0, 1.0, 1.0)
+        cr.paint()
+        panels: Final[list[dict[str, Any]]] = self.layout(width, height)
+        cr.set_font_size(11)
+        for panel in panels:
+            self.__paint_frame(cr, panel)
+            self.__paint_lines(cr, panel)
+
+    @staticmethod
+    def __paint_frame(cr: Any, panel: dict[str, Any]) -> None:
+        """Draw the border and the labels of a panel."""
+        x0, y0, w, h = panel["box"]
+        lo, hi = panel["range"]
+        name, unit = LABELS[panel["metric"]]
+
+        cr.set_source_rgb(0.6, 0.6, 0.6)
+        cr.set_line_width(1.0)
+        cr.rectangle(x0, y0, w, h)
+        cr.stroke()
+        cr.set_source_rgb(0.2, 0.2, 0.2)
+        cr.move_to(MARGIN, y0 + h / 2)
+        cr.show_text(name)
+        cr.move_to(MARGIN, y0 + 11)
+        cr.show_text(f"{hi:.0f} {unit}")
+        cr.move_to(MARGIN, y0 + h)
+        cr.show_text(f"{lo:.0f} {unit}")
+
+    @staticmethod
+    def __paint_lines(cr: Any, panel: dict[str, Any]) -> None:
+        """Draw the lines of a panel, the current Forecast last."""
+        r, g, b = COLORS[panel["metric"]]
+        lines: Final[list[list[tuple[float, float]]]] = panel["lines"]
+        for idx, line in enumerate(lines):
+            if len(line) == 0:
+                continue
+            current = idx == len(lines) - 1
+            # Earlier Forecasts fade out with age.
+            cr.set_source_rgba(r, g, b, 1.0 if current else 0.15 + 0.35 * idx / len(lines))
+            cr.set_line_width(2.0 if current else 1.0)
+            cr.move_to(*line[0])
+            for x, y in line[1:]:
+                cr.line_to(x, y)
+            cr.stroke()
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
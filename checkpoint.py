@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-19 18:03:12 krylon>
+#
+# /data/code/python/wetterfrosch/checkpoint.py
+# created on 19. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+wetterfrosch.checkpoint
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import logging
+import sys
+import time
+from threading import Event, Lock, Thread
+from typing import Any, Final, Optional
+
+from wetterfrosch import common
+from wetterfrosch.database import Database
+
+# Once this many bytes have been written to the WAL that are not in the
+# database yet, run a PASSIVE checkpoint.
+PASSIVE_SIZE: Final[int] = 4 * 1024 * 1024
+
+# Once the WAL has grown to this many bytes, run a TRUNCATE checkpoint,
+# even if that means waiting for readers.
+TRUNCATE_SIZE: Final[int] = 64 * 1024 * 1024
+
+# If nobody has written to the database for this many seconds, run a
+# TRUNCATE checkpoint to reset the WAL.
+IDLE: Final[int] = 60
+
+# Each frame in the WAL holds one page plus a header of this many bytes.
+FRAME_HEADER: Final[int] = 24
+
+# The interval (in seconds) between two looks at the WAL.
+INTERVAL: Final[int] = 10
+
+# Warn if a reader keeps the WAL from being checkpointed for this many
+# seconds.
+PIN_WARN: Final[int] = 300
+
+
+# pylint: disable-msg=R0902
+class Checkpointer:
+    """Checkpointer keeps the WAL from growing without bounds.
+    It checks the WAL regularly and runs a PASSIVE checkpoint once more
+    than <passive_size> bytes in it have not been copied to the database,
+    a TRUNCATE checkpoint once the file exceeds <truncate_size> bytes or
+    when the database has not been written to for <idle> seconds.
+    A PASSIVE checkpoint does not shrink the file, so the bytes pending are
+    the frames the last checkpoint left behind plus whatever the file has
+    grown by since then.
+    If a reader keeps the WAL from being checkpointed for more than
+    <pin_warn> seconds, a warning is logged."""
+
+    __slots__ = [
+        "log",
+        "lock",
+        "path",
+        "db",
+        "passive_size",
+        "truncate_size",
+        "idle",
+        "interval",
+        "pin_warn",
+        "stop_evt",
+        "version",
+        "last_change",
+        "pinned_since",
+        "warned",
+        "checked_size",
+        "backlog",
+        "stats",
+    ]
+
+    log: logging.Logger
+    lock: Lock
+    path: str
+    db: Optional[Database]
+    passive_size: int
+    truncate_size: int
+    idle: int
+    interval: int
+    pin_warn: int
+    stop_evt: Event
+    version: int
+    last_change: float
+    pinned_since: Optional[float]
+    warned: bool
+    checked_size: int
+    backlog: int
+    stats: dict[str, Any]
+
+    # pylint: disable-msg=R0913,R0917
+    def __init__(self,
+                 path: str = "",
+                 passive_size: int = PASSIVE_SIZE,
+                 truncate_size: int = TRUNCATE_SIZE,
+                 idle: int = IDLE,
+                 interval: int = INTERVAL,
+                 pin_warn: int = PIN_WARN) -> None:
+        self.log = common.get_logger("checkpoint")
+        self.lock = Lock()
+        self.path = path
+        self.db = None
+        self.passive_size = passive_size
+        self.truncate_size = truncate_size
+        self.idle = idle
+        self.interval = interval
+        self.pin_warn = pin_warn
+        self.stop_evt = Event()
+        self.version = -1
+        self.last_change = time.monotonic()
+        self.pinned_since = None
+        self.warned = False
+        self.checked_size = 0
+        self.backlog = 0
+        self.stats = {
+            "wal_size": 0,
+            "checkpoints": {"PASSIVE": 0, "TRUNCATE": 0},
+            "last_duration": 0.0,
+            "max_duration": 0.0,
+            "total_duration": 0.0,
+            "last_result": (0, 0, 0),
+        }
+
+    def _get_db(self) -> Database:
+        # The connection is opened by the thread that uses it.
+        if self.db is None:
+            self.db = Database(self.path)
+        return self.db
+
+    def check(self, now: Optional[float] = None) -> Optional[str]:
+        """Look at the WAL and run a checkpoint if necessary.
+        <now> is the current value of the monotonic clock.
+        Returns the mode of the checkpoint that was run, or None."""
+        if now is None:
+            now = time.monotonic()
+        db: Final[Database] = self._get_db()
+        size: Final[int] = db.wal_size()
+        version: Final[int] = db.data_version()
+        if version != self.version:
+            self.version = version
+            self.last_change = now
+        with self.lock:
+            self.stats["wal_size"] = size
+        if size < self.checked_size:
+            # Someone else has truncated the WAL.
+            self.checked_size = 0
+            self.backlog = 0
+        pending: Final[int] = self.backlog + size - self.checked_size
+
+        mode: Optional[str] = None
+        if size >= self.truncate_size:
+            mode = "TRUNCATE"
+        elif pending >= self.passive_size:
+            mode = "PASSIVE"
+        elif size > 0 and now - self.last_change >= self.idle:
+            mode = "TRUNCATE"
+        if mode is None:
+            return None
+
+        t1: Final[float] = time.perf_counter()
+        busy, frames, done = db.checkpoint(mode)
+        elapsed: Final[float] = time.perf_counter() - t1
+        self.checked_size = db.wal_size()
+        self.backlog = max(frames - done, 0) * (db.page_size() + FRAME_HEADER)
+        with self.lock:
+            self.stats["checkpoints"][mode] += 1
+            self.stats["last_duration"] = elapsed
+            self.stats["max_duration"] = max(self.stats["max_duration"], elapsed)
+            self.stats["total_duration"] += elapsed
+            self.stats["last_result"] = (busy, frames, done)
+            self.stats["wal_size"] = self.checked_size
+        self.log.debug("%s checkpoint took %.1f ms, %d of %d frames copied",
+                       mode,
+                       elapsed * 1000,
+                       done,
+                       frames)
+
+        if busy != 0 or done < frames:
+            if self.pinned_since is None:
+                self.pinned_since = now
+            elif now - self.pinned_since >= self.pin_warn and not self.warned:
+                self.log.warning("A reader has kept the WAL from being checkpointed "
+                                 "for %d seconds, it has grown to %d KiB",
+                                 now - self.pinned_since,
+                                 size // 1024)
+                self.warned = True
+        else:
+            self.pinned_since = None
+            self.warned = False
+        return mode
+
+    def metrics(self) -> dict[str, Any]:
+        """Return the size of the WAL, the number of checkpoints run and
+        how long they took, and for how many seconds the WAL has been
+        pinned by a reader, if it is."""
+        with self.lock:
+            result: dict[str, Any] = dict(self.stats)
+            result["checkpoints"] = dict(self.stats["checkpoints"])
+        result["pinned_for"] = 0.0 if self.pinned_since is None \
+            else time.monotonic() - self.pinned_since
+        return result
+
+    def start(self) -> None:
+        """Check the WAL regularly in a background thread."""
+        self.stop_evt.clear()
+        worker = Thread(target=self._worker, daemon=True)
+        worker.start()
+
+    def stop(self) -> None:
+        """Stop the background thread."""
+        self.stop_evt.set()
+
+    def _worker(self) -> None:
+        while not self.stop_evt.wait(self.interval):
+            try:
+                self.check()
+            except:  # noqa: E722,B001  pylint: disable-msg=W0702
+                self.log.error("Checkpoint failed: %s", sys.exception())
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
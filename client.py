@@ -21,11 +21,12 @@ import json
 import logging
 import pprint
 import re
+import sqlite3
 import sys
 import time
 from datetime import datetime, timedelta
 from threading import Lock, Thread, local
-from typing import Any, Final, Optional, Union
+from typing import Any, Callable, Final, Optional, Union
 from warnings import warn
 
 import krylib
@@ -58,16 +59,120 @@ def pirate_url(coords: tuple[float, float]) -> str:
     return addr
 
 
+# Characters that make a pattern more than a literal string.
+META: Final[frozenset[str]] = frozenset(".^$*+?{}[]\\|()")
+
+
+# The maximum number of region names LocationList remembers the result of
+# matching for. The DWD uses about 400.
+MEMO_SIZE: Final[int] = 1024
+
+
+def is_literal(pattern: str) -> bool:
+    """Return True if <pattern> contains no regex metacharacters."""
+    return not any(c in META for c in pattern)
+
+
+# pylint: disable-msg=R0903
+class Matcher:
+    """Matcher checks a string against a set of patterns in one go.
+    Patterns that can be combined are joined into a single alternation.
+    Strings equal to a literal pattern, ignoring case, are matched without
+    running a regex at all. Patterns that cannot be combined, because they
+    use different flags or groups, are checked one by one."""
+
+    __slots__ = ["empty", "literals", "combined", "separate"]
+
+    empty: bool
+    literals: frozenset[str]
+    combined: Optional[re.Pattern]
+    separate: tuple[re.Pattern, ...]
+
+    def __init__(self, patterns: list[re.Pattern]) -> None:
+        self.empty = len(patterns) == 0
+        self.literals = frozenset(p.pattern.lower() for p in patterns
+                                  if p.flags == re.I | re.U and is_literal(p.pattern))
+        joinable: Final[list[re.Pattern]] = \
+            [p for p in patterns if p.flags == re.I | re.U and p.groups == 0]
+        separate: list[re.Pattern] = [p for p in patterns if p not in joinable]
+        self.combined = None
+        if len(joinable) > 0:
+            try:
+                self.combined = re.compile("|".join(f"(?:{p.pattern})" for p in joinable),
+                                           re.I)
+            except re.error:
+                # E.g. inline flags only work at the start of a pattern.
+                separate = list(patterns)
+        self.separate = tuple(separate)
+
+    def match(self, loc: str) -> bool:
+        """Return True if <loc> is matched by any of the patterns, or if
+        there are no patterns at all."""
+        if self.empty or loc.lower() in self.literals:
+            return True
+        if self.combined is not None and self.combined.search(loc) is not None:
+            return True
+        return any(p.search(loc) is not None for p in self.separate)
+
+
+# pylint: disable-msg=R0903
+class Locations:
+    """Locations is an immutable snapshot of the patterns in a LocationList,
+    along with the Matcher built from them and a memo of match results.
+    The memo is the only part that changes, and it only ever gains entries,
+    so it is safe to share between threads without a lock."""
+
+    __slots__ = ["patterns", "dupes", "matcher", "generation", "memo"]
+
+    patterns: tuple[re.Pattern, ...]
+    dupes: frozenset[str]
+    matcher: Matcher
+    generation: int
+    memo: dict[str, bool]
+
+    def __init__(self, patterns: list[re.Pattern], generation: int) -> None:
+        self.patterns = tuple(patterns)
+        self.dupes = frozenset(p.pattern for p in patterns)
+        self.matcher = Matcher(patterns)
+        self.generation = generation
+        self.memo = {}
+
+    def check(self, loc: str) -> bool:
+        """Check if <loc> is matched by any of the patterns."""
+        result: Optional[bool] = self.memo.get(loc)
+        if result is None:
+            result = self.matcher.match(loc)
+            # Once the memo is full, it stays as it is. Evicting entries
+            # would not be safe without a lock.
+            if len(self.memo) < MEMO_SIZE:
+                self.memo[loc] = result
+        return result
+
+
+def compile_pattern(item: Union[str, re.Pattern]) -> re.Pattern:
+    """Compile <item> to a case-insensitive re.Pattern, unless it already is
+    a re.Pattern."""
+    if isinstance(item, str):
+        return re.compile(item, re.I)
+    if isinstance(item, re.Pattern):
+        return item
+    raise TypeError(f"Patterns must be str or re.Pattern, not {type(item)}")
+
+
 class LocationList:
-    """A (singleton) list of regular expressions describing locations."""
+    """A (singleton) list of regular expressions describing locations.
+    Reading the list takes no lock: The patterns are kept in an immutable
+    Locations snapshot. Every change builds a new snapshot and publishes it
+    by replacing the old one, so readers always see a consistent set of
+    patterns. Only writers take the lock, to keep concurrent changes from
+    getting lost."""
 
-    __slots__ = ["patterns", "lock", "dupes"]
+    __slots__ = ["lock", "current"]
 
     clock = Lock()
     _instance = None
-    patterns: list[re.Pattern]
     lock: Lock
-    dupes: set[str]
+    current: Locations
 
     def __init__(self):
         raise RuntimeError("Call LocationList.new() instead.")
@@ -80,74 +185,68 @@ class LocationList:
             if cls._instance is None:
                 print("Creating singleton instance.")
                 try:
-                    cls._instance = cls.__new__(cls)
-                    cls._instance.patterns = []
-                    cls._instance.lock = Lock()
-                    cls._instance.dupes = set()
+                    instance = cls.__new__(cls)
+                    instance.lock = Lock()
+                    instance.current = Locations([], 0)
                     for i in patterns:
-                        if isinstance(i, str):
-                            if i not in cls._instance.dupes:
-                                cls._instance.patterns.append(
-                                    re.compile(i, re.I))
-                                cls._instance.dupes.add(i)
-                        elif isinstance(i, re.Pattern):
-                            if i.pattern not in cls._instance.dupes:
-                                cls._instance.dupes.add(i.pattern)
-                                cls._instance.patterns.append(i)
-                        else:
-                            raise TypeError(
-                                f"Patterns must be str or re.Pattern, not {type(i)}")  # noqa: E501
+                        instance.add(i)
+                    cls._instance = instance
                 except Exception as e:  # pylint: disable-msg=C0103
                     print("Error creating LocationList singleton instance:", e)
                     raise
-            if len(patterns) > 0:
+            elif len(patterns) > 0:
                 warn(
                     "Singleton instance already exists, ignoring new patterns")
             return cls._instance
 
+    @property
+    def patterns(self) -> tuple[re.Pattern, ...]:
+        """Return the current patterns."""
+        return self.current.patterns
+
+    @property
+    def generation(self) -> int:
+        """Return the generation of the patterns. It is incremented every
+        time the patterns change."""
+        return self.current.generation
+
+    @property
+    def memo(self) -> dict[str, bool]:
+        """Return the match results remembered for the current patterns."""
+        return self.current.memo
+
     def cnt(self) -> int:
         """Return the number of patterns in the list"""
-        with self.lock:
-            return len(self.patterns)
+        return len(self.current.patterns)
+
+    def __publish(self, patterns: list[re.Pattern]) -> None:
+        # The caller must hold the lock.
+        self.current = Locations(patterns, self.current.generation + 1)
 
     def clear(self) -> None:
         """Empty the current list of patterns"""
         with self.lock:
-            self.dupes.clear()
-            self.patterns = []
+            self.__publish([])
 
     def add(self, item: Union[str, re.Pattern]) -> None:
         """Add a new pattern. If <item> is a string, it is compiled to
         a re.Pattern"""
+        pat: Final[re.Pattern] = compile_pattern(item)
         with self.lock:
-            if isinstance(item, str):
-                if item not in self.dupes:
-                    pat = re.compile(item, re.I)
-                    self.patterns.append(pat)
-                    self.dupes.add(item)
-            else:
-                assert isinstance(item, re.Pattern)
-                if item.pattern not in self.dupes:
-                    self.patterns.append(item)
-                    self.dupes.add(item.pattern)
+            if pat.pattern not in self.current.dupes:
+                self.__publish(list(self.current.patterns) + [pat])
 
     def replace(self, items: list[str]) -> None:
         """Replace the patterns in the LocationList.
         Assumes that all strings in items are valid regular expressions."""
+        patterns: Final[list[re.Pattern]] = [re.compile(p, re.I) for p in items]
         with self.lock:
-            self.patterns = [re.compile(p, re.I) for p in items]
-            self.dupes = set(items)
+            self.__publish(patterns)
 
     def check(self, loc: str) -> bool:
         """Check if the given string is matched by any of the List's
         regular expressions."""
-        with self.lock:
-            if len(self.patterns) == 0:
-                return True
-            for p in self.patterns:  # pylint: disable-msg=C0103
-                if p.search(loc) is not None:
-                    return True
-            return False
+        return self.current.check(loc)
 
 
 # pylint: disable-msg=R0902
@@ -170,6 +269,8 @@ class Client:
         "finterval",
         "fcache",
         "pirate_url",
+        "version",
+        "subscribers",
     ]
 
     local: local
@@ -187,6 +288,8 @@ class Client:
     known: set[str]
     fcache: Optional[Forecast]
     pirate_url: str
+    version: int
+    subscribers: list[Callable[[int], Any]]
 
     _loc: list[str] = []
 
@@ -197,6 +300,7 @@ class Client:
         self.active = False
         self.winterval = timedelta(seconds=interval)
         self.finterval = timedelta(seconds=600)
+        self.here = ""
         if patterns is not None:
             self.loc_patterns = LocationList.new(*patterns)
         else:
@@ -214,6 +318,8 @@ class Client:
         self.wcache = None
         self.known = self.get_database().warning_get_keys()
         self.fcache = None
+        self.version = 0
+        self.subscribers = []
 
     def get_database(self) -> database.Database:
         """Get the Database instance for the calling thread."""
@@ -329,28 +435,53 @@ class Client:
             with open(common.path.warning(), 'w', encoding='utf-8') as fh:
                 fh.write(payload)
             records: dict = json.loads(payload)
-            processed: list[data.WeatherWarning] = []
+            warnings: Final[list[data.WeatherWarning]] = \
+                [data.WeatherWarning(item)
+                 for block in records["warnings"].values()
+                 for item in block]
+            processed: Final[list[data.WeatherWarning]] = \
+                [w for w in warnings if self.loc_patterns.check(w.region_name)]
             self.last_wfetch = datetime.now()
-            db = self.get_database()
-            with db:
-                for block in records["warnings"].values():
-                    for item in block:
-                        w = data.WeatherWarning(item)
-                        if self.loc_patterns.check(w.region_name):
-                            processed.append(w)
-                        if not w.cksum() in self.known:
-                            if not db.warning_exist(w):
-                                db.warning_add(w)
-                            self.known.add(w.cksum())
+            added: Final[bool] = self._store_warnings(warnings)
 
             with self.lock:
                 self.wcache = processed
+            if added:
+                self._changed()
             return processed
         except Exception as e:  # pylint: disable-msg=W0718
             self.log.error("Failed to fetch weather warnings: %s",
                            pprint.pformat(e.args))
             return None
 
+    def _store_warnings(self, warnings: list[data.WeatherWarning]) -> bool:
+        """Add the warnings we do not know, yet, to the database in one
+        transaction. Returns True if any warnings were added."""
+        added: bool = False
+        db: Final[database.Database] = self.get_database()
+        seen: Final[set[str]] = set()
+        with db:
+            for w in warnings:
+                if w.cksum() in self.known or w.cksum() in seen:
+                    continue
+                seen.add(w.cksum())
+                if db.warning_exist(w):
+                    continue
+                try:
+                    db.warning_add(w)
+                    added = True
+                except sqlite3.IntegrityError as e:
+                    # Only the failed INSERT is undone, the rest of the
+                    # batch is still committed. The database will reject
+                    # the warning next time, too.
+                    self.log.error("Cannot store warning for %s in %s: %s",
+                                   w.event,
+                                   w.region_name,
+                                   e)
+        # The warnings are known once they have been committed.
+        self.known |= seen
+        return added
+
     def fetch_forecast(self) -> Optional[Forecast]:
         """Fetch weather data from Pirate Weather"""
         next_fetch: Final[datetime] = self.last_ffetch + self.finterval
@@ -374,18 +505,86 @@ class Client:
             records: dict[str, Any] = json.loads(body)
             self.last_ffetch = datetime.now()
             fc: Forecast = Forecast(records)
-            with self.lock:
-                self.fcache = fc
             db = self.get_database()
             with db:
-                db.forecast_add(fc)
-                db.hourly_add(fc)
+                db.location_add(fc.location, self.here)
+                changed: Final[bool] = db.forecast_upsert(fc)
+            if not changed:
+                self.log.debug("Forecast for %s is unchanged",
+                               fc.timestamp.strftime(common.TIME_FMT))
+            # Only hand out the Forecast once it is stored.
+            with self.lock:
+                self.fcache = fc
+            if changed:
+                self._changed()
             return fc
         except Exception as e:  # pylint: disable-msg=W0718
             self.log.error("Failed to fetch weather forecast: %s",
                            pprint.pformat(e.args))
             return None
 
+    def acknowledge(self, ids: list[int]) -> int:
+        """Acknowledge the warnings with the given IDs.
+        Returns the number of warnings acknowledged."""
+        cnt: Final[int] = self.get_database().warning_acknowledge_ids(ids)
+        self.log.debug("Acknowledged %d of %d warnings", cnt, len(ids))
+        if cnt > 0:
+            self._changed()
+        return cnt
+
+    # pylint: disable-msg=R0913
+    def acknowledge_matching(self,
+                             region: Optional[str] = None,
+                             event: Optional[str] = None,
+                             level: Optional[int] = None,
+                             begin: Optional[datetime] = None,
+                             end: Optional[datetime] = None) -> int:
+        """Acknowledge all warnings matching the given criteria, see
+        Database.warning_acknowledge_matching.
+        Returns the number of warnings acknowledged."""
+        cnt: Final[int] = self.get_database().warning_acknowledge_matching(
+            region, event, level, begin, end)
+        self.log.debug("Acknowledged %d warnings (region = %s, event = %s, level = %s)",
+                       cnt,
+                       region,
+                       event,
+                       level)
+        if cnt > 0:
+            self._changed()
+        return cnt
+
+    def data_version(self) -> int:
+        """Return the data version. It is incremented every time the Client
+        changes the data in the database."""
+        with self.lock:
+            return self.version
+
+    def subscribe(self, callback: Callable[[int], Any]) -> None:
+        """Call <callback> with the new data version every time the Client
+        changes the data in the database.
+        The callback is called from the thread that made the change, so it
+        should return quickly."""
+        with self.lock:
+            self.subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[int], Any]) -> None:
+        """Stop calling <callback> when the data changes."""
+        with self.lock:
+            self.subscribers.remove(callback)
+
+    def _changed(self) -> None:
+        with self.lock:
+            self.version += 1
+            version: Final[int] = self.version
+            subscribers: Final[list[Callable[[int], Any]]] = list(self.subscribers)
+        for callback in subscribers:
+            try:
+                callback(version)
+            except:  # noqa: E722,B001  pylint: disable-msg=W0702
+                self.log.error("Failed to notify subscriber of change %d: %s",
+                               version,
+                               sys.exception())
+
     def get_warnings_cached(self) -> Optional[list[data.WeatherWarning]]:
         """Return the cached warnings, if there are any."""
         with self.lock:
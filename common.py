@@ -19,7 +19,7 @@ wetterfrosch.common
 import logging
 import logging.handlers
 import os
-from typing import Final
+from typing import Final, Optional
 from threading import Lock
 
 APP_NAME: Final[str] = "Wetterfrosch"
@@ -32,9 +32,11 @@ class Path:
     """Holds the paths of folders and files used by the application"""
 
     __base: str
+    __memory: bool
 
     def __init__(self, root: str = os.path.expanduser(f"~/.{APP_NAME.lower()}.d")) -> None:  # noqa
         self.__base = root
+        self.__memory = False
 
     def base(self, folder: str = "") -> str:
         """Return the base directory for application specific files.
@@ -43,14 +45,31 @@ class Path:
             self.__base = folder
         return self.__base
 
+    def in_memory(self, enable: Optional[bool] = None) -> bool:
+        """Return True if the database is kept in memory.
+        If enable is not None, switch the in-memory mode on or off."""
+        if enable is not None:
+            self.__memory = enable
+        return self.__memory
+
     def window(self) -> str:
         """Return the path of the window state file"""
         return os.path.join(self.__base, f"{APP_NAME.lower()}.win")
 
     def db(self) -> str:  # pylint: disable-msg=C0103
-        """Return the path to the database"""
+        """Return the path to the database.
+        In in-memory mode, this is the URI of an in-memory database that
+        all connections in the process share. It uses the memdb VFS rather
+        than a shared cache, so connections lock the whole database like
+        they would a file, and wait for each other instead of failing."""
+        if self.__memory:
+            return f"file:/{APP_NAME.lower()}?vfs=memdb"
         return os.path.join(self.__base, f"{APP_NAME.lower()}.db")
 
+    def snapshot(self) -> str:
+        """Return the path of the snapshot of the in-memory database"""
+        return os.path.join(self.__base, f"{APP_NAME.lower()}.snapshot.db")
+
     def log(self) -> str:
         """Return the path to the log file"""
         return os.path.join(self.__base, f"{APP_NAME.lower()}.log")
@@ -71,6 +90,14 @@ class Path:
         """return the path of the most recent forecast fetched from Pirate Weather"""
         return os.path.join(self.__base, "forecast.json")
 
+    def export(self) -> str:
+        """Return the path of the folder to export data to"""
+        return os.path.join(self.__base, "export")
+
+    def backup(self) -> str:
+        """Return the path of the folder to store backups in"""
+        return os.path.join(self.__base, "backup")
+
 
 path: Path = Path(os.path.expanduser(f"~/.{APP_NAME.lower()}.d"))
 
@@ -42,6 +42,8 @@ icon_warn = "weather-severe-alert-symbolic"
 fetch_interval = 300
 
 [database]
+# Queries taking longer than this many seconds are logged as slow.
+slow_query_threshold = 0.25
 """
 
 
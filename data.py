@@ -136,6 +136,25 @@ class WeatherWarning:
         # return cksum
         return summary
 
+    def db_tuple(self) -> tuple:
+        """Return the Warning's fields as a tuple suitable for feeding to
+        the database."""
+        return (
+            self.state,
+            self.wtype,
+            self.level,
+            int(self.start.timestamp()),
+            int(self.end.timestamp()),
+            self.region_name,
+            self.description,
+            self.event,
+            self.headline,
+            self.instruction,
+            self.state_short,
+            self.altitude_start,
+            self.altitude_end,
+        )
+
 
 class Datapoint:
     """A Datapoint is part of a weather forecast and includes conditions
@@ -268,19 +287,19 @@ class Forecast:
     @classmethod
     def from_db(cls, row: tuple) -> Any:
         """Construct a Forecast instance from the database row."""
-        loc = [float(x) for x in row[2].split("/")]
         fc = cls.__new__(cls)
         fc.fid = row[0]
         fc.timestamp = datetime.fromtimestamp(row[1])
-        fc.location = (loc[0], loc[1])
-        fc.summary = row[3]
-        fc.icon = row[4]
-        fc.probability_rain = row[5]
-        fc.temperature = row[6]
-        fc.temperature_apparent = row[7]
-        fc.humidity = row[8]
-        fc.wind_speed = row[9]
-        fc.visibility = row[10]
+        fc.location = (row[2], row[3])
+        fc.summary = row[4]
+        fc.icon = row[5]
+        fc.probability_rain = row[6]
+        fc.temperature = row[7]
+        fc.temperature_apparent = row[8]
+        fc.humidity = row[9]
+        fc.wind_speed = row[10]
+        fc.visibility = row[11]
+        fc.hourly = []
         return fc
 
     def hourly_db(self) -> list[tuple]:
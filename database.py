@@ -16,14 +16,21 @@ wetterfrosch.database
 (c) 2024 Benjamin Walkenhorst
 """
 
+import functools
+import inspect
 import logging
+import os
 import sqlite3
 import threading
 import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
 from datetime import datetime
 from enum import Enum, auto
 from math import ceil, floor
-from typing import Final, Optional
+from urllib.parse import quote
+from typing import Any, Callable, Final, Iterable, Iterator, Optional
 
 import krylib
 
@@ -32,10 +39,17 @@ from wetterfrosch.data import Datapoint, Forecast, WeatherWarning
 
 OPEN_LOCK: Final[threading.Lock] = threading.Lock()
 
+# The number of rows fetched per query when streaming a table.
+EXPORT_CHUNK: Final[int] = 1024
+
+# Timestamps are stored as seconds since the epoch, so this is
+# comfortably larger than anything we might encounter.
+MAX_STAMP: Final[int] = 2**62
+
 INIT_QUERIES: Final[list[str]] = [
     """
     CREATE TABLE warning (
-        id              INTEGER PRIMARY KEY,
+        id              INTEGER PRIMARY KEY AUTOINCREMENT,
         state           TEXT NOT NULL,
         wtype           INTEGER NOT NULL,
         level           INTEGER NOT NULL,
@@ -74,10 +88,20 @@ INIT_QUERIES: Final[list[str]] = [
     "CREATE INDEX wrn_evt_idx ON warning (event)",
     "CREATE INDEX wrn_ack_idx ON warning (acknowledged)",
     """
-CREATE TABLE forecast (
+CREATE TABLE location (
     id INTEGER PRIMARY KEY,
-    timestamp INTEGER UNIQUE NOT NULL,
-    location TEXT NOT NULL,
+    latitude REAL NOT NULL,
+    longitude REAL NOT NULL,
+    name TEXT NOT NULL DEFAULT '',
+    UNIQUE (latitude, longitude)
+) STRICT""",
+    """
+CREATE TABLE forecast (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp INTEGER NOT NULL,
+    latitude REAL NOT NULL,
+    longitude REAL NOT NULL,
+    location_id INTEGER,
     summary TEXT NOT NULL,
     icon TEXT NOT NULL,
     prob_rain INTEGER NOT NULL,
@@ -86,17 +110,22 @@ CREATE TABLE forecast (
     humidity INTEGER NOT NULL,
     wind_speed INTEGER NOT NULL,
     visibility REAL NOT NULL,
+    FOREIGN KEY (location_id) REFERENCES location (id)
+      ON DELETE SET NULL
+      ON UPDATE RESTRICT,
+    UNIQUE (latitude, longitude, timestamp),
     CHECK (prob_rain >= 0),
     CHECK (temperature BETWEEN -60 AND 50),
     CHECK (humidity >= 0),
     CHECK (wind_speed >= 0),
     CHECK (visibility >= 0)
 ) STRICT""",
-    "CREATE UNIQUE INDEX fc_time_idx ON forecast (timestamp)",
+    "CREATE INDEX fc_time_idx ON forecast (timestamp)",
+    "CREATE INDEX fc_loc_idx ON forecast (location_id, timestamp)",
 
     '''
 CREATE TABLE hourly (
-    id INTEGER PRIMARY KEY,
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
     forecast_id INTEGER NOT NULL,
     timestamp INTEGER NOT NULL,
     icon TEXT NOT NULL,
@@ -118,6 +147,317 @@ CREATE TABLE hourly (
 ) STRICT
     ''',
     "CREATE INDEX h_time_idx ON hourly (timestamp)",
+    "CREATE INDEX h_fc_idx ON hourly (forecast_id, timestamp)",
+    """
+CREATE TABLE archive (
+    id INTEGER PRIMARY KEY,
+    name TEXT UNIQUE NOT NULL,
+    path TEXT UNIQUE NOT NULL,
+    period_start INTEGER NOT NULL,
+    period_end INTEGER NOT NULL,
+    warning_start INTEGER,
+    warning_end INTEGER,
+    forecast_start INTEGER,
+    forecast_end INTEGER,
+    created INTEGER NOT NULL,
+    CHECK (period_start < period_end)
+) STRICT""",
+]
+
+# Databases created by older versions of the application are brought up to
+# date by running the migrations they have not seen yet, in order.
+# A freshly created database starts out at the latest version, so any
+# change made here must be reflected in INIT_QUERIES as well.
+# The schema version is stored in PRAGMA user_version.
+MIGRATIONS: Final[list[list[str]]] = [
+    # Version 1: Load hourly data by forecast without scanning the table.
+    [
+        "CREATE INDEX h_fc_idx ON hourly (forecast_id, timestamp)",
+    ],
+    # Version 2: Store the location of forecasts as numeric coordinates,
+    # allowing forecasts for several locations to share one database.
+    [
+        """
+CREATE TABLE location (
+    id INTEGER PRIMARY KEY,
+    latitude REAL NOT NULL,
+    longitude REAL NOT NULL,
+    name TEXT NOT NULL DEFAULT '',
+    UNIQUE (latitude, longitude)
+) STRICT""",
+        """
+CREATE TABLE forecast_new (
+    id INTEGER PRIMARY KEY,
+    timestamp INTEGER NOT NULL,
+    latitude REAL NOT NULL,
+    longitude REAL NOT NULL,
+    location_id INTEGER,
+    summary TEXT NOT NULL,
+    icon TEXT NOT NULL,
+    prob_rain INTEGER NOT NULL,
+    temperature INTEGER NOT NULL,
+    temperature_apparent INTEGER NOT NULL,
+    humidity INTEGER NOT NULL,
+    wind_speed INTEGER NOT NULL,
+    visibility REAL NOT NULL,
+    FOREIGN KEY (location_id) REFERENCES location (id)
+      ON DELETE SET NULL
+      ON UPDATE RESTRICT,
+    UNIQUE (latitude, longitude, timestamp),
+    CHECK (prob_rain >= 0),
+    CHECK (temperature BETWEEN -60 AND 50),
+    CHECK (humidity >= 0),
+    CHECK (wind_speed >= 0),
+    CHECK (visibility >= 0)
+) STRICT""",
+        """
+INSERT INTO forecast_new (
+    id,
+    timestamp,
+    latitude,
+    longitude,
+    summary,
+    icon,
+    prob_rain,
+    temperature,
+    temperature_apparent,
+    humidity,
+    wind_speed,
+    visibility)
+SELECT
+    id,
+    timestamp,
+    CAST(substr(location, 1, instr(location, '/') - 1) AS REAL),
+    CAST(substr(location, instr(location, '/') + 1) AS REAL),
+    summary,
+    icon,
+    prob_rain,
+    temperature,
+    temperature_apparent,
+    humidity,
+    wind_speed,
+    visibility
+FROM forecast
+        """,
+        "DROP TABLE forecast",
+        "ALTER TABLE forecast_new RENAME TO forecast",
+        "CREATE INDEX fc_time_idx ON forecast (timestamp)",
+        "CREATE INDEX fc_loc_idx ON forecast (location_id, timestamp)",
+    ],
+    # Version 3: Keep track of the archive files closed periods have been
+    # moved to.
+    [
+        """
+CREATE TABLE archive (
+    id INTEGER PRIMARY KEY,
+    name TEXT UNIQUE NOT NULL,
+    path TEXT UNIQUE NOT NULL,
+    period_start INTEGER NOT NULL,
+    period_end INTEGER NOT NULL,
+    warning_start INTEGER,
+    warning_end INTEGER,
+    forecast_start INTEGER,
+    forecast_end INTEGER,
+    created INTEGER NOT NULL,
+    CHECK (period_start < period_end)
+) STRICT""",
+    ],
+    # Version 4: Never hand out the ID of a row again once it has been
+    # moved to an archive file, so IDs stay unique across the database and
+    # its archives.
+    [
+        """
+CREATE TABLE warning_new (
+    id              INTEGER PRIMARY KEY AUTOINCREMENT,
+    state           TEXT NOT NULL,
+    wtype           INTEGER NOT NULL,
+    level           INTEGER NOT NULL,
+    start           INTEGER NOT NULL,
+    end             INTEGER NOT NULL,
+    region_name     TEXT NOT NULL,
+    description     TEXT NOT NULL,
+    event           TEXT NOT NULL,
+    headline        TEXT NOT NULL,
+    instruction     TEXT NOT NULL,
+    state_short     TEXT NOT NULL,
+    altitude_start  INTEGER,
+    altitude_end    INTEGER,
+    acknowledged    INTEGER NOT NULL DEFAULT 0,
+    key             TEXT GENERATED ALWAYS AS (
+                            start ||
+                            '--' ||
+                            end ||
+                            '--' ||
+                            region_name ||
+                            '--' ||
+                            event ||
+                            '--' ||
+                            description ||
+                            '--' ||
+                            level
+                    ) VIRTUAL,
+    CHECK           (start <= end),
+    CHECK           (altitude_start <= altitude_end),
+    UNIQUE (start, end, region_name, event, description, level)
+) STRICT""",
+        """
+INSERT INTO warning_new (
+    id,
+    state,
+    wtype,
+    level,
+    start,
+    end,
+    region_name,
+    description,
+    event,
+    headline,
+    instruction,
+    state_short,
+    altitude_start,
+    altitude_end,
+    acknowledged)
+SELECT
+    id,
+    state,
+    wtype,
+    level,
+    start,
+    end,
+    region_name,
+    description,
+    event,
+    headline,
+    instruction,
+    state_short,
+    altitude_start,
+    altitude_end,
+    acknowledged
+FROM warning
+        """,
+        "DROP TABLE warning",
+        "ALTER TABLE warning_new RENAME TO warning",
+        "CREATE INDEX wrn_reg_idx ON warning (region_name)",
+        "CREATE INDEX wrn_start_idx ON warning (start)",
+        "CREATE INDEX wrn_end_idx ON warning (end)",
+        "CREATE INDEX wrn_evt_idx ON warning (event)",
+        "CREATE INDEX wrn_ack_idx ON warning (acknowledged)",
+        """
+CREATE TABLE forecast_new (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp INTEGER NOT NULL,
+    latitude REAL NOT NULL,
+    longitude REAL NOT NULL,
+    location_id INTEGER,
+    summary TEXT NOT NULL,
+    icon TEXT NOT NULL,
+    prob_rain INTEGER NOT NULL,
+    temperature INTEGER NOT NULL,
+    temperature_apparent INTEGER NOT NULL,
+    humidity INTEGER NOT NULL,
+    wind_speed INTEGER NOT NULL,
+    visibility REAL NOT NULL,
+    FOREIGN KEY (location_id) REFERENCES location (id)
+      ON DELETE SET NULL
+      ON UPDATE RESTRICT,
+    UNIQUE (latitude, longitude, timestamp),
+    CHECK (prob_rain >= 0),
+    CHECK (temperature BETWEEN -60 AND 50),
+    CHECK (humidity >= 0),
+    CHECK (wind_speed >= 0),
+    CHECK (visibility >= 0)
+) STRICT""",
+        """
+INSERT INTO forecast_new (
+    id,
+    timestamp,
+    latitude,
+    longitude,
+    location_id,
+    summary,
+    icon,
+    prob_rain,
+    temperature,
+    temperature_apparent,
+    humidity,
+    wind_speed,
+    visibility)
+SELECT
+    id,
+    timestamp,
+    latitude,
+    longitude,
+    location_id,
+    summary,
+    icon,
+    prob_rain,
+    temperature,
+    temperature_apparent,
+    humidity,
+    wind_speed,
+    visibility
+FROM forecast
+        """,
+        "DROP TABLE forecast",
+        "ALTER TABLE forecast_new RENAME TO forecast",
+        "CREATE INDEX fc_time_idx ON forecast (timestamp)",
+        "CREATE INDEX fc_loc_idx ON forecast (location_id, timestamp)",
+        """
+CREATE TABLE hourly_new (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    forecast_id INTEGER NOT NULL,
+    timestamp INTEGER NOT NULL,
+    icon TEXT NOT NULL,
+    prob_rain INTEGER NOT NULL,
+    rain_amt REAL NOT NULL,
+    temperature INTEGER NOT NULL,
+    humidity INTEGER NOT NULL,
+    pressure REAL NOT NULL,
+    wind_speed INTEGER NOT NULL,
+    cloud_cover INTEGER NOT NULL,
+    visibility REAL NOT NULL,
+    FOREIGN KEY (forecast_id) REFERENCES forecast (id)
+      ON DELETE CASCADE
+      ON UPDATE RESTRICT,
+    CHECK (prob_rain BETWEEN 0 AND 100),
+    CHECK (humidity BETWEEN 0 AND 100),
+    CHECK (cloud_cover BETWEEN 0 AND 100)
+    CHECK (wind_speed >= 0)
+) STRICT""",
+        """
+INSERT INTO hourly_new (
+    id,
+    forecast_id,
+    timestamp,
+    icon,
+    prob_rain,
+    rain_amt,
+    temperature,
+    humidity,
+    pressure,
+    wind_speed,
+    cloud_cover,
+    visibility)
+SELECT
+    id,
+    forecast_id,
+    timestamp,
+    icon,
+    prob_rain,
+    rain_amt,
+    temperature,
+    humidity,
+    pressure,
+    wind_speed,
+    cloud_cover,
+    visibility
+FROM hourly
+        """,
+        "DROP TABLE hourly",
+        "ALTER TABLE hourly_new RENAME TO hourly",
+        "CREATE INDEX h_time_idx ON hourly (timestamp)",
+        "CREATE INDEX h_fc_idx ON hourly (forecast_id, timestamp)",
+    ],
 ]
 
 
@@ -137,6 +477,40 @@ class Query(Enum):
     ForecastGetByPeriod = auto()
     HourlyAdd = auto()
     HourlyGetByForecast = auto()
+    HourlyGetByPeriod = auto()
+    HourlyGetRecent = auto()
+    ForecastGetByPeriodPage = auto()
+    WarningExport = auto()
+    ForecastExport = auto()
+    HourlyExport = auto()
+    WarningAddBatch = auto()
+    IndexGetByTable = auto()
+    ForecastGetCurrentByLocation = auto()
+    LocationAdd = auto()
+    LocationGetID = auto()
+    LocationGetAll = auto()
+    LocationAssignForecasts = auto()
+    ArchiveAdd = auto()
+    ArchiveGetAll = auto()
+    ArchiveGetByWarningPeriod = auto()
+    ArchiveGetByForecastPeriod = auto()
+    ArchiveGetOldest = auto()
+    ArchiveCopyLocations = auto()
+    ArchiveCopyWarnings = auto()
+    ArchiveCopyForecasts = auto()
+    ArchiveCopyHourly = auto()
+    ArchiveGetBounds = auto()
+    ArchiveDeleteWarnings = auto()
+    ArchiveDeleteForecasts = auto()
+    WarningAcknowledgeByID = auto()
+    WarningAcknowledgeMatching = auto()
+    ForecastUpsert = auto()
+    ForecastGetID = auto()
+    HourlyDeleteByForecast = auto()
+    WarningGetPage = auto()
+    WarningGetPageBack = auto()
+    ForecastGetPage = auto()
+    ForecastGetPageBack = auto()
 
 
 db_queries: Final[dict[Query, str]] = {
@@ -230,7 +604,9 @@ WHERE id = ?
     Query.ForecastAdd: """
 INSERT INTO forecast
     (timestamp,
-     location,
+     latitude,
+     longitude,
+     location_id,
      summary,
      icon,
      prob_rain,
@@ -240,14 +616,17 @@ INSERT INTO forecast
      wind_speed,
      visibility)
     VALUES
-    (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    (?, ?, ?,
+     (SELECT id FROM location WHERE latitude = ? AND longitude = ?),
+     ?, ?, ?, ?, ?, ?, ?, ?)
 RETURNING id
     """,
     Query.ForecastGetCurrent: """
 SELECT
     id,
     timestamp,
-    location,
+    latitude,
+    longitude,
     summary,
     icon,
     prob_rain,
@@ -264,7 +643,8 @@ LIMIT 1
 SELECT
     id,
     timestamp,
-    location,
+    latitude,
+    longitude,
     summary,
     icon,
     prob_rain,
@@ -274,14 +654,15 @@ SELECT
     wind_speed,
     visibility
 FROM forecast
-ORDER BY timestamp DESC
+ORDER BY timestamp DESC, id DESC
 LIMIT ?
     """,
     Query.ForecastGetByPeriod: """
 SELECT
     id,
     timestamp,
-    location,
+    latitude,
+    longitude,
     summary,
     icon,
     prob_rain,
@@ -326,147 +707,1342 @@ FROM hourly
 WHERE forecast_id = ?
 ORDER BY timestamp
     """,
-}
-
-
-class Database:
-    """Database provides a wrapper around the, uh, database connection
-    and exposes the operations to be performed on it."""
-
-    __slots__ = [
-        "db",
-        "log",
-        "path",
-    ]
-
-    db: sqlite3.Connection
-    log: logging.Logger
-    path: Final[str]
-
-    def __init__(self, path: str = "") -> None:
-        if path == "":
-            path = common.path.db()
-        self.path = path
-        self.log = common.get_logger("database")
-        self.log.debug("Open database at %s", path)
-        with OPEN_LOCK:
-            exist: Final[bool] = krylib.fexist(path)
-            self.db = sqlite3.connect(path)
-            self.db.isolation_level = None
-
-            cur: Final[sqlite3.Cursor] = self.db.cursor()
-            cur.execute("PRAGMA foreign_keys = true")
-            cur.execute("PRAGMA journal_mode = WAL")
-
-            if not exist:
-                self.__create_db()
-
-    def __create_db(self) -> None:
-        """Initialize a freshly created database"""
-        self.log.debug("Initialize fresh database at %s", self.path)
-        with self.db:
-            for query in INIT_QUERIES:
-                cur: sqlite3.Cursor = self.db.cursor()
-                cur.execute(query)
-        self.log.debug("Database initialized successfully.")
-
-    def __enter__(self) -> None:
-        self.db.__enter__()
-
-    def __exit__(self, ex_type, ex_val, traceback):
-        return self.db.__exit__(ex_type, ex_val, traceback)
-
-    def warning_add(self, w: WeatherWarning) -> None:
-        """Add one warning to the database."""
-        self.log.debug("Add warning to database: %s in %s from %s to %s",
-                       w.event,
-                       w.region_name,
-                       w.start.strftime(common.TIME_FMT),
-                       w.end.strftime(common.TIME_FMT))
-        cur: Final[sqlite3.Cursor] = self.db.cursor()
-        cur.execute(db_queries[Query.WarningAdd],
-                    (
-                        w.state,
-                        w.wtype,
-                        w.level,
-                        int(w.start.timestamp()),
-                        int(w.end.timestamp()),
-                        w.region_name,
-                        w.description,
-                        w.event,
-                        w.headline,
-                        w.instruction,
-                        w.state_short,
-                        w.altitude_start,
-                        w.altitude_end,
-                    ))
-        row = cur.fetchone()
-        w.wid = row[0]
-
-    def warning_get_all(self) -> list[WeatherWarning]:
-        """Fetch all warnings from the database.
-        Caveat programmor."""
-        cur: Final[sqlite3.Cursor] = self.db.cursor()
-        cur.execute(db_queries[Query.WarningGetAll])
-        results: list[WeatherWarning] = []
-        for row in cur:
-            raw: dict = {
-                "state": row[1],
-                "type": row[2],
-                "level": row[3],
-                "start": row[4] * 1000,
-                "end": row[5] * 1000,
-                "regionName": row[6],
-                "description": row[7],
-                "event": row[8],
-                "headline": row[9],
-                "instruction": row[10],
-                "stateShort": row[11],
-                "altitudeStart": row[12],
-                "altitudeEnd": row[13],
-                "acknowledged": row[14],
-            }
-            record = WeatherWarning(raw, row[0])
-            results.append(record)
-        return results
-
-    def warning_get_by_period(self, t1: datetime, t2: datetime) -> \
-            list[WeatherWarning]:
-        """Fetch all warnings for the given period."""
-        cur: Final[sqlite3.Cursor] = self.db.cursor()
-        cur.execute(db_queries[Query.WarningGetByPeriod],
-                    (ceil(t2.timestamp()),
-                     floor(t1.timestamp())))
-        results: list[WeatherWarning] = []
-        for row in cur:
-            raw: dict = {
-                "state": row[1],
-                "type": row[2],
-                "level": row[3],
-                "start": row[4] * 1000,
-                "end": row[5] * 1000,
-                "regionName": row[6],
-                "description": row[7],
-                "event": row[8],
-                "headline": row[9],
-                "instruction": row[10],
-                "stateShort": row[11],
-                "altitudeStart": row[12],
-                "altitudeEnd": row[13],
-                "acknowledged": row[14],
-            }
-            record = WeatherWarning(raw, row[0])
-            results.append(record)
-        return results
-
-    def warning_get_keys(self) -> set[str]:
-        """Return the keys of all warnings stored in the database."""
-        cnt: int = 0
-        cur: Final[sqlite3.Cursor] = self.db.cursor()
-        cur.execute(db_queries[Query.WarningGetKeys])
-        results: set[str] = set()
-        for row in cur:
-            cnt += 1
+    Query.HourlyGetByPeriod: """
+SELECT
+    h.id,
+    h.timestamp,
+    h.icon,
+    h.prob_rain,
+    h.rain_amt,
+    h.temperature,
+    h.humidity,
+    h.pressure,
+    h.wind_speed,
+    h.cloud_cover,
+    h.visibility,
+    h.forecast_id
+FROM hourly h
+INNER JOIN forecast f ON h.forecast_id = f.id
+WHERE f.timestamp BETWEEN ? AND ?
+ORDER BY h.forecast_id, h.timestamp
+    """,
+    Query.HourlyGetRecent: """
+SELECT
+    h.id,
+    h.timestamp,
+    h.icon,
+    h.prob_rain,
+    h.rain_amt,
+    h.temperature,
+    h.humidity,
+    h.pressure,
+    h.wind_speed,
+    h.cloud_cover,
+    h.visibility,
+    h.forecast_id
+FROM hourly h
+WHERE h.forecast_id IN (
+    SELECT id FROM forecast
+    WHERE (timestamp, id) >= (?, ?))
+ORDER BY h.forecast_id, h.timestamp
+    """,
+    Query.ForecastGetByPeriodPage: """
+SELECT
+    id,
+    timestamp,
+    latitude,
+    longitude,
+    summary,
+    icon,
+    prob_rain,
+    temperature,
+    temperature_apparent,
+    humidity,
+    wind_speed,
+    visibility
+FROM forecast
+WHERE (timestamp, id) > (?, ?) AND timestamp <= ?
+ORDER BY timestamp, id
+LIMIT ?
+    """,
+    Query.WarningExport: """
+SELECT
+    id,
+    state,
+    wtype,
+    level,
+    start,
+    end,
+    region_name,
+    description,
+    event,
+    headline,
+    instruction,
+    state_short,
+    altitude_start,
+    altitude_end,
+    acknowledged
+FROM warning
+WHERE id > ? AND start BETWEEN ? AND ?
+ORDER BY id
+LIMIT ?
+    """,
+    Query.ForecastExport: """
+SELECT
+    id,
+    timestamp,
+    latitude,
+    longitude,
+    location_id,
+    summary,
+    icon,
+    prob_rain,
+    temperature,
+    temperature_apparent,
+    humidity,
+    wind_speed,
+    visibility
+FROM forecast
+WHERE id > ? AND timestamp BETWEEN ? AND ?
+ORDER BY id
+LIMIT ?
+    """,
+    Query.HourlyExport: """
+SELECT
+    id,
+    forecast_id,
+    timestamp,
+    icon,
+    prob_rain,
+    rain_amt,
+    temperature,
+    humidity,
+    pressure,
+    wind_speed,
+    cloud_cover,
+    visibility
+FROM hourly
+WHERE id > ? AND timestamp BETWEEN ? AND ?
+ORDER BY id
+LIMIT ?
+    """,
+    Query.WarningAddBatch: """
+INSERT OR IGNORE INTO warning (
+    state,
+    wtype,
+    level,
+    start,
+    end,
+    region_name,
+    description,
+    event,
+    headline,
+    instruction,
+    state_short,
+    altitude_start,
+    altitude_end)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    Query.IndexGetByTable: """
+SELECT
+    name,
+    sql
+FROM sqlite_master
+WHERE type = 'index'
+    AND tbl_name = ?
+    AND sql IS NOT NULL
+    """,
+    Query.ForecastGetCurrentByLocation: """
+SELECT
+    id,
+    timestamp,
+    latitude,
+    longitude,
+    summary,
+    icon,
+    prob_rain,
+    temperature,
+    temperature_apparent,
+    humidity,
+    wind_speed,
+    visibility
+FROM forecast
+WHERE latitude = ? AND longitude = ?
+ORDER BY timestamp DESC
+LIMIT 1
+    """,
+    Query.LocationAdd: """
+INSERT INTO location (latitude, longitude, name)
+VALUES (?, ?, ?)
+ON CONFLICT (latitude, longitude) DO UPDATE SET name = excluded.name
+WHERE excluded.name <> '' AND name IS NOT excluded.name
+RETURNING id
+    """,
+    Query.LocationGetID: """
+SELECT id
+FROM location
+WHERE latitude = ? AND longitude = ?
+    """,
+    Query.LocationGetAll: """
+SELECT
+    id,
+    name,
+    latitude,
+    longitude
+FROM location
+ORDER BY name, id
+    """,
+    Query.LocationAssignForecasts: """
+UPDATE forecast
+SET location_id = ?
+WHERE latitude = ? AND longitude = ? AND location_id IS NULL
+    """,
+    Query.WarningAcknowledgeByID: """
+UPDATE warning
+SET acknowledged = ?
+WHERE id = ? AND acknowledged = 0
+    """,
+    Query.WarningAcknowledgeMatching: """
+UPDATE warning
+SET acknowledged = ?
+WHERE acknowledged = 0
+    AND (? IS NULL OR region_name = ?)
+    AND (? IS NULL OR event = ?)
+    AND (? IS NULL OR level = ?)
+    AND (? IS NULL OR start <= ?)
+    AND (? IS NULL OR ? <= end)
+    """,
+    Query.ForecastUpsert: """
+INSERT INTO forecast
+    (timestamp,
+     latitude,
+     longitude,
+     location_id,
+     summary,
+     icon,
+     prob_rain,
+     temperature,
+     temperature_apparent,
+     humidity,
+     wind_speed,
+     visibility)
+    VALUES
+    (?, ?, ?,
+     (SELECT id FROM location WHERE latitude = ? AND longitude = ?),
+     ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (latitude, longitude, timestamp) DO UPDATE SET
+    summary = excluded.summary,
+    icon = excluded.icon,
+    prob_rain = excluded.prob_rain,
+    temperature = excluded.temperature,
+    temperature_apparent = excluded.temperature_apparent,
+    humidity = excluded.humidity,
+    wind_speed = excluded.wind_speed,
+    visibility = excluded.visibility
+WHERE (summary,
+       icon,
+       prob_rain,
+       temperature,
+       temperature_apparent,
+       humidity,
+       wind_speed,
+       visibility)
+    IS NOT
+      (excluded.summary,
+       excluded.icon,
+       excluded.prob_rain,
+       excluded.temperature,
+       excluded.temperature_apparent,
+       excluded.humidity,
+       excluded.wind_speed,
+       excluded.visibility)
+RETURNING id
+    """,
+    Query.ForecastGetID: """
+SELECT id
+FROM forecast
+WHERE latitude = ? AND longitude = ? AND timestamp = ?
+    """,
+    Query.HourlyDeleteByForecast: """
+DELETE FROM hourly
+WHERE forecast_id = ?
+    """,
+    Query.WarningGetPage: """
+SELECT
+    id,
+    state,
+    wtype,
+    level,
+    start,
+    end,
+    region_name,
+    description,
+    event,
+    headline,
+    instruction,
+    state_short,
+    altitude_start,
+    altitude_end,
+    acknowledged
+FROM warning
+WHERE (start, id) > (?, ?)
+ORDER BY start, id
+LIMIT ?
+    """,
+    Query.WarningGetPageBack: """
+SELECT
+    id,
+    state,
+    wtype,
+    level,
+    start,
+    end,
+    region_name,
+    description,
+    event,
+    headline,
+    instruction,
+    state_short,
+    altitude_start,
+    altitude_end,
+    acknowledged
+FROM warning
+WHERE (start, id) < (?, ?)
+ORDER BY start DESC, id DESC
+LIMIT ?
+    """,
+    Query.ForecastGetPage: """
+SELECT
+    id,
+    timestamp,
+    latitude,
+    longitude,
+    summary,
+    icon,
+    prob_rain,
+    temperature,
+    temperature_apparent,
+    humidity,
+    wind_speed,
+    visibility
+FROM forecast
+WHERE (timestamp, id) > (?, ?)
+ORDER BY timestamp, id
+LIMIT ?
+    """,
+    Query.ForecastGetPageBack: """
+SELECT
+    id,
+    timestamp,
+    latitude,
+    longitude,
+    summary,
+    icon,
+    prob_rain,
+    temperature,
+    temperature_apparent,
+    humidity,
+    wind_speed,
+    visibility
+FROM forecast
+WHERE (timestamp, id) < (?, ?)
+ORDER BY timestamp DESC, id DESC
+LIMIT ?
+    """,
+    Query.ArchiveAdd: """
+INSERT INTO archive (
+    name,
+    path,
+    period_start,
+    period_end,
+    warning_start,
+    warning_end,
+    forecast_start,
+    forecast_end,
+    created)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    Query.ArchiveGetAll: """
+SELECT
+    name,
+    path,
+    period_start,
+    period_end
+FROM archive
+ORDER BY period_start
+    """,
+    Query.ArchiveGetByWarningPeriod: """
+SELECT
+    path
+FROM archive
+WHERE warning_start <= ? AND ? <= warning_end
+ORDER BY period_start
+    """,
+    Query.ArchiveGetByForecastPeriod: """
+SELECT
+    path
+FROM archive
+WHERE forecast_start <= ? AND ? <= forecast_end
+ORDER BY period_start
+    """,
+    Query.ArchiveGetOldest: """
+SELECT
+    (SELECT MIN(end) FROM warning),
+    (SELECT MIN(timestamp) FROM forecast)
+    """,
+    Query.ArchiveCopyLocations: """
+INSERT INTO arch.location (id, latitude, longitude, name)
+SELECT id, latitude, longitude, name FROM main.location
+    """,
+    Query.ArchiveCopyWarnings: """
+INSERT INTO arch.warning (
+    id,
+    state,
+    wtype,
+    level,
+    start,
+    end,
+    region_name,
+    description,
+    event,
+    headline,
+    instruction,
+    state_short,
+    altitude_start,
+    altitude_end,
+    acknowledged)
+SELECT
+    id,
+    state,
+    wtype,
+    level,
+    start,
+    end,
+    region_name,
+    description,
+    event,
+    headline,
+    instruction,
+    state_short,
+    altitude_start,
+    altitude_end,
+    acknowledged
+FROM main.warning
+WHERE end >= ? AND end < ?
+    """,
+    Query.ArchiveCopyForecasts: """
+INSERT INTO arch.forecast (
+    id,
+    timestamp,
+    latitude,
+    longitude,
+    location_id,
+    summary,
+    icon,
+    prob_rain,
+    temperature,
+    temperature_apparent,
+    humidity,
+    wind_speed,
+    visibility)
+SELECT
+    id,
+    timestamp,
+    latitude,
+    longitude,
+    location_id,
+    summary,
+    icon,
+    prob_rain,
+    temperature,
+    temperature_apparent,
+    humidity,
+    wind_speed,
+    visibility
+FROM main.forecast
+WHERE timestamp >= ? AND timestamp < ?
+    """,
+    Query.ArchiveCopyHourly: """
+INSERT INTO arch.hourly (
+    id,
+    forecast_id,
+    timestamp,
+    icon,
+    prob_rain,
+    rain_amt,
+    temperature,
+    humidity,
+    pressure,
+    wind_speed,
+    cloud_cover,
+    visibility)
+SELECT
+    h.id,
+    h.forecast_id,
+    h.timestamp,
+    h.icon,
+    h.prob_rain,
+    h.rain_amt,
+    h.temperature,
+    h.humidity,
+    h.pressure,
+    h.wind_speed,
+    h.cloud_cover,
+    h.visibility
+FROM main.hourly h
+INNER JOIN arch.forecast f ON h.forecast_id = f.id
+    """,
+    Query.ArchiveGetBounds: """
+SELECT
+    (SELECT MIN(start) FROM arch.warning),
+    (SELECT MAX(end) FROM arch.warning),
+    (SELECT MIN(timestamp) FROM arch.forecast),
+    (SELECT MAX(timestamp) FROM arch.forecast),
+    (SELECT COUNT(*) FROM arch.warning),
+    (SELECT COUNT(*) FROM arch.forecast),
+    (SELECT COUNT(*) FROM arch.hourly)
+    """,
+    Query.ArchiveDeleteWarnings: """
+DELETE FROM main.warning
+WHERE id IN (SELECT id FROM arch.warning)
+    """,
+    Query.ArchiveDeleteForecasts: """
+DELETE FROM main.forecast
+WHERE id IN (SELECT id FROM arch.forecast)
+    """,
+}
+
+# The period and paging queries, with the name of the schema to run them
+# against left open, so they can be combined across the hot database and the
+# archive files attached to it.
+archive_queries: Final[dict[Query, str]] = {
+    Query.WarningGetByPeriod: """
+SELECT
+    id,
+    state,
+    wtype,
+    level,
+    start,
+    end,
+    region_name,
+    description,
+    event,
+    headline,
+    instruction,
+    state_short,
+    altitude_start,
+    altitude_end,
+    acknowledged
+FROM {schema}.warning
+WHERE start <= ? AND ? <= end
+    """,
+    Query.ForecastGetByPeriod: """
+SELECT
+    id,
+    timestamp,
+    latitude,
+    longitude,
+    summary,
+    icon,
+    prob_rain,
+    temperature,
+    temperature_apparent,
+    humidity,
+    wind_speed,
+    visibility
+FROM {schema}.forecast
+WHERE timestamp BETWEEN ? AND ?
+    """,
+    Query.HourlyGetByPeriod: """
+SELECT
+    h.id,
+    h.timestamp AS timestamp,
+    h.icon,
+    h.prob_rain,
+    h.rain_amt,
+    h.temperature,
+    h.humidity,
+    h.pressure,
+    h.wind_speed,
+    h.cloud_cover,
+    h.visibility,
+    h.forecast_id AS forecast_id
+FROM {schema}.hourly h
+INNER JOIN {schema}.forecast f ON h.forecast_id = f.id
+WHERE f.timestamp BETWEEN ? AND ?
+    """,
+    Query.WarningGetPage: """
+SELECT * FROM (
+SELECT
+    id,
+    state,
+    wtype,
+    level,
+    start,
+    end,
+    region_name,
+    description,
+    event,
+    headline,
+    instruction,
+    state_short,
+    altitude_start,
+    altitude_end,
+    acknowledged
+FROM {schema}.warning
+WHERE (start, id) > (?, ?)
+ORDER BY start, id
+LIMIT ?)
+    """,
+    Query.WarningGetPageBack: """
+SELECT * FROM (
+SELECT
+    id,
+    state,
+    wtype,
+    level,
+    start,
+    end,
+    region_name,
+    description,
+    event,
+    headline,
+    instruction,
+    state_short,
+    altitude_start,
+    altitude_end,
+    acknowledged
+FROM {schema}.warning
+WHERE (start, id) < (?, ?)
+ORDER BY start DESC, id DESC
+LIMIT ?)
+    """,
+    Query.ForecastGetPage: """
+SELECT * FROM (
+SELECT
+    id,
+    timestamp,
+    latitude,
+    longitude,
+    summary,
+    icon,
+    prob_rain,
+    temperature,
+    temperature_apparent,
+    humidity,
+    wind_speed,
+    visibility
+FROM {schema}.forecast
+WHERE (timestamp, id) > (?, ?)
+ORDER BY timestamp, id
+LIMIT ?)
+    """,
+    Query.ForecastGetPageBack: """
+SELECT * FROM (
+SELECT
+    id,
+    timestamp,
+    latitude,
+    longitude,
+    summary,
+    icon,
+    prob_rain,
+    temperature,
+    temperature_apparent,
+    humidity,
+    wind_speed,
+    visibility
+FROM {schema}.forecast
+WHERE (timestamp, id) < (?, ?)
+ORDER BY timestamp DESC, id DESC
+LIMIT ?)
+    """,
+}
+
+# The ORDER BY (and LIMIT) clauses to append to the combined queries.
+archive_order: Final[dict[Query, str]] = {
+    Query.WarningGetByPeriod: "ORDER BY start, region_name",
+    Query.ForecastGetByPeriod: "ORDER BY timestamp",
+    Query.HourlyGetByPeriod: "ORDER BY forecast_id, timestamp",
+    Query.WarningGetPage: "ORDER BY start, id LIMIT ?",
+    Query.WarningGetPageBack: "ORDER BY start DESC, id DESC LIMIT ?",
+    Query.ForecastGetPage: "ORDER BY timestamp, id LIMIT ?",
+    Query.ForecastGetPageBack: "ORDER BY timestamp DESC, id DESC LIMIT ?",
+}
+
+# Maps the queries to page forward through warnings and Forecasts to the
+# query to page backward and the query to find the archive files that might
+# hold rows for them.
+page_queries: Final[dict[Query, tuple[Query, Query]]] = {
+    Query.WarningGetPage: (Query.WarningGetPageBack, Query.ArchiveGetByWarningPeriod),
+    Query.ForecastGetPage: (Query.ForecastGetPageBack, Query.ArchiveGetByForecastPeriod),
+}
+
+# The modes PRAGMA wal_checkpoint accepts.
+CHECKPOINT_MODES: Final[tuple[str, ...]] = ("PASSIVE", "FULL", "RESTART", "TRUNCATE")
+
+# The number of pages copied per step of a snapshot.
+SNAPSHOT_PAGES: Final[int] = 1024
+
+
+# The VFS SQLite uses for regular files.
+FILE_VFS: Final[str] = "unix"
+
+
+def is_memory(path: str) -> bool:
+    """Return True if <path> refers to an in-memory database."""
+    return path == ":memory:" or \
+        (path.startswith("file:") and ("mode=memory" in path or "vfs=memdb" in path))
+
+
+def file_uri(path: str, params: str = "") -> str:
+    """Return the URI of the database file at <path>, with the query
+    string <params>, to ATTACH it with. The file is opened with the
+    regular VFS, even if the database it is attached to uses another one,
+    e.g. memdb."""
+    query: Final[str] = f"vfs={FILE_VFS}" if params == "" else f"{params}&vfs={FILE_VFS}"
+    return f"file:{quote(path)}?{query}"
+
+
+# SQLite allows no more than ten databases to be attached to a connection
+# by default, so archives are attached (at most) this many at a time.
+ATTACH_LIMIT: Final[int] = 8
+
+# Pages of warnings and forecasts are located by the timestamp and ID of the
+# record adjacent to them. These keys lie before and after all records.
+PAGE_FIRST: Final[tuple[int, int]] = (-(2 ** 63), 0)
+PAGE_LAST: Final[tuple[int, int]] = (2 ** 63 - 1, 0)
+
+# Maps the names of the tables that can be exported to the query used to
+# stream them.
+export_queries: Final[dict[str, Query]] = {
+    "warning": Query.WarningExport,
+    "forecast": Query.ForecastExport,
+    "hourly": Query.HourlyExport,
+}
+
+
+# Upper bounds (in seconds) of the buckets of the latency histograms.
+# Anything slower than the last bound ends up in an extra overflow bucket.
+LATENCY_BUCKETS: Final[tuple[float, ...]] = \
+    (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+# Queries taking longer than this many seconds are logged as slow.
+SLOW_QUERY_THRESHOLD: Final[float] = 0.25
+
+
+class QueryStats:
+    """QueryStats collects the number of calls, latencies and number of rows
+    for each kind of Query, across all Database instances in the process.
+    Queries that take longer than <slow_threshold> seconds are logged and
+    the most recent ones are kept around. If <explain> is set and the
+    application runs in debug mode, their query plan is captured, too."""
+
+    __slots__ = [
+        "lock",
+        "log",
+        "slow_threshold",
+        "explain",
+        "calls",
+        "slow",
+    ]
+
+    lock: threading.Lock
+    log: logging.Logger
+    slow_threshold: float
+    explain: bool
+    calls: dict[Query, dict[str, Any]]
+    slow: deque
+
+    def __init__(self, threshold: float = SLOW_QUERY_THRESHOLD) -> None:
+        self.lock = threading.Lock()
+        self.log = common.get_logger("slowquery")
+        self.slow_threshold = threshold
+        self.explain = False
+        self.calls = {}
+        self.slow = deque(maxlen=100)
+
+    def record(self, q: Query, elapsed: float, rows: int) -> bool:
+        """Record one execution of a query.
+        Returns True if the query counts as slow."""
+        with self.lock:
+            try:
+                entry = self.calls[q]
+            except KeyError:
+                entry = {
+                    "count": 0,
+                    "total": 0.0,
+                    "max": 0.0,
+                    "rows": 0,
+                    "histogram": [0] * (len(LATENCY_BUCKETS) + 1),
+                }
+                self.calls[q] = entry
+            entry["count"] += 1
+            entry["total"] += elapsed
+            entry["rows"] += rows
+            entry["max"] = max(entry["max"], elapsed)
+            entry["histogram"][bisect_left(LATENCY_BUCKETS, elapsed)] += 1
+            return elapsed >= self.slow_threshold
+
+    def record_slow(self, q: Query, elapsed: float, rows: int, plan: list[str]) -> None:
+        """Log a slow query and remember it."""
+        self.log.warning("Slow query %s: %.1f ms, %d rows%s",
+                         q.name,
+                         elapsed * 1000,
+                         rows,
+                         "" if len(plan) == 0 else "\n" + "\n".join(plan))
+        with self.lock:
+            self.slow.append({
+                "query": q.name,
+                "timestamp": time.time(),
+                "elapsed": elapsed,
+                "rows": rows,
+                "plan": plan,
+            })
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return a copy of the statistics gathered so far, keyed by the
+        name of the Query."""
+        with self.lock:
+            result: dict[str, Any] = {}
+            for q, entry in self.calls.items():
+                result[q.name] = {
+                    "count": entry["count"],
+                    "total": entry["total"],
+                    "mean": entry["total"] / entry["count"],
+                    "max": entry["max"],
+                    "rows": entry["rows"],
+                    "histogram": dict(zip([*LATENCY_BUCKETS, float("inf")],
+                                          entry["histogram"])),
+                }
+            return result
+
+    def slow_queries(self) -> list[dict[str, Any]]:
+        """Return the most recent slow queries."""
+        with self.lock:
+            return list(self.slow)
+
+    def reset(self) -> None:
+        """Discard all statistics gathered so far."""
+        with self.lock:
+            self.calls.clear()
+            self.slow.clear()
+
+
+stats: Final[QueryStats] = QueryStats()
+
+
+# How deeply instrumented Database methods are nested in the calling thread.
+_nesting: Final[threading.local] = threading.local()
+
+
+def _row_count(result: Any) -> int:
+    """Return the number of rows a Database method has returned. Only
+    lists and tuples are counted, methods returning anything else have to
+    tell instrument how to count their result."""
+    match result:
+        case list() | tuple():
+            return len(result)
+        case _:
+            return 0
+
+
+def instrument(q: Query, rows: Optional[Callable[[Any], int]] = None) -> Callable:
+    """Decorate a Database method to record its execution in the
+    QueryStats under <q>. For generators, only the time spent inside the
+    generator is counted, not the time the caller takes to consume it, and
+    each item it yields counts as one row.
+    If <rows> is given, it is called with the method's result and returns
+    the number of rows to record, e.g. for methods that return the number
+    of rows they have modified.
+    If an instrumented method calls another one, only the outer call is
+    recorded, it includes the time and rows of the inner one."""
+    count: Final[Callable[[Any], int]] = rows if rows is not None else _row_count
+
+    def decorator(method: Callable) -> Callable:
+        if inspect.isgeneratorfunction(method):
+            @functools.wraps(method)
+            def gen_wrapper(self, *args, **kwargs):
+                elapsed: float = 0.0
+                n: int = 0
+                outer: Final[bool] = getattr(_nesting, "depth", 0) == 0
+                gen = method(self, *args, **kwargs)
+                try:
+                    while True:
+                        t1 = time.perf_counter()
+                        _nesting.depth = getattr(_nesting, "depth", 0) + 1
+                        try:
+                            item = next(gen)
+                        except StopIteration:
+                            return
+                        finally:
+                            _nesting.depth -= 1
+                            elapsed += time.perf_counter() - t1
+                        n += 1
+                        yield item
+                finally:
+                    if outer:
+                        self._observe(q, elapsed, n)  # pylint: disable-msg=W0212
+            return gen_wrapper
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            n: int = 0
+            depth: Final[int] = getattr(_nesting, "depth", 0)
+            _nesting.depth = depth + 1
+            t1: Final[float] = time.perf_counter()
+            try:
+                result = method(self, *args, **kwargs)
+                n = count(result)
+                return result
+            finally:
+                _nesting.depth = depth
+                if depth == 0:
+                    self._observe(q, time.perf_counter() - t1, n)  # pylint: disable-msg=W0212
+        return wrapper
+    return decorator
+
+
+# All SQL goes through Database, so it has one method per operation
+# instead of a handful of generic ones.
+# pylint: disable-msg=R0904
+class Database:
+    """Database provides a wrapper around the, uh, database connection
+    and exposes the operations to be performed on it."""
+
+    __slots__ = [
+        "db",
+        "log",
+        "path",
+        "depth",
+    ]
+
+    db: sqlite3.Connection
+    log: logging.Logger
+    path: Final[str]
+    depth: int
+
+    def __init__(self, path: str = "") -> None:
+        if path == "":
+            path = common.path.db()
+        self.path = path
+        self.depth = 0
+        self.log = common.get_logger("database")
+        self.log.debug("Open database at %s", path)
+        with OPEN_LOCK:
+            memory: Final[bool] = is_memory(path)
+            exist: bool = not memory and krylib.fexist(path)
+            self.db = sqlite3.connect(path, uri=True)
+            self.db.isolation_level = None
+
+            cur: Final[sqlite3.Cursor] = self.db.cursor()
+            cur.execute("PRAGMA foreign_keys = true")
+            if memory:
+                # A shared in-memory database lives as long as any
+                # connection to it, so it might be populated already.
+                cur.execute("SELECT COUNT(*) FROM sqlite_master")
+                exist = cur.fetchone()[0] > 0
+            else:
+                cur.execute("PRAGMA journal_mode = WAL")
+            # The journal_mode PRAGMA returns a row, and as long as it has
+            # not been consumed, the statement counts as in progress,
+            # which would keep us from committing a transaction.
+            cur.close()
+
+            if not exist:
+                self.__create_db()
+            else:
+                self.__migrate()
+                self.__restore_indices()
+
+    def __create_db(self) -> None:
+        """Initialize a freshly created database"""
+        self.log.debug("Initialize fresh database at %s", self.path)
+        with self.db:
+            for query in INIT_QUERIES:
+                cur: sqlite3.Cursor = self.db.cursor()
+                cur.execute(query)
+            self.db.execute(f"PRAGMA user_version = {len(MIGRATIONS)}")
+        self.log.debug("Database initialized successfully.")
+
+    def __migrate(self) -> None:
+        """Bring the schema of an existing database up to date.
+        Some migrations need to rebuild tables other tables refer to, so
+        foreign key enforcement is disabled while they run. Otherwise,
+        dropping the old table would cascade to the rows referring to it."""
+        cur: Final[sqlite3.Cursor] = self.db.cursor()
+        cur.execute("PRAGMA user_version")
+        version: Final[int] = cur.fetchone()[0]
+        if version >= len(MIGRATIONS):
+            return
+        cur.execute("PRAGMA foreign_keys = false")
+        try:
+            for idx in range(version, len(MIGRATIONS)):
+                self.log.info("Migrate database %s to schema version %d",
+                              self.path,
+                              idx + 1)
+                cur.execute("BEGIN IMMEDIATE")
+                try:
+                    for query in MIGRATIONS[idx]:
+                        cur.execute(query)
+                    cur.execute("PRAGMA foreign_key_check")
+                    if cur.fetchone() is not None:
+                        raise sqlite3.IntegrityError(
+                            f"Migration to version {idx + 1} violates foreign key constraints")  # noqa: E501
+                    cur.execute(f"PRAGMA user_version = {idx + 1}")
+                except sqlite3.Error:
+                    cur.execute("ROLLBACK")
+                    raise
+                cur.execute("COMMIT")
+        finally:
+            cur.execute("PRAGMA foreign_keys = true")
+
+    def __restore_indices(self) -> None:
+        """Create the indices that are missing from the database.
+        A bulk import drops the indices on the warning table, so if it
+        crashes before it re-creates them, they are restored here."""
+        cur: Final[sqlite3.Cursor] = self.db.cursor()
+        cur.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+        present: Final[set[str]] = {row[0] for row in cur.fetchall()}
+        for query in INIT_QUERIES:
+            if not query.startswith("CREATE INDEX"):
+                continue
+            name: str = query.split()[2]
+            if name not in present:
+                self.log.warning("Index %s is missing from %s, create it",
+                                 name,
+                                 self.path)
+                cur.execute(query)
+
+    @contextmanager
+    def bulk_mode(self) -> Iterator[None]:
+        """Relax the durability guarantees of the database connection for
+        the duration of a bulk import.
+        If the process crashes during that time, the most recent
+        transactions might be lost, but the database stays consistent."""
+        cur: Final[sqlite3.Cursor] = self.db.cursor()
+        saved: Final[dict[str, int]] = {}
+        for pragma in ("synchronous", "cache_size", "temp_store"):
+            cur.execute(f"PRAGMA {pragma}")
+            saved[pragma] = cur.fetchone()[0]
+        cur.execute("PRAGMA synchronous = OFF")
+        cur.execute("PRAGMA cache_size = -262144")
+        cur.execute("PRAGMA temp_store = MEMORY")
+        try:
+            yield
+        finally:
+            for pragma, value in saved.items():
+                cur.execute(f"PRAGMA {pragma} = {value}")
+
+    @instrument(Query.IndexGetByTable)
+    def index_drop(self, table: str) -> list[str]:
+        """Drop all explicitly created indices on <table>.
+        Returns the statements required to create them again."""
+        cur: Final[sqlite3.Cursor] = self.db.cursor()
+        cur.execute(db_queries[Query.IndexGetByTable], (table, ))
+        indices: Final[list[tuple[str, str]]] = cur.fetchall()
+        for idx in indices:
+            self.log.debug("Drop index %s", idx[0])
+            cur.execute(f"DROP INDEX {idx[0]}")
+        return [idx[1] for idx in indices]
+
+    def index_create(self, statements: list[str]) -> None:
+        """(Re-)create indices, e.g. after a bulk import."""
+        cur: Final[sqlite3.Cursor] = self.db.cursor()
+        for stmt in statements:
+            self.log.debug("Create index: %s", stmt)
+            cur.execute(stmt)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.db.close()
+
+    def snapshot(self,
+                 path: str,
+                 pages: int = SNAPSHOT_PAGES,
+                 progress: Optional[Callable[[int, int, int], None]] = None) -> None:
+        """Copy the database to the file at <path> using SQLite's online
+        backup API, <pages> pages at a time. Other connections can keep
+        using the database in the meantime.
+        If <progress> is given, it is called after each step with the
+        status, the number of pages remaining and the total number of pages.
+        The copy is written to a temporary file first, so an existing
+        snapshot is only replaced once the new one is complete."""
+        tmp: Final[str] = f"{path}.tmp"
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        t1: Final[float] = time.time()
+        target: Final[sqlite3.Connection] = sqlite3.connect(tmp)
+        try:
+            self.db.backup(target, pages=pages, progress=progress)
+        except sqlite3.Error:
+            target.close()
+            os.remove(tmp)
+            raise
+        target.close()
+        os.replace(tmp, path)
+        self.log.debug("Saved snapshot of %s to %s in %.2f seconds",
+                       self.path,
+                       path,
+                       time.time() - t1)
+
+    def restore(self, path: str) -> None:
+        """Replace the contents of the database with the snapshot at <path>.
+        If the snapshot was taken by an older version of the application,
+        its schema is brought up to date."""
+        source: Final[sqlite3.Connection] = \
+            sqlite3.connect(f"file:{quote(path)}?mode=ro", uri=True)
+        try:
+            source.backup(self.db)
+        finally:
+            source.close()
+        self.__migrate()
+        self.log.info("Restored %s from snapshot %s", self.path, path)
+
+    def quick_check(self) -> list[str]:
+        """Run a quick integrity check on the database.
+        Returns a list of problems, which is ["ok"] if there are none."""
+        cur: Final[sqlite3.Cursor] = self.db.cursor()
+        cur.execute("PRAGMA quick_check")
+        return [row[0] for row in cur]
+
+    def analyze(self, limit: int = 400) -> None:
+        """Update the statistics the query planner uses.
+        <limit> is the approximate number of rows examined per index, which
+        keeps ANALYZE fast on large tables."""
+        cur: Final[sqlite3.Cursor] = self.db.cursor()
+        cur.execute(f"PRAGMA analysis_limit = {int(limit)}")
+        cur.execute("ANALYZE")
+
+    def optimize(self) -> None:
+        """Let SQLite run whatever optimizations it deems useful."""
+        cur: Final[sqlite3.Cursor] = self.db.cursor()
+        cur.execute("PRAGMA optimize")
+
+    def space_reclaimable(self) -> int:
+        """Return the number of bytes a VACUUM would free."""
+        cur: Final[sqlite3.Cursor] = self.db.cursor()
+        cur.execute("PRAGMA freelist_count")
+        pages: Final[int] = cur.fetchone()[0]
+        return pages * self.page_size()
+
+    def page_size(self) -> int:
+        """Return the size of a database page in bytes."""
+        cur: Final[sqlite3.Cursor] = self.db.cursor()
+        cur.execute("PRAGMA page_size")
+        return cur.fetchone()[0]
+
+    def checkpoint(self, mode: str = "PASSIVE") -> tuple[int, int, int]:
+        """Run a WAL checkpoint in the given mode, which is one of PASSIVE,
+        FULL, RESTART or TRUNCATE.
+        Returns a flag that is 1 if the checkpoint could not run to
+        completion because of other connections, the number of frames in
+        the WAL and the number of frames copied back to the database."""
+        if mode not in CHECKPOINT_MODES:
+            raise ValueError(f"Invalid checkpoint mode {mode}")
+        cur: Final[sqlite3.Cursor] = self.db.cursor()
+        cur.execute(f"PRAGMA wal_checkpoint({mode})")
+        row: Final[tuple[int, int, int]] = cur.fetchone()
+        return row
+
+    def wal_size(self) -> int:
+        """Return the size of the WAL file in bytes."""
+        try:
+            return os.path.getsize(f"{self.path}-wal")
+        except OSError:
+            return 0
+
+    def data_version(self) -> int:
+        """Return a number that changes whenever another connection commits
+        a change to the database."""
+        cur: Final[sqlite3.Cursor] = self.db.cursor()
+        cur.execute("PRAGMA data_version")
+        return cur.fetchone()[0]
+
+    def _observe(self, q: Query, elapsed: float, rows: int) -> None:
+        """Record the execution of a query, and deal with it if it was slow."""
+        if not stats.record(q, elapsed, rows):
+            return
+        plan: list[str] = []
+        if common.DEBUG and stats.explain:
+            plan = self.explain(q)
+        stats.record_slow(q, elapsed, rows, plan)
+
+    def explain(self, q: Query) -> list[str]:
+        """Return the query plan for <q>. Since we do not know the parameters
+        the query was run with, NULL is used for all of them.
+        The plan is that of the SQL stored for <q>. Methods that assemble
+        their SQL at run time, e.g. to include archive files or to page
+        backwards, may have run a different statement."""
+        query: Final[str] = db_queries[q]
+        try:
+            cur: Final[sqlite3.Cursor] = self.db.cursor()
+            cur.execute(f"EXPLAIN QUERY PLAN {query}",
+                        (None, ) * query.count("?"))
+            return [f"{row[0]}|{row[1]}| {row[3]}" for row in cur]
+        except sqlite3.Error as e:
+            return [f"Cannot explain query {q.name}: {e}"]
+
+    def __enter__(self) -> None:
+        # The connection is in autocommit mode, so without an explicit
+        # BEGIN, every statement in a with block would be committed on its
+        # own.
+        # With blocks may be nested, only the outermost one commits or
+        # rolls back the transaction.
+        if self.depth == 0 and not self.db.in_transaction:
+            self.db.execute("BEGIN IMMEDIATE")
+        self.depth += 1
+
+    def __exit__(self, ex_type, ex_val, traceback):
+        self.depth -= 1
+        if self.depth > 0:
+            return False
+        return self.db.__exit__(ex_type, ex_val, traceback)
+
+    @instrument(Query.WarningAdd)
+    def warning_add(self, w: WeatherWarning) -> None:
+        """Add one warning to the database."""
+        self.log.debug("Add warning to database: %s in %s from %s to %s",
+                       w.event,
+                       w.region_name,
+                       w.start.strftime(common.TIME_FMT),
+                       w.end.strftime(common.TIME_FMT))
+        cur: Final[sqlite3.Cursor] = self.db.cursor()
+        cur.execute(db_queries[Query.WarningAdd], w.db_tuple())
+        row = cur.fetchone()
+        w.wid = row[0]
+
+    @instrument(Query.WarningAddBatch, int)
+    def warning_add_batch(self, warnings: list[WeatherWarning]) -> int:
+        """Add many warnings to the database in a single transaction,
+        silently skipping those that already exist.
+        Unlike warning_add, this does not set the warnings' IDs.
+        Returns the number of warnings that were actually added."""
+        before: Final[int] = self.db.total_changes
+        cur: Final[sqlite3.Cursor] = self.db.cursor()
+        own_tx: Final[bool] = not self.db.in_transaction
+        if own_tx:
+            cur.execute("BEGIN")
+        try:
+            cur.executemany(db_queries[Query.WarningAddBatch],
+                            (w.db_tuple() for w in warnings))
+        except sqlite3.Error:
+            if own_tx:
+                cur.execute("ROLLBACK")
+            raise
+        if own_tx:
+            cur.execute("COMMIT")
+        return self.db.total_changes - before
+
+    @instrument(Query.WarningGetAll)
+    def warning_get_all(self) -> list[WeatherWarning]:
+        """Fetch all warnings from the database.
+        Caveat programmor."""
+        cur: Final[sqlite3.Cursor] = self.db.cursor()
+        cur.execute(db_queries[Query.WarningGetAll])
+        return [self.__warning_from_row(row) for row in cur]
+
+    @instrument(Query.WarningGetByPeriod)
+    def warning_get_by_period(self, t1: datetime, t2: datetime) -> \
+            list[WeatherWarning]:
+        """Fetch all warnings for the given period, including those that
+        have been moved to archive files."""
+        p: Final[tuple[int, int]] = (ceil(t2.timestamp()), floor(t1.timestamp()))
+        archives: Final[list[str]] = \
+            self.__archives(Query.ArchiveGetByWarningPeriod, p)
+        rows: Final[list[tuple]] = \
+            self.__period_rows(Query.WarningGetByPeriod,
+                               p,
+                               archives,
+                               lambda row: (row[4], row[6]))
+        return [self.__warning_from_row(row) for row in rows]
+
+    @instrument(Query.WarningGetPage)
+    def warning_get_page(self,
+                         key: Optional[tuple[int, int]],
+                         n: int,
+                         forward: bool = True) -> list[WeatherWarning]:
+        """Get up to <n> warnings ordered by start and ID, following the
+        warning with the given (start, ID) <key>, or preceding it if
+        <forward> is False. If <key> is None, get the first (or last) <n>
+        warnings.
+        Like warning_get_by_period, this includes the warnings that have
+        been moved to archive files."""
+        rows: Final[list[tuple]] = self.__page(Query.WarningGetPage,
+                                               key,
+                                               n,
+                                               forward,
+                                               lambda row: (row[4], row[0]))
+        return [self.__warning_from_row(row) for row in rows]
+
+    def __page(self,
+               fwd: Query,
+               key: Optional[tuple[int, int]],
+               n: int,
+               forward: bool,
+               sort_key: Callable[[tuple], Any]) -> list[tuple]:
+        """Fetch a page of rows using keyset pagination, so every page costs
+        the same, no matter how far it is from the start.
+        The archive files that might hold rows beyond <key> are attached,
+        and each of them contributes up to <n> rows as well. <sort_key>
+        returns the (timestamp, ID) key of a row, it is used to merge the
+        rows if the archives have to be attached in several rounds."""
+        if key is None:
+            key = PAGE_FIRST if forward else PAGE_LAST
+        q: Final[Query] = fwd if forward else page_queries[fwd][0]
+        params: Final[tuple[int, int, int]] = (key[0], key[1], n)
+        archives: Final[list[str]] = \
+            self.__archives(page_queries[fwd][1],
+                            (PAGE_LAST[0], key[0]) if forward else (key[0], PAGE_FIRST[0]))
+        cur: Final[sqlite3.Cursor] = self.db.cursor()
+        rows: list[tuple] = []
+        if len(archives) == 0:
+            cur.execute(db_queries[q], params)
+            rows = cur.fetchall()
+        for idx in range(0, len(archives), ATTACH_LIMIT):
+            with self.__attached(archives[idx:idx+ATTACH_LIMIT]) as names:
+                schemas: list[str] = ["main", *names] if idx == 0 else names
+                query: str = " UNION ALL ".join(archive_queries[q].format(schema=s)
+                                                for s in schemas)
+                cur.execute(f"{query} {archive_order[q]}",
+                            params * len(schemas) + (n, ))
+                rows.extend(cur.fetchall())
+        if len(archives) > ATTACH_LIMIT:
+            rows.sort(key=sort_key, reverse=not forward)
+            del rows[n:]
+        if not forward:
+            rows.reverse()
+        return rows
+
+    @staticmethod
+    def __warning_from_row(row: tuple) -> WeatherWarning:
+        raw: Final[dict] = {
+            "state": row[1],
+            "type": row[2],
+            "level": row[3],
+            "start": row[4] * 1000,
+            "end": row[5] * 1000,
+            "regionName": row[6],
+            "description": row[7],
+            "event": row[8],
+            "headline": row[9],
+            "instruction": row[10],
+            "stateShort": row[11],
+            "altitudeStart": row[12],
+            "altitudeEnd": row[13],
+            "acknowledged": row[14],
+        }
+        return WeatherWarning(raw, row[0])
+
+    @instrument(Query.WarningGetKeys, len)
+    def warning_get_keys(self) -> set[str]:
+        """Return the keys of all warnings stored in the database."""
+        cnt: int = 0
+        cur: Final[sqlite3.Cursor] = self.db.cursor()
+        cur.execute(db_queries[Query.WarningGetKeys])
+        results: set[str] = set()
+        for row in cur:
+            cnt += 1
             results.add(row[0])
         self.log.debug("Found %d warnings in database", cnt)
         l: int = len(results)
@@ -475,6 +2051,7 @@ class Database:
             self.log.warning("Found %d duplicate warnings in database.", diff)
         return results
 
+    @instrument(Query.WarningHasKey)
     def warning_has_key(self, key: str) -> bool:
         """Check if the given key is present in the database."""
         cur: Final[sqlite3.Cursor] = self.db.cursor()
@@ -482,6 +2059,7 @@ class Database:
         row = cur.fetchone()
         return row[0] > 0
 
+    @instrument(Query.WarningExists)
     def warning_exist(self, w: WeatherWarning) -> bool:
         """Return True if an identical warning already exists."""
         cur: Final[sqlite3.Cursor] = self.db.cursor()
@@ -495,6 +2073,7 @@ class Database:
         row = cur.fetchone()
         return row[0] != 0
 
+    @instrument(Query.WarningAcknowledge)
     def warning_acknowledge(self, w: WeatherWarning) -> None:
         """Mark a WeatherWarning as acknowledged."""
         assert w.wid > 0
@@ -504,6 +2083,55 @@ class Database:
                     (stamp, w.wid))
         w.acknowledged = True
 
+    @instrument(Query.WarningAcknowledgeByID, int)
+    def warning_acknowledge_ids(self, ids: list[int]) -> int:
+        """Mark the warnings with the given IDs as acknowledged, in a single
+        transaction. Warnings that have been acknowledged before are left
+        alone.
+        Returns the number of warnings acknowledged."""
+        stamp: Final[int] = int(time.time())
+        before: Final[int] = self.db.total_changes
+        cur: Final[sqlite3.Cursor] = self.db.cursor()
+        own_tx: Final[bool] = not self.db.in_transaction
+        if own_tx:
+            cur.execute("BEGIN IMMEDIATE")
+        try:
+            cur.executemany(db_queries[Query.WarningAcknowledgeByID],
+                            ((stamp, i) for i in ids))
+        except sqlite3.Error:
+            if own_tx:
+                cur.execute("ROLLBACK")
+            raise
+        if own_tx:
+            cur.execute("COMMIT")
+        return self.db.total_changes - before
+
+    # pylint: disable-msg=R0913
+    @instrument(Query.WarningAcknowledgeMatching, int)
+    def warning_acknowledge_matching(self,
+                                     region: Optional[str] = None,
+                                     event: Optional[str] = None,
+                                     level: Optional[int] = None,
+                                     begin: Optional[datetime] = None,
+                                     end: Optional[datetime] = None) -> int:
+        """Mark all warnings as acknowledged that match the given criteria,
+        using a single UPDATE. Criteria that are None are ignored.
+        If <begin> and/or <end> are given, warnings are matched if they
+        overlap with that period.
+        Returns the number of warnings acknowledged."""
+        t1: Final[Optional[int]] = None if begin is None else floor(begin.timestamp())
+        t2: Final[Optional[int]] = None if end is None else ceil(end.timestamp())
+        cur: Final[sqlite3.Cursor] = self.db.cursor()
+        cur.execute(db_queries[Query.WarningAcknowledgeMatching],
+                    (int(time.time()),
+                     region, region,
+                     event, event,
+                     level, level,
+                     t2, t2,
+                     t1, t1))
+        return cur.rowcount
+
+    @instrument(Query.ForecastAdd)
     def forecast_add(self, fc: Forecast) -> None:
         """Add a Forecast to the database."""
         self.log.debug(
@@ -516,7 +2144,10 @@ class Database:
         cur.execute(db_queries[Query.ForecastAdd],
                     (
                         int(fc.timestamp.timestamp()),
-                        f"{fc.location[0]}/{fc.location[1]}",
+                        fc.location[0],
+                        fc.location[1],
+                        fc.location[0],
+                        fc.location[1],
                         fc.summary,
                         fc.icon,
                         fc.probability_rain,
@@ -529,10 +2160,70 @@ class Database:
         row = cur.fetchone()
         fc.fid = row[0]
 
-    def forecast_get_current(self) -> Optional[Forecast]:
-        """Return the most recent Forecast from the database."""
+    @instrument(Query.ForecastUpsert)
+    def forecast_upsert(self, fc: Forecast) -> bool:
+        """Add a Forecast and its hourly data to the database in a single
+        transaction. If a Forecast for the same location and time exists
+        already, it is updated, and its hourly data is replaced.
+        If neither the Forecast nor its hourly data differ from what is
+        stored, nothing is written at all.
+        Returns True if anything was changed."""
+        stamp: Final[int] = int(fc.timestamp.timestamp())
+        cur: Final[sqlite3.Cursor] = self.db.cursor()
+        own_tx: Final[bool] = not self.db.in_transaction
+        if own_tx:
+            cur.execute("BEGIN IMMEDIATE")
+        try:
+            cur.execute(db_queries[Query.ForecastUpsert],
+                        (
+                            stamp,
+                            fc.location[0],
+                            fc.location[1],
+                            fc.location[0],
+                            fc.location[1],
+                            fc.summary,
+                            fc.icon,
+                            fc.probability_rain,
+                            fc.temperature,
+                            fc.temperature_apparent,
+                            fc.humidity,
+                            fc.wind_speed,
+                            fc.visibility,
+                        ))
+            row = cur.fetchone()
+            changed: bool = row is not None
+            if row is None:
+                # The Forecast is stored already and unchanged.
+                cur.execute(db_queries[Query.ForecastGetID],
+                            (fc.location[0], fc.location[1], stamp))
+                row = cur.fetchone()
+            fc.fid = row[0]
+            hourly: Final[list[tuple]] = fc.hourly_db()
+            if not changed:
+                cur.execute(db_queries[Query.HourlyGetByForecast], (fc.fid, ))
+                changed = [r[1:] for r in cur] != [h[1:] for h in hourly]
+            if changed:
+                cur.execute(db_queries[Query.HourlyDeleteByForecast], (fc.fid, ))
+                cur.executemany(db_queries[Query.HourlyAdd], hourly)
+        except sqlite3.Error:
+            if own_tx:
+                cur.execute("ROLLBACK")
+            raise
+        if own_tx:
+            cur.execute("COMMIT")
+        return changed
+
+    @instrument(Query.ForecastGetCurrent, lambda fc: 0 if fc is None else 1)
+    def forecast_get_current(self, location: Optional[tuple[float, float]] = None) -> Optional[Forecast]:  # noqa: E501 pylint: disable-msg=C0301
+        """Return the most recent Forecast from the database.
+        If <location> is given, return the most recent Forecast for those
+        coordinates."""
         cur: Final[sqlite3.Cursor] = self.db.cursor()
-        cur.execute(db_queries[Query.ForecastGetCurrent])
+        if location is None:
+            cur.execute(db_queries[Query.ForecastGetCurrent])
+        else:
+            cur.execute(db_queries[Query.ForecastGetCurrentByLocation],
+                        location)
         row = cur.fetchone()
         if row is None:
             return None
@@ -540,22 +2231,145 @@ class Database:
         fc.hourly = self.hourly_get_by_forecast(fc.fid)
         return fc
 
-    def forecast_get_recent(self, n: int = 5) -> list[Forecast]:
-        """Get the <n> most recent Forecast items."""
+    @instrument(Query.ForecastGetRecent)
+    def forecast_get_recent(self, n: int = 5, load_hourly: bool = True) -> list[Forecast]:
+        """Get the <n> most recent Forecast items.
+        If <load_hourly> is True, their hourly data is loaded as well, using
+        one additional query in total."""
         cur: Final[sqlite3.Cursor] = self.db.cursor()
         cur.execute(db_queries[Query.ForecastGetRecent], (n, ))
         records: list[Forecast] = []
+        oldest: tuple[int, int] = PAGE_LAST
         for row in cur:
             fc = Forecast.from_db(row)
             records.append(fc)
+            oldest = (row[1], row[0])
+        if load_hourly and len(records) > 0:
+            # The hourly data is selected by the key of the oldest Forecast
+            # returned, so it belongs to the same Forecasts even if several
+            # share a timestamp. Rows of Forecasts added in the meantime are
+            # ignored.
+            cur.execute(db_queries[Query.HourlyGetRecent], oldest)
+            self.__attach_hourly(records, cur)
+        return records
+
+    @instrument(Query.ForecastGetByPeriod)
+    def forecast_get_by_period(self, t1: datetime, t2: datetime) -> list[Forecast]:
+        """Get all Forecasts issued in the given period, including their
+        hourly data, and including those that have been moved to archive
+        files."""
+        p1: Final[int] = floor(t1.timestamp())
+        p2: Final[int] = ceil(t2.timestamp())
+        archives: Final[list[str]] = \
+            self.__archives(Query.ArchiveGetByForecastPeriod, (p2, p1))
+        records: Final[list[Forecast]] = [
+            Forecast.from_db(row) for row in
+            self.__period_rows(Query.ForecastGetByPeriod,
+                               (p1, p2),
+                               archives,
+                               lambda row: row[1])
+        ]
+        if len(records) > 0:
+            self.__attach_hourly(records,
+                                 self.__period_rows(Query.HourlyGetByPeriod,
+                                                    (p1, p2),
+                                                    archives,
+                                                    lambda row: (row[-1], row[1])))
         return records
 
+    @instrument(Query.ForecastGetByPeriodPage)
+    def forecast_iter_by_period(self,
+                                t1: datetime,
+                                t2: datetime,
+                                chunk: int = 64) -> Iterator[Forecast]:
+        """Iterate over all Forecasts issued in the given period, including
+        their hourly data, loading <chunk> Forecasts at a time.
+        Unlike forecast_get_by_period, this only looks at the hot database,
+        not at the archive files.
+        This costs two queries per chunk, no matter how many Forecasts
+        there are, and keeps memory usage bounded for long periods."""
+        last: tuple[int, int] = (floor(t1.timestamp()), 0)
+        p2: Final[int] = ceil(t2.timestamp())
+        cur: Final[sqlite3.Cursor] = self.db.cursor()
+        while True:
+            cur.execute(db_queries[Query.ForecastGetByPeriodPage],
+                        (last[0], last[1], p2, chunk))
+            records: list[Forecast] = [Forecast.from_db(row) for row in cur]
+            if len(records) == 0:
+                return
+            cur.execute(db_queries[Query.HourlyGetByPeriod],
+                        (int(records[0].timestamp.timestamp()),
+                         int(records[-1].timestamp.timestamp())))
+            self.__attach_hourly(records, cur)
+            yield from records
+            if len(records) < chunk:
+                return
+            last = (int(records[-1].timestamp.timestamp()), records[-1].fid)
+
+    @instrument(Query.ForecastGetPage)
+    def forecast_get_page(self,
+                          key: Optional[tuple[int, int]],
+                          n: int,
+                          forward: bool = True) -> list[Forecast]:
+        """Get up to <n> Forecasts, without their hourly data, ordered by
+        timestamp and ID, following the Forecast with the given (timestamp,
+        ID) <key>, or preceding it if <forward> is False. If <key> is None,
+        get the first (or last) <n> Forecasts.
+        Like forecast_get_by_period, this includes the Forecasts that have
+        been moved to archive files."""
+        return [Forecast.from_db(row) for row in
+                self.__page(Query.ForecastGetPage,
+                            key,
+                            n,
+                            forward,
+                            lambda row: (row[1], row[0]))]
+
+    @staticmethod
+    def __attach_hourly(records: list[Forecast], cur: Iterable[tuple]) -> None:
+        """Distribute the hourly data fetched by <cur> across the Forecasts
+        they belong to. The last column of each row must be the Forecast ID.
+        Rows belonging to other Forecasts are ignored."""
+        by_id: Final[dict[int, Forecast]] = {fc.fid: fc for fc in records}
+        for row in cur:
+            fc = by_id.get(row[-1])
+            if fc is not None:
+                fc.hourly.append(Datapoint.from_db(row))
+
+    @instrument(Query.LocationAdd)
+    def location_add(self, coords: tuple[float, float], name: str = "") -> int:
+        """Register a location, or rename it if it is already known. An
+        empty <name> leaves the name of a known location alone.
+        Forecasts for those coordinates that have not been assigned to a
+        location, yet, are assigned to it.
+        Returns the location's ID."""
+        cur: Final[sqlite3.Cursor] = self.db.cursor()
+        cur.execute(db_queries[Query.LocationAdd],
+                    (coords[0], coords[1], name))
+        row = cur.fetchone()
+        if row is None:
+            # The location is known already under that name.
+            cur.execute(db_queries[Query.LocationGetID], coords)
+            row = cur.fetchone()
+        lid: Final[int] = row[0]
+        cur.execute(db_queries[Query.LocationAssignForecasts],
+                    (lid, coords[0], coords[1]))
+        return lid
+
+    @instrument(Query.LocationGetAll)
+    def location_get_all(self) -> list[tuple[int, str, tuple[float, float]]]:
+        """Return the ID, name and coordinates of all known locations."""
+        cur: Final[sqlite3.Cursor] = self.db.cursor()
+        cur.execute(db_queries[Query.LocationGetAll])
+        return [(row[0], row[1], (row[2], row[3])) for row in cur]
+
+    @instrument(Query.HourlyAdd)
     def hourly_add(self, fc: Forecast) -> None:
         """Add the hourly forecast data to the database."""
         cur = self.db.cursor()
         cur.executemany(db_queries[Query.HourlyAdd],
                         fc.hourly_db())
 
+    @instrument(Query.HourlyGetByForecast)
     def hourly_get_by_forecast(self, fid: int) -> list[Datapoint]:
         """Get the hourly forecast data."""
         cur = self.db.cursor()
@@ -566,6 +2380,209 @@ class Database:
             hourly.append(d)
         return hourly
 
+    def __archives(self, q: Query, params: tuple[int, int]) -> list[str]:
+        """Return the paths of the archive files that might hold rows for
+        the period given by <params>, as determined by <q>."""
+        if self.db.in_transaction:
+            # ATTACH does not work inside a transaction.
+            self.log.warning("Cannot look at archive files inside a transaction")
+            return []
+        cur: Final[sqlite3.Cursor] = self.db.cursor()
+        cur.execute(db_queries[q], params)
+        folder: Final[str] = self.__archive_folder()
+        paths: list[str] = []
+        for row in cur:
+            path = os.path.join(folder, row[0])
+            if os.path.exists(path):
+                paths.append(path)
+            else:
+                self.log.warning("Archive file %s is missing", path)
+        return paths
+
+    def __archive_folder(self) -> str:
+        """Return the folder archive file names are relative to."""
+        if is_memory(self.path):
+            return common.path.base()
+        return os.path.dirname(self.path)
+
+    @contextmanager
+    def __attached(self, paths: list[str]) -> Iterator[list[str]]:
+        """Attach the archive files at <paths> read-only, and yield the
+        names of the schemas they are attached as."""
+        cur: Final[sqlite3.Cursor] = self.db.cursor()
+        names: Final[list[str]] = []
+        try:
+            for idx, path in enumerate(paths):
+                # Archives never change, so SQLite can skip locking them.
+                cur.execute(f"ATTACH DATABASE ? AS arch{idx}",
+                            (file_uri(path, "mode=ro&immutable=1"), ))
+                names.append(f"arch{idx}")
+            yield names
+        finally:
+            for name in names:
+                cur.execute(f"DETACH DATABASE {name}")
+
+    def __period_rows(self,
+                      q: Query,
+                      params: tuple[int, int],
+                      archives: list[str],
+                      key: Callable[[tuple], Any]) -> list[tuple]:
+        """Run the period query <q> against the hot database and the given
+        archive files, and return the combined rows, ordered the same way
+        the query orders them. <key> is used to sort the rows if the
+        archives have to be attached in several rounds."""
+        cur: Final[sqlite3.Cursor] = self.db.cursor()
+        if len(archives) == 0:
+            cur.execute(db_queries[q], params)
+            return cur.fetchall()
+        rows: Final[list[tuple]] = []
+        for idx in range(0, len(archives), ATTACH_LIMIT):
+            with self.__attached(archives[idx:idx+ATTACH_LIMIT]) as names:
+                schemas: list[str] = ["main", *names] if idx == 0 else names
+                query: str = " UNION ALL ".join(archive_queries[q].format(schema=s)
+                                                for s in schemas)
+                cur.execute(f"{query} {archive_order[q]}", params * len(schemas))
+                rows.extend(cur.fetchall())
+        if len(archives) > ATTACH_LIMIT:
+            rows.sort(key=key)
+        return rows
+
+    @instrument(Query.ArchiveGetAll)
+    def archive_get_all(self) -> list[tuple[str, str, datetime, datetime]]:
+        """Return the name, path and period of all archive files. The path
+        is relative to the folder the database lives in."""
+        cur: Final[sqlite3.Cursor] = self.db.cursor()
+        cur.execute(db_queries[Query.ArchiveGetAll])
+        return [(row[0],
+                 row[1],
+                 datetime.fromtimestamp(row[2]),
+                 datetime.fromtimestamp(row[3])) for row in cur]
+
+    @instrument(Query.ArchiveGetOldest)
+    def archive_oldest(self) -> Optional[datetime]:
+        """Return the point in time the oldest row in the hot database
+        belongs to, i.e. the end of the oldest warning or the timestamp of
+        the oldest Forecast, whichever is older."""
+        cur: Final[sqlite3.Cursor] = self.db.cursor()
+        cur.execute(db_queries[Query.ArchiveGetOldest])
+        stamps: Final[list[int]] = [s for s in cur.fetchone() if s is not None]
+        if len(stamps) == 0:
+            return None
+        return datetime.fromtimestamp(min(stamps))
+
+    def archive_period(self,
+                       filename: str,
+                       name: str,
+                       t1: datetime,
+                       t2: datetime) -> dict[str, int]:
+        """Move the warnings that ended and the Forecasts that were issued
+        in the period from <t1> (inclusive) to <t2> (exclusive) to a new
+        archive file. <filename> is relative to the folder the database
+        lives in, or to the base folder if the database is kept in memory.
+        Copying the rows, removing them from the hot database and
+        registering the archive all happen in one write transaction, so
+        either all of it takes effect or none of it.
+        An archive file that is not registered is the leftover of an
+        interrupted run and is overwritten.
+        Once the rows are moved, the archive file is made read-only.
+        Returns the number of rows moved per table. If there was nothing to
+        move, no archive is created."""
+        if any(a[0] == name for a in self.archive_get_all()):
+            raise ValueError(f"Archive {name} exists already")
+        path: Final[str] = os.path.join(self.__archive_folder(), filename)
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                self.log.info("Remove leftover archive file %s", path + suffix)
+                os.remove(path + suffix)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        Database(path).close()
+
+        p: Final[tuple[int, int]] = (floor(t1.timestamp()), floor(t2.timestamp()))
+        cur: Final[sqlite3.Cursor] = self.db.cursor()
+        cur.execute("ATTACH DATABASE ? AS arch", (file_uri(path), ))
+        try:
+            # Copying and deleting the rows happens in one write transaction,
+            # so rows added to the period in the meantime are neither lost
+            # nor archived twice.
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                cur.execute(db_queries[Query.ArchiveCopyLocations])
+                cur.execute(db_queries[Query.ArchiveCopyWarnings], p)
+                cur.execute(db_queries[Query.ArchiveCopyForecasts], p)
+                cur.execute(db_queries[Query.ArchiveCopyHourly])
+                cur.execute(db_queries[Query.ArchiveGetBounds])
+                bounds: Final[tuple] = cur.fetchone()
+                if bounds[4] + bounds[5] > 0:
+                    cur.execute(db_queries[Query.ArchiveDeleteWarnings])
+                    cur.execute(db_queries[Query.ArchiveDeleteForecasts])
+                    cur.execute(db_queries[Query.ArchiveAdd],
+                                (name,
+                                 filename,
+                                 p[0],
+                                 p[1],
+                                 *bounds[:4],
+                                 int(time.time())))
+            except sqlite3.Error:
+                cur.execute("ROLLBACK")
+                raise
+            cur.execute("COMMIT")
+            counts: Final[dict[str, int]] = {
+                "warning": bounds[4],
+                "forecast": bounds[5],
+                "hourly": bounds[6],
+            }
+        finally:
+            cur.execute("DETACH DATABASE arch")
+
+        if counts["warning"] + counts["forecast"] == 0:
+            os.remove(path)
+            return counts
+
+        # Get rid of the WAL, so the archive is one self-contained file.
+        arch: Final[sqlite3.Connection] = sqlite3.connect(path)
+        arch.execute("PRAGMA journal_mode = DELETE").close()
+        arch.close()
+        os.chmod(path, 0o444)
+        self.log.info("Moved %d warnings, %d forecasts and %d hourly data points to %s",
+                      counts["warning"],
+                      counts["forecast"],
+                      counts["hourly"],
+                      path)
+        return counts
+
+    # pylint: disable-msg=R0913
+    def export_rows(self,
+                    table: str,
+                    after: int = 0,
+                    begin: Optional[datetime] = None,
+                    end: Optional[datetime] = None,
+                    chunk: int = EXPORT_CHUNK) -> Iterator[list[sqlite3.Row]]:
+        """Stream the rows of <table> whose ID is greater than <after> in
+        chunks of up to <chunk> rows, ordered by ID.
+        If <begin> and/or <end> are given, only rows whose timestamp lies
+        within that period are returned.
+        Each chunk is fetched by a separate query, so we never hold a read
+        transaction open for longer than it takes to fetch one chunk."""
+        if table not in export_queries:
+            raise ValueError(f"Cannot export unknown table {table}")
+        q: Final[Query] = export_queries[table]
+        t1: Final[int] = 0 if begin is None else floor(begin.timestamp())
+        t2: Final[int] = MAX_STAMP if end is None else ceil(end.timestamp())
+        last: int = after
+        while True:
+            started: float = time.perf_counter()
+            cur: sqlite3.Cursor = self.db.cursor()
+            cur.row_factory = sqlite3.Row
+            cur.execute(db_queries[q], (last, t1, t2, chunk))
+            rows: list[sqlite3.Row] = cur.fetchall()
+            self._observe(q, time.perf_counter() - started, len(rows))
+            if len(rows) == 0:
+                return
+            last = rows[-1]["id"]
+            yield rows
+            if len(rows) < chunk:
+                return
+
 # Local Variables: #
 # python-indent: 4 #
 # End: #
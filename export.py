@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-19 10:12:31 krylon>
+#
+# /data/code/python/wetterfrosch/export.py
+# created on 19. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+wetterfrosch.export
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import csv
+import json
+import logging
+import os
+import sqlite3
+import time
+from datetime import datetime
+from enum import Enum
+from typing import Final, Optional
+
+from wetterfrosch import common
+from wetterfrosch.database import EXPORT_CHUNK, Database, export_queries
+
+TABLES: Final[tuple[str, ...]] = tuple(export_queries.keys())
+WATERMARK_FILE: Final[str] = "watermark.json"
+
+
+class Format(Enum):
+    """The output formats we can export to."""
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class Exporter:
+    """Exporter streams the contents of the database to NDJSON or CSV files,
+    one file per table.
+    In incremental mode, it remembers the highest ID it has exported for each
+    table (the watermark) and only appends rows newer than that.
+    Rows are exported once, when they are added. Forecasts that are updated
+    later keep their ID and are not exported again, while their hourly data
+    is replaced by new rows, so the hourly export may contain several rows
+    for the same forecast_id and timestamp. The one with the highest ID is
+    the current one."""
+
+    __slots__ = [
+        "log",
+        "db",
+        "folder",
+        "fmt",
+        "chunk",
+    ]
+
+    log: logging.Logger
+    db: Database
+    folder: str
+    fmt: Format
+    chunk: int
+
+    def __init__(self,
+                 db: Optional[Database] = None,
+                 folder: str = "",
+                 fmt: Format = Format.NDJSON,
+                 chunk: int = EXPORT_CHUNK) -> None:
+        self.log = common.get_logger("export")
+        self.db = db if db is not None else Database()
+        self.folder = folder if folder != "" else common.path.export()
+        self.fmt = fmt
+        self.chunk = chunk
+
+    def _path(self, table: str) -> str:
+        return os.path.join(self.folder, f"{table}.{self.fmt.value}")
+
+    def _watermark_path(self) -> str:
+        return os.path.join(self.folder, WATERMARK_FILE)
+
+    def watermarks(self) -> dict[str, int]:
+        """Return the watermarks for the Exporter's format."""
+        try:
+            with open(self._watermark_path(), "r", encoding="utf-8") as fh:
+                marks: dict[str, dict[str, int]] = json.load(fh)
+                return marks.get(self.fmt.value, {})
+        except FileNotFoundError:
+            return {}
+
+    def _save_watermark(self, table: str, wid: int) -> None:
+        """Atomically update the watermark for <table>."""
+        path: Final[str] = self._watermark_path()
+        marks: dict[str, dict[str, int]] = {}
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                marks = json.load(fh)
+        except FileNotFoundError:
+            pass
+        marks.setdefault(self.fmt.value, {})[table] = wid
+        tmp: Final[str] = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(marks, fh)
+        os.replace(tmp, path)
+
+    def export(self,
+               tables: tuple[str, ...] = TABLES,
+               begin: Optional[datetime] = None,
+               end: Optional[datetime] = None,
+               incremental: bool = True) -> dict[str, int]:
+        """Export the given tables, optionally limited to the period between
+        <begin> and <end>.
+        If <incremental> is True, only rows above the watermark are exported
+        and appended to the existing files, otherwise the files are
+        overwritten and the watermarks are reset to the last row written,
+        so a later incremental export continues from there.
+        An export limited to a period skips rows outside of it, so it does
+        not advance the watermarks. A full export limited to a period
+        resets them to zero instead.
+        Returns the number of rows exported per table."""
+        if not os.path.isdir(self.folder):
+            os.makedirs(self.folder)
+        marks: Final[dict[str, int]] = self.watermarks() if incremental else {}
+        counts: dict[str, int] = {}
+        for table in tables:
+            t1: float = time.time()
+            counts[table] = self._export_table(table,
+                                               marks.get(table, 0),
+                                               begin,
+                                               end,
+                                               incremental)
+            t2: float = time.time()
+            self.log.info("Exported %d rows from %s to %s in %.2f seconds",
+                          counts[table],
+                          table,
+                          self._path(table),
+                          t2 - t1)
+        return counts
+
+    # pylint: disable-msg=R0913
+    def _export_table(self,
+                      table: str,
+                      after: int,
+                      begin: Optional[datetime],
+                      end: Optional[datetime],
+                      incremental: bool) -> int:
+        cnt: int = 0
+        mode: Final[str] = "a" if incremental else "w"
+        # Rows below the last one exported might lie outside the period,
+        # so only an unlimited export may move the watermark.
+        track: Final[bool] = begin is None and end is None
+        with open(self._path(table), mode, encoding="utf-8", newline="") as fh:
+            writer = csv.writer(fh) if self.fmt == Format.CSV else None
+            for rows in self.db.export_rows(table, after, begin, end, self.chunk):
+                if writer is not None:
+                    if fh.tell() == 0:
+                        writer.writerow(rows[0].keys())
+                    writer.writerows(rows)
+                else:
+                    fh.writelines(self._ndjson(r) for r in rows)
+                fh.flush()
+                cnt += len(rows)
+                if track:
+                    self._save_watermark(table, rows[-1]["id"])
+        if not incremental and (cnt == 0 or not track):
+            self._save_watermark(table, 0)
+        return cnt
+
+    @staticmethod
+    def _ndjson(row: sqlite3.Row) -> str:
+        return json.dumps(dict(row), ensure_ascii=False) + "\n"
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
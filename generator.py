@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-19 14:22:09 krylon>
+#
+# /data/code/python/wetterfrosch/generator.py
+# created on 19. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+wetterfrosch.generator
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import math
+import random
+from datetime import datetime
+from typing import Any, Final, Iterator, Optional
+
+from wetterfrosch.data import Forecast, WeatherWarning
+
+# A few real region names to mix in with the made-up ones.
+REGIONS: Final[list[tuple[str, str, str]]] = [
+    ("Bielefeld", "Nordrhein-Westfalen", "NRW"),
+    ("Kreis Gütersloh", "Nordrhein-Westfalen", "NRW"),
+    ("Kreis Lippe", "Nordrhein-Westfalen", "NRW"),
+    ("Stadt Hamburg", "Hamburg", "HH"),
+    ("Berlin", "Berlin", "BL"),
+    ("Vogelsbergkreis", "Hessen", "HE"),
+    ("Kreis und Stadt Kassel", "Hessen", "HE"),
+    ("Landkreis Harz", "Sachsen-Anhalt", "ST"),
+    ("Kreis Nordfriesland", "Schleswig-Holstein", "SH"),
+    ("Landkreis Garmisch-Partenkirchen", "Bayern", "BY"),
+]
+
+# Event, type and level range as used by the DWD.
+EVENTS: Final[list[tuple[str, int, int, int]]] = [
+    ("WINDBÖEN", 1, 1, 2),
+    ("STURMBÖEN", 1, 2, 3),
+    ("ORKANBÖEN", 1, 3, 4),
+    ("GLÄTTE", 3, 1, 2),
+    ("FROST", 5, 1, 2),
+    ("NEBEL", 4, 1, 1),
+    ("STARKREGEN", 2, 2, 3),
+    ("DAUERREGEN", 2, 2, 3),
+    ("GEWITTER", 8, 1, 3),
+    ("LEICHTER SCHNEEFALL", 6, 1, 1),
+    ("HITZE", 10, 2, 3),
+]
+
+ICONS: Final[list[str]] = [
+    "clear-day",
+    "clear-night",
+    "partly-cloudy-day",
+    "partly-cloudy-night",
+    "cloudy",
+    "rain",
+    "fog",
+    "wind",
+]
+
+
+class Generator:
+    """Generator produces synthetic, but plausible, warnings and forecasts
+    for testing and benchmarking the storage layer.
+    The output is deterministic for a given seed."""
+
+    __slots__ = [
+        "rnd",
+        "regions",
+        "start",
+        "location",
+    ]
+
+    rnd: random.Random
+    regions: list[tuple[str, str, str]]
+    start: datetime
+    location: tuple[float, float]
+
+    def __init__(self,
+                 seed: int = 42,
+                 regions: int = 400,
+                 start: Optional[datetime] = None,
+                 location: tuple[float, float] = (52.0213, 8.5349)) -> None:
+        self.rnd = random.Random(seed)
+        self.regions = REGIONS[:regions]
+        for i in range(len(self.regions), regions):
+            self.regions.append((f"Landkreis {i:03d}",
+                                 f"Bundesland {i % 16:02d}",
+                                 f"B{i % 16:02d}"))
+        self.start = start if start is not None else datetime(2020, 1, 1)
+        self.location = location
+
+    def warning_records(self, n: int) -> Iterator[dict[str, Any]]:
+        """Generate <n> warnings in the format the DWD uses.
+        The DWD typically issues a few warnings at a time, so on average,
+        a new warning starts every 5 minutes, and they last between one
+        and 48 hours."""
+        stamp: int = int(self.start.timestamp()) * 1000
+        for i in range(n):
+            stamp += self.rnd.randint(1, 600) * 1000
+            region, state, state_short = self.rnd.choice(self.regions)
+            event, wtype, lvl_min, lvl_max = self.rnd.choice(EVENTS)
+            altitude: Optional[int] = None
+            if self.rnd.random() < 0.2:
+                altitude = self.rnd.choice((200, 400, 600, 800))
+            yield {
+                "state": state,
+                "type": wtype,
+                "level": self.rnd.randint(lvl_min, lvl_max),
+                "start": stamp,
+                "end": stamp + self.rnd.randint(1, 48) * 3_600_000,
+                "regionName": region,
+                "description": f"Es tritt {event.lower()} auf. (#{i})",
+                "event": event,
+                "headline": f"Amtliche WARNUNG vor {event}",
+                "instruction": "",
+                "stateShort": state_short,
+                "altitudeStart": altitude,
+                "altitudeEnd": None if altitude is None else 3000,
+            }
+
+    def warnings(self, n: int) -> Iterator[WeatherWarning]:
+        """Generate <n> WeatherWarnings."""
+        for rec in self.warning_records(n):
+            yield WeatherWarning(rec)
+
+    def _datapoint(self, stamp: int) -> dict[str, Any]:
+        # A crude daily temperature cycle, plus some noise.
+        hour: Final[float] = (stamp % 86400) / 3600
+        temp: Final[float] = \
+            10 + 8 * math.sin((hour - 9) / 24 * 2 * math.pi) + \
+            self.rnd.gauss(0, 2)
+        rain: Final[float] = self.rnd.random()
+        return {
+            "time": stamp,
+            "summary": "Synthetic",
+            "icon": self.rnd.choice(ICONS),
+            "precipProbability": rain,
+            "precipIntensity": round(rain * self.rnd.random() * 4, 2),
+            "temperature": temp,
+            "apparentTemperature": temp - self.rnd.random() * 3,
+            "humidity": self.rnd.random(),
+            "pressure": round(self.rnd.gauss(1013, 8), 1),
+            "windSpeed": self.rnd.random() * 15,
+            "cloudCover": self.rnd.random(),
+            "visibility": round(self.rnd.uniform(1, 16), 1),
+        }
+
+    def forecast_records(self, n: int, hours: int = 48) -> Iterator[dict[str, Any]]:
+        """Generate <n> forecasts in the format Pirate Weather uses, ten
+        minutes apart, with <hours> hourly data points each."""
+        stamp: int = int(self.start.timestamp())
+        for _ in range(n):
+            stamp += 600
+            base: int = stamp - stamp % 3600
+            yield {
+                "latitude": self.location[0],
+                "longitude": self.location[1],
+                "currently": self._datapoint(stamp),
+                "hourly": {
+                    "data": [self._datapoint(base + h * 3600)
+                             for h in range(hours)],
+                },
+            }
+
+    def forecasts(self, n: int, hours: int = 48) -> Iterator[Forecast]:
+        """Generate <n> Forecasts, including their hourly Datapoints."""
+        for rec in self.forecast_records(n, hours):
+            yield Forecast(rec)
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
@@ -20,17 +20,25 @@ wetterfrosch.gui
 import json
 import re
 import sys
+import time
 import traceback
 from datetime import datetime, timedelta
+from queue import Queue
 from threading import Lock, local
-from typing import Any, Final, Optional
+from typing import Any, Callable, Final, Optional
 
+import cairo  # type: ignore
 import gi  # type: ignore
 import notify2  # type: ignore
 import requests  # type: ignore
 
 from wetterfrosch import client, common, database
-from wetterfrosch.data import WeatherWarning
+from wetterfrosch.alert import Alerter
+from wetterfrosch.chart import Plot, thin
+from wetterfrosch.data import Forecast, WeatherWarning
+from wetterfrosch.history import Key, Pager, forecast_key, warning_key
+from wetterfrosch.loader import Loader
+from wetterfrosch.treemodel import ListSync, WarningFilter, When, rebuild
 
 gi.require_version("Gtk", "3.0")
 gi.require_version("Gdk", "3.0")
@@ -51,10 +59,22 @@ APP_ID: Final[str] = f"{common.APP_NAME}/{common.APP_VERSION}"
 ICON_NAME_DEFAULT: Final[str] = "weather-storm-symbolic"
 ICON_NAME_WARN: Final[str] = "weather-severe-alert-symbolic"
 FETCH_INTERVAL: Final[int] = 300
+# The interval (in milliseconds) at which to check if another process has
+# changed the database.
+POLL_INTERVAL: Final[int] = 5_000
 NEWLINE: Final[str] = "\n"
 
 IPINFO_URL: Final[str] = "https://ipinfo.io/json"
 
+# The time (in seconds) drawing a chart may take without being reported.
+FRAME_BUDGET: Final[float] = 1 / 60
+
+# The number of days of earlier Forecasts overlaid on the charts.
+OVERLAY_DAYS: Final[int] = 3
+
+# The time (in seconds) the Alerter waits for a notification to be shown.
+NOTIFY_TIMEOUT: Final[float] = 10.0
+
 ICON_NAMES: Final[dict[str, str]] = {
     "cloudy": "clouds",
     "clear-night": "clear-night",
@@ -64,6 +84,137 @@ ICON_NAMES: Final[dict[str, str]] = {
 }
 
 
+# pylint: disable-msg=R0902
+class HistoryView:
+    """HistoryView displays one kind of record, e.g. warnings, in the
+    history tab. Only a window of records is kept in memory. More pages are
+    loaded in the background as the user scrolls towards either end of the
+    window, and records at the other end are dropped."""
+
+    # pylint: disable-msg=R0913,R0917
+    def __init__(self,
+                 name: str,
+                 loader: Loader,
+                 fetch: Callable[[Optional[Key], int, bool], list[Any]],
+                 key: Callable[[Any], Key],
+                 columns: list[tuple[str, type]],
+                 fmt: Callable[[Any], tuple]) -> None:
+        self.name: Final[str] = name
+        self.loader: Final[Loader] = loader
+        self.fetch = fetch
+        self.fmt = fmt
+        self.pager: Final[Pager] = Pager(key)
+        self.store = gtk.ListStore(*[c[1] for c in columns])
+        self.view = gtk.TreeView(model=self.store)
+        for idx, c in enumerate(columns):
+            col = gtk.TreeViewColumn(
+                c[0],
+                gtk.CellRendererText(),
+                text=idx,
+                size=12,
+            )
+            self.view.append_column(col)
+        self.sw: gtk.ScrolledWindow = gtk.ScrolledWindow()
+        self.sw.set_vexpand(True)
+        self.sw.set_hexpand(True)
+        self.sw.add(self.view)  # pylint: disable-msg=E1101
+        self.sw.get_vadjustment().connect("value-changed", self.__scrolled)
+
+    def start(self) -> None:
+        """Load the most recent records."""
+        self.load(False)
+
+    def reopen(self) -> None:
+        """Look for more records the next time the user scrolls to an end,
+        e.g. because new records have been added."""
+        self.pager.reopen()
+
+    def load(self, forward: bool) -> None:
+        """Load the next page after (or before) the window."""
+        if not self.pager.wants(forward):
+            return
+        edge: Final[Optional[Key]] = self.pager.edge(forward)
+        page: Final[int] = self.pager.page
+        self.loader.submit(f"history-{self.name}-{forward}",
+                           lambda: (edge, self.fetch(edge, page, forward)),
+                           lambda res: self.__add(forward, *res))
+
+    def __add(self, forward: bool, edge: Optional[Key], records: list[Any]) -> None:
+        cnt: Final[int] = len(self.store)
+        dropped: Final[Optional[int]] = self.pager.add(forward, edge, records)
+        if dropped is None or len(records) == 0:
+            return
+        visible = self.view.get_visible_range()
+        first: int = visible[0].get_indices()[0] if visible is not None else 0
+        if forward:
+            for r in records:
+                self.store.append(list(self.fmt(r)))
+            for _ in range(dropped):
+                self.store.remove(self.store.get_iter_first())
+            first -= dropped
+        else:
+            for r in reversed(records):
+                self.store.prepend(list(self.fmt(r)))
+            for _ in range(dropped):
+                self.store.remove(self.store.iter_nth_child(None, len(self.store) - 1))
+            first += len(records)
+        if cnt == 0:
+            # Start at the most recent record.
+            first = len(self.store) - 1
+        # Keep the rows the user is looking at in place.
+        self.view.scroll_to_cell(gtk.TreePath(max(first, 0)), None, True, 0.0, 0.0)
+
+    def __scrolled(self, adj: gtk.Adjustment) -> None:
+        if len(self.pager) == 0:
+            return
+        margin: Final[float] = adj.get_page_size() / 2
+        if adj.get_value() <= margin:
+            self.load(False)
+        elif adj.get_value() + adj.get_page_size() >= adj.get_upper() - margin:
+            self.load(True)
+
+
+# pylint: disable-msg=R0903
+class ForecastChart:
+    """ForecastChart displays a Plot in a DrawingArea. The Plot is painted
+    into an off-screen surface, which is reused until the Forecasts or the
+    size of the widget change, so exposing the widget merely copies it."""
+
+    def __init__(self) -> None:
+        self.log = common.get_logger("chart")
+        self.plot: Final[Plot] = Plot()
+        self.surface: Optional[cairo.Surface] = None
+        self.surface_key: Optional[tuple[int, int, int]] = None
+        self.area: gtk.DrawingArea = gtk.DrawingArea()
+        self.area.set_size_request(400, 300)
+        self.area.set_hexpand(True)
+        self.area.connect("draw", self.__draw)
+
+    def display(self, forecasts: list[Forecast]) -> None:
+        """Display <forecasts>, the last one being the current Forecast."""
+        if self.plot.set_forecasts(forecasts):
+            self.area.queue_draw()
+
+    def __draw(self, area: gtk.DrawingArea, cr: cairo.Context) -> bool:
+        width: Final[int] = area.get_allocated_width()
+        height: Final[int] = area.get_allocated_height()
+        key: Final[tuple[int, int, int]] = (width, height, self.plot.version)
+        if key != self.surface_key or self.surface is None:
+            t1: Final[float] = time.perf_counter()
+            self.surface = area.get_window().create_similar_surface(
+                cairo.CONTENT_COLOR_ALPHA,
+                width,
+                height)
+            self.plot.paint(cairo.Context(self.surface), width, height)
+            self.surface_key = key
+            elapsed: Final[float] = time.perf_counter() - t1
+            if elapsed > FRAME_BUDGET:
+                self.log.debug("Painting the chart took %.1f ms", elapsed * 1000)
+        cr.set_source_surface(self.surface, 0, 0)
+        cr.paint()
+        return False
+
+
 # pylint: disable-msg=R0902,R0903
 class WetterGUI:
     """Graphical frontend to the wetterfrosch app"""
@@ -80,6 +231,7 @@ class WetterGUI:
         self.here: str = ""
         self.here_stamp: datetime = datetime.fromtimestamp(0)
         self.fc_stamp: datetime = datetime.fromtimestamp(0)
+        self.db_version: int = -1
         self.location: list[str] = []
 
         # loc: str = self.get_location()
@@ -106,6 +258,13 @@ class WetterGUI:
 
         db = self.get_database()
         self.alert_cache = db.warning_get_keys()
+        self.db_version = db.data_version()
+
+        # Database queries run in the background, so they do not block
+        # the UI.
+        self.loader: Final[Loader] = Loader(glib.idle_add)
+        self.loader.start()
+        self.client.subscribe(self.__client_changed)
 
         ################################################################
         # Create window and widgets ####################################
@@ -133,7 +292,13 @@ class WetterGUI:
             str,  # 6, Headline
             str,  # 7, Description
             str,  # 8, Instructions
+            float,  # 9, Start (Unix timestamp)
+            float,  # 10, End (Unix timestamp)
         )
+        self.warning_sync = ListSync(self.warning_store,
+                                     lambda w: w.wid,
+                                     self.__warning_row,
+                                     lambda w: w.acknowledged)
 
         fc_columns: Final[list[tuple[int, str]]] = [
             (0, "ID"),
@@ -170,6 +335,10 @@ class WetterGUI:
         self.tray.set_tooltip_text(f"{common.APP_NAME} {common.APP_VERSION}")
 
         notify2.init(APP_ID, "glib")
+        # Notifications are displayed in the background, so a flood of
+        # warnings or a hanging notification daemon does not block the UI.
+        self.alerter: Final[Alerter] = Alerter(self.__notify)
+        self.alerter.start()
 
         self.mbox: gtk.Box = gtk.Box(orientation=gtk.Orientation.VERTICAL)
         self.menubar: gtk.MenuBar = gtk.MenuBar()
@@ -187,6 +356,8 @@ class WetterGUI:
         self.edit_menu: gtk.Menu = gtk.Menu()
         self.em_loc_item: gtk.MenuItem = \
             gtk.MenuItem.new_with_mnemonic("_Orte verwalten")
+        self.em_ack_item: gtk.MenuItem = \
+            gtk.MenuItem.new_with_mnemonic("Alle Warnungen _bestätigen")
 
         self.mb_debug_item: gtk.MenuItem = \
             gtk.MenuItem.new_with_mnemonic("Debu_g")
@@ -244,7 +415,15 @@ class WetterGUI:
 
         self.notebook = gtk.Notebook.new()
 
-        self.warn_view = gtk.TreeView(model=self.warning_store)
+        # The view displays the warning store through a filter and a sort
+        # model, so narrowing or reordering the list does not touch the
+        # store, let alone the database.
+        self.warn_criteria: WarningFilter = WarningFilter()
+        self.warn_events: list[str] = []
+        self.warn_filter = self.warning_store.filter_new()
+        self.warn_filter.set_visible_func(self.__warning_visible)
+        self.warn_sort = gtk.TreeModelSort(model=self.warn_filter)
+        self.warn_view = gtk.TreeView(model=self.warn_sort)
 
         for c in warn_columns:  # pylint: disable-msg=C0103
             col = gtk.TreeViewColumn(
@@ -253,8 +432,28 @@ class WetterGUI:
                 text=c[0],
                 size=12,
             )
+            col.set_sort_column_id(c[0])
             self.warn_view.append_column(col)
 
+        self.flt_box: gtk.Box = gtk.Box(orientation=gtk.Orientation.HORIZONTAL,
+                                        spacing=4)
+        self.flt_level: gtk.ComboBoxText = gtk.ComboBoxText()
+        self.flt_level.append("0", "Alle Stufen")
+        for lvl in range(1, 5):
+            self.flt_level.append(str(lvl), f"Ab Stufe {lvl}")
+        self.flt_level.set_active(0)
+        self.flt_event: gtk.ComboBoxText = gtk.ComboBoxText()
+        self.flt_event.append("", "Alle Ereignisse")
+        self.flt_event.set_active(0)
+        self.flt_region: gtk.SearchEntry = gtk.SearchEntry()
+        self.flt_region.set_placeholder_text("Region")
+        self.flt_when: gtk.ComboBoxText = gtk.ComboBoxText()
+        self.flt_when.append(When.ALL.value, "Alle")
+        self.flt_when.append(When.ACTIVE.value, "Aktiv")
+        self.flt_when.append(When.UPCOMING.value, "Bevorstehend")
+        self.flt_when.set_active(0)
+        self.warn_box: gtk.Box = gtk.Box(orientation=gtk.Orientation.VERTICAL)
+
         self.sw_warning: gtk.ScrolledWindow = gtk.ScrolledWindow()
 
         self.forecast_view = gtk.TreeView(model=self.fc_store)
@@ -269,6 +468,48 @@ class WetterGUI:
             self.forecast_view.append_column(col)
 
         self.sw_forecast: gtk.ScrolledWindow = gtk.ScrolledWindow()
+        self.fc_chart: Final[ForecastChart] = ForecastChart()
+        self.fc_box: gtk.Box = gtk.Box(orientation=gtk.Orientation.VERTICAL)
+
+        self.hist_warn = HistoryView(
+            "warnings",
+            self.loader,
+            lambda key, n, fwd: self.get_database().warning_get_page(key, n, fwd),
+            warning_key,
+            [("Start", str),
+             ("Ende", str),
+             ("Level", int),
+             ("Region", str),
+             ("Ereignis", str),
+             ("Überschrift", str),
+             ("Bestätigt", bool)],
+            lambda w: (w.start.strftime(common.TIME_FMT),
+                       w.end.strftime(common.TIME_FMT),
+                       w.level,
+                       w.region_name,
+                       w.event,
+                       w.headline,
+                       w.acknowledged))
+        self.hist_fc = HistoryView(
+            "forecasts",
+            self.loader,
+            lambda key, n, fwd: self.get_database().forecast_get_page(key, n, fwd),
+            forecast_key,
+            [("Zeitpunkt", str),
+             ("Ort", str),
+             ("Wetterlage", str),
+             ("Temperatur", int),
+             ("Luftfeuchtigkeit", int),
+             ("Wind", int),
+             ("% Regen", int)],
+            lambda fc: (fc.timestamp.strftime(common.TIME_FMT),
+                        f"{fc.location[0]:.02f}/{fc.location[1]:.02f}",
+                        fc.summary,
+                        fc.temperature,
+                        fc.humidity,
+                        fc.wind_speed,
+                        fc.probability_rain))
+        self.hist_nb = gtk.Notebook.new()
 
         ################################################################
         # Assemble window and widgets ##################################
@@ -297,15 +538,27 @@ class WetterGUI:
         self.sw_warning.set_hexpand(True)
         self.sw_warning.add(self.warn_view)  # pylint: disable-msg=E1101
 
+        self.flt_box.pack_start(self.flt_level, False, True, 0)
+        self.flt_box.pack_start(self.flt_event, False, True, 0)
+        self.flt_box.pack_start(self.flt_region, True, True, 0)
+        self.flt_box.pack_start(self.flt_when, False, True, 0)
+        self.warn_box.pack_start(self.flt_box, False, True, 0)
+        self.warn_box.pack_start(self.sw_warning, True, True, 0)
+
         self.sw_forecast.set_vexpand(True)
         self.sw_forecast.set_hexpand(True)
         self.sw_forecast.add(self.forecast_view)  # pylint: disable-msg=E1101
+        self.fc_box.pack_start(self.fc_chart.area, False, True, 0)
+        self.fc_box.pack_start(self.sw_forecast, True, True, 0)
 
         self.nb_lbl_warn = gtk.Label.new("Warnungen")
         self.nb_lbl_forecast = gtk.Label.new("Vorhersage")
 
-        self.notebook.append_page(self.sw_warning, self.nb_lbl_warn)
-        self.notebook.append_page(self.sw_forecast, self.nb_lbl_forecast)
+        self.notebook.append_page(self.warn_box, self.nb_lbl_warn)
+        self.notebook.append_page(self.fc_box, self.nb_lbl_forecast)
+        self.hist_nb.append_page(self.hist_warn.sw, gtk.Label.new("Warnungen"))
+        self.hist_nb.append_page(self.hist_fc.sw, gtk.Label.new("Vorhersagen"))
+        self.notebook.append_page(self.hist_nb, gtk.Label.new("Verlauf"))
 
         self.win.add(self.mbox)  # pylint: disable-msg=E1101
         self.mbox.pack_start(self.menubar,  # pylint: disable-msg=E1101
@@ -339,6 +592,7 @@ class WetterGUI:
 
         self.mb_edit_item.set_submenu(self.edit_menu)
         self.edit_menu.add(self.em_loc_item)
+        self.edit_menu.add(self.em_ack_item)
 
         self.mb_debug_item.set_submenu(self.debug_menu)
         self.debug_menu.add(self.db_load_item)
@@ -354,13 +608,22 @@ class WetterGUI:
         self.fm_quit_item.connect("activate", self.__quit)
         self.fm_refresh_item.connect("activate", self.load)
         self.em_loc_item.connect("activate", self.edit_locations)
+        self.em_ack_item.connect("activate", self.acknowledge_all)
+        self.warn_view.connect("button-press-event", self.warn_menu)
+        self.flt_level.connect("changed", self.__filter_changed)
+        self.flt_event.connect("changed", self.__filter_changed)
+        self.flt_region.connect("search-changed", self.__filter_changed)
+        self.flt_when.connect("changed", self.__filter_changed)
         self.db_load_item.connect("activate", self.load_from_file)
         self.db_msg_item.connect("activate", self.dbg_display_msg)
 
         self.win.show_all()  # pylint: disable-msg=E1101
         self.visible = True
-        glib.timeout_add(5_000, self.__get_warnings)
-        glib.timeout_add(5_000, self.update_forecast)
+        # Only re-query the database when the data has changed. Warnings
+        # expire and become due as time passes, though, so refresh
+        # everything once in a while anyway.
+        glib.timeout_add(POLL_INTERVAL, self.__poll)
+        glib.timeout_add_seconds(FETCH_INTERVAL, self.__refresh)
         glib.timeout_add(500, self._fetch_init_data)
 
     def run(self) -> None:
@@ -368,10 +631,38 @@ class WetterGUI:
         gtk.main()
 
     def _fetch_init_data(self) -> bool:
+        self.__refresh()
+        self.hist_warn.start()
+        self.hist_fc.start()
+        return False
+
+    def __refresh(self) -> bool:
         self.__get_warnings()
         self.update_forecast()
+        self.hist_warn.reopen()
+        self.hist_fc.reopen()
+        return True
+
+    def __client_changed(self, version: int) -> None:
+        # This runs on the thread of the Client that changed the data.
+        glib.idle_add(self.__data_changed, version)
+
+    def __data_changed(self, version: int) -> bool:
+        self.log.debug("Data changed, version is now %d", version)
+        # The Client's changes move our data_version, too. Catch up, so
+        # __poll does not refresh a second time.
+        self.db_version = self.get_database().data_version()
+        self.__refresh()
         return False
 
+    def __poll(self) -> bool:
+        """Check if another process has changed the database."""
+        version: Final[int] = self.get_database().data_version()
+        if version != self.db_version:
+            self.db_version = version
+            self.__refresh()
+        return True
+
     def get_database(self) -> database.Database:
         """Get the Database instance for the calling thread."""
         try:
@@ -408,9 +699,23 @@ class WetterGUI:
 
     def update_forecast(self) -> bool:
         """Refresh the weather forecast"""
+        self.loader.submit("forecast", self.__load_forecast, self.display_forecast)
+        return True
+
+    def __load_forecast(self) -> Optional[Forecast]:
+        # This runs on the Loader's thread.
+        return self.get_database().forecast_get_current()
+
+    def __load_chart(self) -> list[Forecast]:
+        # This runs on the Loader's thread.
+        now: Final[datetime] = datetime.now()
+        return thin(self.get_database().forecast_get_by_period(
+            now - timedelta(days=OVERLAY_DAYS),
+            now))
+
+    def display_forecast(self, fc: Optional[Forecast]) -> None:
+        """Display the current weather forecast."""
         try:
-            db = self.get_database()
-            fc = db.forecast_get_current()
             if fc is not None:
                 self.cur_forecast = fc  # pylint: disable-msg=W0201
                 try:
@@ -423,8 +728,9 @@ class WetterGUI:
                                    sys.exception())
                 if fc.timestamp == self.fc_stamp:
                     # self.log.debug("Weather forecast is already current.")
-                    return True
+                    return
                 self.fc_stamp = fc.timestamp
+                self.loader.submit("chart", self.__load_chart, self.fc_chart.display)
                 self.fc_view_time.get_buffer().set_text(
                     fc.timestamp.strftime(common.TIME_FMT))
                 self.fc_view_loc.get_buffer().set_text(
@@ -436,29 +742,23 @@ class WetterGUI:
                     f"{fc.wind_speed} km/h")
                 self.fc_view_prob_rain.get_buffer().set_text(
                     f"{fc.probability_rain} %")
-                self.fc_store.clear()
-                for p in fc.hourly:
-                    fiter = self.fc_store.append()
-                    self.fc_store.set(
-                        fiter,
-                        (0, 1, 2, 3, 4, 5, 6, 7, 8, 9),
-                        (
-                            p.pid,
-                            p.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
-                            p.probability_rain,
-                            p.rain_amt,
-                            p.temperature,
-                            p.humidity,
-                            p.pressure,
-                            p.wind_speed,
-                            p.cloud_cover,
-                            p.visibility,
-                        ))
+                self.fc_store = rebuild(
+                    self.forecast_view,
+                    self.fc_store,
+                    ((p.pid,
+                      p.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
+                      p.probability_rain,
+                      p.rain_amt,
+                      p.temperature,
+                      p.humidity,
+                      p.pressure,
+                      p.wind_speed,
+                      p.cloud_cover,
+                      p.visibility) for p in fc.hourly))
             else:
                 self.log.error("Client did not return forecast data")
         except Exception as e:  # pylint: disable-msg=W0718
             self.log.error("Error refreshing forecast: %s", e)
-        return True
 
     def __toggle_visible(self, *_ignore: Any) -> None:
         if self.visible:
@@ -470,6 +770,9 @@ class WetterGUI:
     def __quit(self, *_ignore: Any) -> None:
         with self.lock:
             self.active = False
+        self.client.unsubscribe(self.__client_changed)
+        self.loader.stop()
+        self.alerter.stop()
         self.tray.set_visible(False)
         self.win.destroy()
         gtk.main_quit()
@@ -496,6 +799,58 @@ class WetterGUI:
         menu.show_all()
         menu.popup_at_pointer(event)
 
+    def warn_menu(self, view: gtk.TreeView, event: gdk.EventButton) -> bool:
+        """Display the popup menu for the warning list, offering to
+        acknowledge all warnings for the same region or of the same kind."""
+        if event.button != 3:
+            return False
+
+        pos = view.get_path_at_pos(int(event.x), int(event.y))
+        if pos is None:
+            return False
+        row = view.get_model()[pos[0]]
+        region: Final[str] = row[2]
+        kind: Final[str] = row[5]
+
+        menu = gtk.Menu()
+        region_item = gtk.MenuItem.new_with_label(
+            f"Alle Warnungen für {region} bestätigen")
+        kind_item = gtk.MenuItem.new_with_label(
+            f"Alle Warnungen vor {kind} bestätigen")
+
+        region_item.connect("activate", self.__acknowledge_matching, {"region": region})
+        kind_item.connect("activate", self.__acknowledge_matching, {"event": kind})
+
+        menu.append(region_item)
+        menu.append(kind_item)
+        menu.show_all()
+        menu.popup_at_pointer(event)
+        return True
+
+    def acknowledge_all(self, *_ignore: Any) -> None:
+        """Acknowledge all warnings currently displayed.
+        The Client notifies us when it has acknowledged any warnings, which
+        refreshes the list of warnings, so we need not reload them here."""
+        ids: Final[list[int]] = [row[0] for row in self.warn_view.get_model()]
+        # Writing to the database might have to wait for the Client, so it
+        # happens on the Loader's thread. Identical requests submitted in
+        # quick succession share a key, so only the last one is carried out.
+        self.loader.submit(f"acknowledge-{hash(tuple(ids))}",
+                           lambda: self.client.acknowledge(ids),
+                           self.__acknowledged)
+
+    def __acknowledge_matching(self, _item: gtk.MenuItem, criteria: dict[str, Any]) -> None:
+        now: Final[datetime] = datetime.now()
+        self.loader.submit(f"acknowledge-{sorted(criteria.items())}",
+                           lambda: self.client.acknowledge_matching(
+                               begin=now - timedelta(hours=2),
+                               end=now + timedelta(hours=12),
+                               **criteria),
+                           self.__acknowledged)
+
+    def __acknowledged(self, cnt: int) -> None:
+        self.log.info("Acknowledged %d warnings", cnt)
+
     def display_msg(self, msg: str) -> None:
         """Display a message in a dialog."""
         self.log.info(msg)
@@ -524,85 +879,152 @@ class WetterGUI:
 
     def display_data(self, data: list[WeatherWarning]) -> None:
         """Display weather warnings."""
-        self.warning_store.clear()
         now: Final[datetime] = datetime.now()
         has_warnings: bool = False
         delta: Final[timedelta] = timedelta(hours=12)
         delta_d: Final[datetime] = now + delta
+        visible: list[WeatherWarning] = []
         for event in data:
             d1: datetime = event.start  # pylint: disable-msg=C0103
             d2: datetime = event.end  # pylint: disable-msg=C0103
 
             if d1 <= now <= d2 or now <= d1 <= delta_d:
                 if not self.__known_alert(event):
-                    try:
-                        n = notify2.Notification(  # pylint: disable-msg=C0103
-                            event.headline,
-                            event.description,
-                            ICON_NAME_WARN)
-                        n.show()
-                    except Exception as e:  # pylint: disable-msg=W0718
-                        self.log.error("Failed to display notification: %s - %s",  # noqa: E501
-                                       type(e),
-                                       e)
+                    self.alerter.alert(event)
                     has_warnings = True
                     with self.lock:
                         self.alert_cache.add(event.cksum())
 
-                liter = self.warning_store.append()
-                self.warning_store.set(
-                    liter,
-                    (0, 1, 2, 3, 4, 5, 6, 7, 8),
-                    (
-                        event.wid,
-                        event.level,
-                        event.region_name,
-                        d1.strftime(common.TIME_FMT),
-                        d2.strftime(common.TIME_FMT),
-                        event.event,
-                        event.headline,
-                        event.description,
-                        event.instruction,
-                    ),
-                )
+                visible.append(event)
+
+        added, updated, removed = self.warning_sync.sync(visible)
+        if added + updated + removed > 0:
+            self.log.debug("Warnings: %d added, %d updated, %d removed",
+                           added,
+                           updated,
+                           removed)
+        self.__update_events(sorted({w.event for w in visible}))
+        if self.warn_criteria.when != When.ALL:
+            # Warnings become active or expire as time passes.
+            self.warn_filter.refilter()
 
         if has_warnings:
             self.tray.set_from_icon_name(ICON_NAME_WARN)
 
-    def __get_warnings(self) -> bool:
+    def __update_events(self, events: list[str]) -> None:
+        """Offer the events currently in the list in the filter bar."""
+        if events == self.warn_events:
+            return
+        self.warn_events = events
+        current: Final[str] = self.flt_event.get_active_id() or ""
+        self.flt_event.handler_block_by_func(self.__filter_changed)
         try:
-            d1 = datetime.now() - timedelta(hours=2)
-            d2 = datetime.now() + timedelta(hours=12)
-            locations = client.LocationList.new()
-            db = self.get_database()
-            warnings = db.warning_get_by_period(d1, d2)
-            dwarnings: list[WeatherWarning] = []
-            for w in warnings:
-                if not locations.check(w.region_name):
-                    continue
-                dwarnings.append(w)
-            self.display_data(dwarnings)
+            self.flt_event.remove_all()
+            self.flt_event.append("", "Alle Ereignisse")
+            for e in events:
+                self.flt_event.append(e, e)
+            if not self.flt_event.set_active_id(current):
+                self.flt_event.set_active(0)
+        finally:
+            self.flt_event.handler_unblock_by_func(self.__filter_changed)
+        if self.warn_criteria.event != (self.flt_event.get_active_id() or ""):
+            self.__filter_changed()
+
+    def __filter_changed(self, *_ignore: Any) -> None:
+        self.warn_criteria = WarningFilter(
+            level=int(self.flt_level.get_active_id() or "0"),
+            event=self.flt_event.get_active_id() or "",
+            text=self.flt_region.get_text(),
+            when=When(self.flt_when.get_active_id() or When.ALL.value))
+        self.warn_filter.refilter()
+
+    def __warning_visible(self, model: gtk.TreeModel, liter: gtk.TreeIter, _data: Any) -> bool:
+        criteria: Final[WarningFilter] = self.warn_criteria
+        if criteria.is_empty():
+            return True
+        level, region, event, start, end = model.get(liter, 1, 2, 5, 9, 10)
+        return criteria.match(level, region, event, start, end, time.time())
+
+    @staticmethod
+    def __notify(summary: str, body: str) -> None:
+        # This runs on the Alerter's thread. notify2 was initialized with
+        # the GLib main loop, so the notification is shown on the UI thread.
+        # We wait for the outcome, so the Alerter can back off if showing
+        # notifications fails.
+        done: Final[Queue] = Queue(maxsize=1)
+        glib.idle_add(WetterGUI.__show_notification, summary, body, done)
+        error: Final[Optional[Exception]] = done.get(timeout=NOTIFY_TIMEOUT)
+        if error is not None:
+            raise error
+
+    @staticmethod
+    def __show_notification(summary: str, body: str, done: Queue) -> bool:
+        try:
+            n = notify2.Notification(  # pylint: disable-msg=C0103
+                summary,
+                body,
+                ICON_NAME_WARN)
+            n.show()
+            done.put(None)
         except Exception as e:  # pylint: disable-msg=W0718
-            self.log.error("Error processing warnings: %s", e)
+            done.put(e)
+        return False
+
+    @staticmethod
+    def __warning_row(event: WeatherWarning) -> tuple:
+        return (
+            event.wid,
+            event.level,
+            event.region_name,
+            event.start.strftime(common.TIME_FMT),
+            event.end.strftime(common.TIME_FMT),
+            event.event,
+            event.headline,
+            event.description,
+            event.instruction,
+            event.start.timestamp(),
+            event.end.timestamp(),
+        )
+
+    def __get_warnings(self) -> bool:
+        self.loader.submit("warnings", self.__load_warnings, self.display_data)
         return True
 
+    def __load_warnings(self) -> list[WeatherWarning]:
+        # This runs on the Loader's thread.
+        d1 = datetime.now() - timedelta(hours=2)
+        d2 = datetime.now() + timedelta(hours=12)
+        locations = client.LocationList.new()
+        db = self.get_database()
+        warnings = db.warning_get_by_period(d1, d2)
+        dwarnings: list[WeatherWarning] = []
+        for w in warnings:
+            if not locations.check(w.region_name):
+                continue
+            dwarnings.append(w)
+        return dwarnings
+
     def __known_alert(self, alert: WeatherWarning) -> bool:
         with self.lock:
             return alert.cksum() in self.alert_cache
 
     def load(self, *_ignore: Any) -> bool:
         """Fetch data, process, display"""
+        self.loader.submit("warnings", self.__load_all_warnings, self.display_data)
+        return True
+
+    def __load_all_warnings(self) -> list[WeatherWarning]:
+        # This runs on the Loader's thread.
         try:
             now: Final[datetime] = datetime.now()
             d1: Final[datetime] = now - timedelta(hours=2)
             d2: Final[datetime] = now + timedelta(hours=12)
             db = self.get_database()
-            warnings = db.warning_get_by_period(d1, d2)
-            self.display_data(warnings)
+            return db.warning_get_by_period(d1, d2)
         except Exception as e:  # pylint: disable-msg=W0718
             self.log.error("Something went wrong refreshing our data: %s", e)
             traceback.print_exception(e)
-        return True
+            raise
 
     def load_from_file(self, _ignore: Any) -> None:
         """Load warnings from a file, mainly for testing purposes."""
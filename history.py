@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-19 20:58:21 krylon>
+#
+# /data/code/python/wetterfrosch/history.py
+# created on 19. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+wetterfrosch.history
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+from collections import deque
+from typing import Any, Callable, Final, Optional
+
+from wetterfrosch.data import Forecast, WeatherWarning
+
+# The number of records to load at a time.
+PAGE: Final[int] = 100
+
+# The maximum number of records to keep in memory.
+SIZE: Final[int] = 500
+
+Key = tuple[int, int]
+
+
+def warning_key(w: WeatherWarning) -> Key:
+    """Return the key used to page through warnings."""
+    return (int(w.start.timestamp()), w.wid)
+
+
+def forecast_key(fc: Forecast) -> Key:
+    """Return the key used to page through Forecasts."""
+    return (int(fc.timestamp.timestamp()), fc.fid)
+
+
+class Pager:
+    """Pager keeps a sliding window of at most <size> records out of a
+    sequence that is too large to hold in memory, e.g. all warnings in the
+    database. Records are added a page at a time at either end of the
+    window. When the window grows too large, records are dropped at the
+    other end.
+    The pages are loaded by the caller, usually in the background. <edge>
+    tells it which key to page from; <add> takes the result."""
+
+    __slots__ = [
+        "key",
+        "page",
+        "size",
+        "window",
+        "exhausted",
+    ]
+
+    key: Callable[[Any], Key]
+    page: int
+    size: int
+    window: deque[Any]
+    exhausted: dict[bool, bool]
+
+    def __init__(self,
+                 key: Callable[[Any], Key],
+                 page: int = PAGE,
+                 size: int = SIZE) -> None:
+        self.key = key
+        self.page = page
+        self.size = size
+        self.window = deque()
+        self.exhausted = {True: False, False: False}
+
+    def __len__(self) -> int:
+        return len(self.window)
+
+    def edge(self, forward: bool) -> Optional[Key]:
+        """Return the key to load the next page after (or, if <forward> is
+        False, before), or None if the window is empty."""
+        if len(self.window) == 0:
+            return None
+        return self.key(self.window[-1] if forward else self.window[0])
+
+    def wants(self, forward: bool) -> bool:
+        """Return True if there may be more records in the given direction."""
+        return not self.exhausted[forward]
+
+    def reopen(self) -> None:
+        """Forget that an end of the sequence was reached, e.g. because new
+        records might have been added."""
+        self.exhausted[True] = False
+        self.exhausted[False] = False
+
+    def add(self, forward: bool, edge: Optional[Key], records: list[Any]) -> Optional[int]:
+        """Add a page of <records>, loaded from <edge>, to the end (or, if
+        <forward> is False, to the start) of the window. The records must be
+        in ascending order.
+        Returns the number of records dropped at the other end of the
+        window, or None if the window has moved since <edge> was looked up,
+        in which case the page is ignored."""
+        if edge != self.edge(forward):
+            return None
+        self.exhausted[forward] = len(records) < self.page
+        dropped: Final[int] = max(len(self.window) + len(records) - self.size, 0)
+        if forward:
+            self.window.extend(records)
+            for _ in range(dropped):
+                self.window.popleft()
+        else:
+            self.window.extendleft(reversed(records))
+            for _ in range(dropped):
+                self.window.pop()
+        if dropped > 0:
+            self.exhausted[not forward] = False
+        return dropped
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-19 18:55:40 krylon>
+#
+# /data/code/python/wetterfrosch/loader.py
+# created on 19. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+wetterfrosch.loader
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import logging
+import sys
+from queue import SimpleQueue
+from threading import Lock, Thread
+from typing import Any, Callable, Final, Optional
+
+from wetterfrosch import common
+
+# A load waiting to be run: its key, generation, the function fetching the
+# data and the callback to pass the result to.
+Job = tuple[str, int, Callable[[], Any], Callable[[Any], Any]]
+
+
+class Loader:
+    """Loader runs functions that load data, e.g. from the database, in a
+    background thread and hands their results to a callback on the UI
+    thread, using <dispatch> (e.g. glib.idle_add) to get there.
+    Each load has a key. Submitting a load supersedes all earlier loads with
+    the same key: If they have not started yet, they are skipped, if they
+    are still running, their results are dropped."""
+
+    __slots__ = [
+        "log",
+        "lock",
+        "dispatch",
+        "queue",
+        "generation",
+        "worker",
+    ]
+
+    log: logging.Logger
+    lock: Lock
+    dispatch: Callable[..., Any]
+    queue: SimpleQueue[Optional[Job]]
+    generation: dict[str, int]
+    worker: Optional[Thread]
+
+    def __init__(self, dispatch: Callable[..., Any]) -> None:
+        self.log = common.get_logger("loader")
+        self.lock = Lock()
+        self.dispatch = dispatch
+        self.queue = SimpleQueue()
+        self.generation = {}
+        self.worker = None
+
+    def start(self) -> None:
+        """Start the background thread."""
+        self.worker = Thread(target=self._worker, daemon=True)
+        self.worker.start()
+
+    def stop(self) -> None:
+        """Stop the background thread once it has finished the loads that
+        are pending."""
+        self.queue.put(None)
+
+    def submit(self,
+               key: str,
+               load: Callable[[], Any],
+               callback: Callable[[Any], Any]) -> int:
+        """Run <load> in the background and pass its result to <callback>
+        on the UI thread, unless another load with the same <key> is
+        submitted in the meantime.
+        Returns the generation of the load."""
+        with self.lock:
+            gen: Final[int] = self.generation.get(key, 0) + 1
+            self.generation[key] = gen
+        self.queue.put((key, gen, load, callback))
+        return gen
+
+    def is_current(self, key: str, gen: int) -> bool:
+        """Return True if <gen> is the most recent load for <key>."""
+        with self.lock:
+            return self.generation.get(key, 0) == gen
+
+    def _worker(self) -> None:
+        while (job := self.queue.get()) is not None:
+            key, gen, load, callback = job
+            if not self.is_current(key, gen):
+                self.log.debug("Skip stale load %s/%d", key, gen)
+                continue
+            try:
+                result = load()
+            except:  # noqa: E722,B001  pylint: disable-msg=W0702
+                self.log.error("Failed to load %s: %s", key, sys.exception())
+                continue
+            self.dispatch(self._deliver, key, gen, callback, result)
+
+    def _deliver(self,
+                 key: str,
+                 gen: int,
+                 callback: Callable[[Any], Any],
+                 result: Any) -> bool:
+        """Pass a result to its callback. This runs on the UI thread."""
+        if self.is_current(key, gen):
+            try:
+                callback(result)
+            except:  # noqa: E722,B001  pylint: disable-msg=W0702
+                self.log.error("Failed to process %s: %s", key, sys.exception())
+        else:
+            self.log.debug("Drop stale result for %s/%d", key, gen)
+        # Returning False removes the idle handler again.
+        return False
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
@@ -18,16 +18,23 @@ wetterfrosch.wetterfrosch
 """
 
 import argparse
+import signal
+import sys
 import time
-from typing import Final
+from datetime import datetime
+from typing import Final, Optional
 
 import krylib
 
-from wetterfrosch import client, common, gui
+# The GUI is imported only when it is needed, so running headless does not
+# pull in GTK.
+from wetterfrosch import (backfill, backup, checkpoint, client, common,
+                          config, database, export, maintenance, partition,
+                          snapshot)
 
 
-def main() -> None:
-    """The entry point to the application."""
+def parse_args() -> argparse.Namespace:
+    """Parse the command line."""
     argp: argparse.ArgumentParser = argparse.ArgumentParser()
     argp.add_argument("-g", "--gui",
                       action="store_true",
@@ -35,11 +42,104 @@ def main() -> None:
     argp.add_argument("-b", "--basedir",
                       default=common.path.base(),
                       help="The directory to store application-specific files in")
+    argp.add_argument("-e", "--export",
+                      action="store_true",
+                      help="Export the database to NDJSON or CSV files and exit")
+    argp.add_argument("--export-dir",
+                      default="",
+                      help="The directory to export data to")
+    argp.add_argument("--format",
+                      choices=[f.value for f in export.Format],
+                      default=export.Format.NDJSON.value,
+                      help="The format to export data in")
+    argp.add_argument("--since",
+                      type=datetime.fromisoformat,
+                      help="Only export data from this point in time onward")
+    argp.add_argument("--until",
+                      type=datetime.fromisoformat,
+                      help="Only export data up to this point in time")
+    argp.add_argument("--full",
+                      action="store_true",
+                      help="Export all rows, not just those added since the last export")
+    argp.add_argument("-i", "--import",
+                      dest="backfill",
+                      nargs="+",
+                      metavar="PATH",
+                      help="Import archived warnings from files or directories and exit")
+    argp.add_argument("--workers",
+                      type=int,
+                      help="The number of processes to parse archived warnings with")
+    argp.add_argument("--defer-index",
+                      action="store_true",
+                      help="Drop the warning indices during import, re-create them afterwards")
+    argp.add_argument("-m", "--maintenance",
+                      action="store_true",
+                      help="Clean up and check the database and exit")
+    argp.add_argument("-p", "--partition",
+                      choices=[s.value for s in partition.Scheme],
+                      help="Move warnings and forecasts of past months or years to archive files")  # noqa: E501
+    argp.add_argument("--backup",
+                      action="store_true",
+                      help="Create a backup of the database and exit")
+    argp.add_argument("--keep-backups",
+                      type=int,
+                      default=backup.KEEP,
+                      help="The number of backups to keep")
+    argp.add_argument("--memory",
+                      action="store_true",
+                      help="Keep the database in memory, save snapshots of it to disk regularly")  # noqa: E501
+
+    return argp.parse_args()
+
+
+def run_command(args: argparse.Namespace) -> bool:
+    """Run the one-shot command requested on the command line, if any.
+    Returns True if a command was run, so the application should exit."""
+    if args.export:
+        ex: export.Exporter = export.Exporter(folder=args.export_dir,
+                                              fmt=export.Format(args.format))
+        ex.export(begin=args.since,
+                  end=args.until,
+                  incremental=not args.full)
+        return True
+
+    if args.backfill:
+        bf: backfill.Backfill = backfill.Backfill(workers=args.workers,
+                                                  defer_index=args.defer_index)
+        bf.run(args.backfill)
+        return True
+
+    if args.backup:
+        backup.Backup(keep=args.keep_backups).run()
+        return True
 
-    args = argp.parse_args()
+    if args.maintenance:
+        maintenance.Maintenance().run()
+        return True
+
+    return False
+
+
+def main() -> None:
+    """The entry point to the application."""
+    args: Final[argparse.Namespace] = parse_args()
 
     common.set_basedir(args.basedir)
 
+    cfg: Final[config.Config] = config.Config()
+    try:
+        database.stats.slow_threshold = \
+            float(cfg.get_option("database", "slow_query_threshold"))
+    except KeyError:
+        # Configuration files created by older versions lack this setting.
+        pass
+
+    if run_command(args):
+        return
+
+    bak: backup.Backup = backup.Backup(keep=args.keep_backups)
+    maint: maintenance.Maintenance = maintenance.Maintenance()
+
     places: list[str] = []
     loc_path: Final[str] = common.path.locations()
 
@@ -53,16 +153,44 @@ def main() -> None:
 
     places = sorted(set(places))
 
+    snap: Optional[snapshot.Snapshotter] = None
+    if args.memory:
+        common.path.in_memory(True)
+        snap = snapshot.Snapshotter()
+        snap.load()
+        snap.start()
+        # Everything since the last snapshot is lost unless the final one
+        # is saved, so being terminated has to unwind through the finally
+        # clause below, which stops the Snapshotter.
+        signal.signal(signal.SIGTERM, lambda _sig, _frame: sys.exit(0))
+    else:
+        # An in-memory database does not have a WAL.
+        ckpt: checkpoint.Checkpointer = checkpoint.Checkpointer()
+        ckpt.start()
+
     c: client.Client = client.Client()
     c.start()
-
-    if args.gui:
-        g: gui.WetterGUI = gui.WetterGUI(c)
-        g.run()
-    else:
-        # do nothing, let the worker threads run in the background.
-        while True:
-            time.sleep(10)
+    maint.start()
+    bak.start()
+
+    if args.partition is not None:
+        part: partition.Partitioner = \
+            partition.Partitioner(scheme=partition.Scheme(args.partition))
+        part.start()
+
+    try:
+        if args.gui:
+            from wetterfrosch import gui  # pylint: disable-msg=C0415
+            g: gui.WetterGUI = gui.WetterGUI(c)
+            g.run()
+        else:
+            # do nothing, let the worker threads run in the background.
+            while True:
+                time.sleep(10)
+    finally:
+        if snap is not None:
+            c.stop()
+            snap.stop()
 
 
 if __name__ == '__main__':
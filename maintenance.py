@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-19 13:05:47 krylon>
+#
+# /data/code/python/wetterfrosch/maintenance.py
+# created on 19. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+wetterfrosch.maintenance
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import logging
+import sys
+import time
+from threading import Event, Thread
+from typing import Any, Final
+
+from wetterfrosch import common
+from wetterfrosch.database import Database
+
+# The interval (in seconds) between two scheduled maintenance runs.
+INTERVAL: Final[int] = 86400
+
+
+class Maintenance:
+    """Maintenance performs housekeeping on the database: It checks the
+    database's integrity, updates the statistics used by the query planner
+    and reports how much space a VACUUM would reclaim.
+    None of this blocks writers for long, so it can run while the Client
+    is writing to the database."""
+
+    __slots__ = [
+        "log",
+        "path",
+        "interval",
+        "stop_evt",
+    ]
+
+    log: logging.Logger
+    path: str
+    interval: int
+    stop_evt: Event
+
+    def __init__(self,
+                 path: str = "",
+                 interval: int = INTERVAL) -> None:
+        self.log = common.get_logger("maintenance")
+        self.path = path
+        self.interval = interval
+        self.stop_evt = Event()
+
+    def run(self) -> dict[str, Any]:
+        """Perform one round of maintenance and return a report."""
+        t1: Final[float] = time.time()
+        db: Final[Database] = Database(self.path)
+        try:
+            report: dict[str, Any] = {
+                "integrity": db.quick_check(),
+            }
+            if report["integrity"] != ["ok"]:
+                self.log.error("Integrity check found problems: %s",
+                               "; ".join(report["integrity"]))
+            db.analyze()
+            db.optimize()
+            report["reclaimable"] = db.space_reclaimable()
+        finally:
+            db.close()
+        report["duration"] = time.time() - t1
+        self.log.info("Maintenance done in %.2f seconds, VACUUM would reclaim %d KiB",
+                      report["duration"],
+                      report["reclaimable"] // 1024)
+        return report
+
+    def start(self) -> None:
+        """Run maintenance regularly in a background thread."""
+        self.stop_evt.clear()
+        worker = Thread(target=self._worker, daemon=True)
+        worker.start()
+
+    def stop(self) -> None:
+        """Stop the background thread."""
+        self.stop_evt.set()
+
+    def _worker(self) -> None:
+        while not self.stop_evt.wait(self.interval):
+            try:
+                self.run()
+            except:  # noqa: E722,B001  pylint: disable-msg=W0702
+                self.log.error("Database maintenance failed: %s",
+                               sys.exception())
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
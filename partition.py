@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-19 15:41:26 krylon>
+#
+# /data/code/python/wetterfrosch/partition.py
+# created on 19. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+wetterfrosch.partition
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import logging
+import os
+import sys
+from datetime import datetime
+from enum import Enum
+from threading import Event, Thread
+from typing import Final, Optional
+
+from wetterfrosch import common
+from wetterfrosch.database import Database
+
+# The folder, relative to the database, to store archive files in.
+ARCHIVE_FOLDER: Final[str] = "archive"
+
+# The interval (in seconds) between two checks for closed periods.
+INTERVAL: Final[int] = 86400
+
+
+class Scheme(Enum):
+    """The size of the periods the database is partitioned into."""
+    MONTH = "month"
+    YEAR = "year"
+
+
+def period_of(stamp: datetime, scheme: Scheme) -> tuple[datetime, datetime]:
+    """Return the beginning (inclusive) and end (exclusive) of the period
+    <stamp> falls into."""
+    match scheme:
+        case Scheme.MONTH:
+            begin = datetime(stamp.year, stamp.month, 1)
+            if stamp.month == 12:
+                return (begin, datetime(stamp.year + 1, 1, 1))
+            return (begin, datetime(stamp.year, stamp.month + 1, 1))
+        case Scheme.YEAR:
+            return (datetime(stamp.year, 1, 1), datetime(stamp.year + 1, 1, 1))
+    raise ValueError(f"Invalid partitioning scheme {scheme}")
+
+
+def period_name(begin: datetime, scheme: Scheme) -> str:
+    """Return the name of the period starting at <begin>."""
+    match scheme:
+        case Scheme.MONTH:
+            return begin.strftime("%Y-%m")
+        case Scheme.YEAR:
+            return begin.strftime("%Y")
+    raise ValueError(f"Invalid partitioning scheme {scheme}")
+
+
+class Partitioner:
+    """Partitioner moves the warnings and forecasts of closed periods from
+    the database to one archive file per period, so the database itself only
+    holds the current period.
+    Archive files never change once they are written, so they can be backed
+    up or moved to slower storage. The Database attaches them as needed when
+    it is asked for the data of a period."""
+
+    __slots__ = [
+        "log",
+        "path",
+        "scheme",
+        "interval",
+        "stop_evt",
+    ]
+
+    log: logging.Logger
+    path: str
+    scheme: Scheme
+    interval: int
+    stop_evt: Event
+
+    def __init__(self,
+                 path: str = "",
+                 scheme: Scheme = Scheme.MONTH,
+                 interval: int = INTERVAL) -> None:
+        self.log = common.get_logger("partition")
+        self.path = path
+        self.scheme = scheme
+        self.interval = interval
+        self.stop_evt = Event()
+
+    def filename(self, name: str) -> str:
+        """Return the path of the archive file for the period <name>,
+        relative to the database."""
+        return os.path.join(ARCHIVE_FOLDER,
+                            f"{common.APP_NAME.lower()}-{name}.db")
+
+    def rotate(self, now: Optional[datetime] = None) -> list[str]:
+        """Move all closed periods to archive files.
+        Returns the names of the archives created."""
+        if now is None:
+            now = datetime.now()
+        current: Final[datetime] = period_of(now, self.scheme)[0]
+        created: Final[list[str]] = []
+        db: Final[Database] = Database(self.path)
+        try:
+            oldest: Final[Optional[datetime]] = db.archive_oldest()
+            if oldest is None or oldest >= current:
+                return created
+            archived: Final[set[str]] = {a[0] for a in db.archive_get_all()}
+            begin, end = period_of(oldest, self.scheme)
+            while begin < current:
+                name: str = period_name(begin, self.scheme)
+                if name in archived:
+                    # Rows that show up after their period was archived stay
+                    # in the database, archives are never modified.
+                    self.log.warning("Period %s has been archived already, "
+                                     "rows added later stay in the database",
+                                     name)
+                else:
+                    counts = db.archive_period(self.filename(name), name, begin, end)
+                    if counts["warning"] + counts["forecast"] > 0:
+                        created.append(name)
+                begin, end = period_of(end, self.scheme)
+        finally:
+            db.close()
+        return created
+
+    def start(self) -> None:
+        """Check for closed periods regularly in a background thread."""
+        self.stop_evt.clear()
+        worker = Thread(target=self._worker, daemon=True)
+        worker.start()
+
+    def stop(self) -> None:
+        """Stop the background thread."""
+        self.stop_evt.set()
+
+    def _worker(self) -> None:
+        while True:
+            try:
+                self.rotate()
+            except:  # noqa: E722,B001  pylint: disable-msg=W0702
+                self.log.error("Failed to archive closed periods: %s",
+                               sys.exception())
+            if self.stop_evt.wait(self.interval):
+                return
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
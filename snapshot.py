@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-19 16:34:50 krylon>
+#
+# /data/code/python/wetterfrosch/snapshot.py
+# created on 19. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+wetterfrosch.snapshot
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import logging
+import os
+import sys
+from threading import Event, Lock, Thread
+from typing import Final, Optional
+
+import krylib
+
+from wetterfrosch import common
+from wetterfrosch.database import Database
+
+# The interval (in seconds) between two snapshots.
+INTERVAL: Final[int] = 300
+
+
+class Snapshotter:
+    """Snapshotter persists a database that lives in memory (or on a RAM
+    disk) by saving a snapshot of it to disk regularly and when it is
+    stopped. At startup, the most recent snapshot is loaded.
+    As long as the Snapshotter is running, it keeps a connection to the
+    database open, so a shared in-memory database is not discarded when
+    all other connections to it are closed."""
+
+    __slots__ = [
+        "log",
+        "lock",
+        "db",
+        "path",
+        "interval",
+        "stop_evt",
+        "worker",
+    ]
+
+    log: logging.Logger
+    lock: Lock
+    db: Database
+    path: str
+    interval: float
+    stop_evt: Event
+    worker: Optional[Thread]
+
+    def __init__(self,
+                 db: Optional[Database] = None,
+                 path: str = "",
+                 interval: float = INTERVAL) -> None:
+        self.log = common.get_logger("snapshot")
+        self.lock = Lock()
+        self.db = db if db is not None else Database()
+        self.path = path if path != "" else common.path.snapshot()
+        self.interval = interval
+        self.stop_evt = Event()
+        self.worker = None
+
+    def load(self) -> bool:
+        """Load the most recent snapshot into the database, if there is one.
+        Returns True if a snapshot was loaded."""
+        if not krylib.fexist(self.path):
+            self.log.info("No snapshot found at %s, starting out empty",
+                          self.path)
+            return False
+        with self.lock:
+            self.db.restore(self.path)
+        return True
+
+    def save(self, db: Optional[Database] = None) -> None:
+        """Save a snapshot of the database.
+        SQLite connections must not be shared between threads, so when
+        called from a thread other than the one that created the
+        Snapshotter, <db> has to be a connection opened in that thread."""
+        folder: Final[str] = os.path.dirname(self.path)
+        if folder != "" and not os.path.isdir(folder):
+            os.makedirs(folder)
+        with self.lock:
+            (db if db is not None else self.db).snapshot(self.path)
+
+    def start(self) -> None:
+        """Save snapshots regularly in a background thread."""
+        self.stop_evt.clear()
+        self.worker = Thread(target=self._worker, daemon=True)
+        self.worker.start()
+
+    def stop(self) -> None:
+        """Stop the background thread, save a final snapshot and close the
+        database connection."""
+        self.stop_evt.set()
+        if self.worker is not None:
+            self.worker.join()
+            self.worker = None
+        try:
+            self.save()
+        finally:
+            self.db.close()
+
+    def _worker(self) -> None:
+        db: Final[Database] = Database(self.db.path)
+        try:
+            while not self.stop_evt.wait(self.interval):
+                try:
+                    self.save(db)
+                except:  # noqa: E722,B001  pylint: disable-msg=W0702
+                    self.log.error("Failed to save snapshot to %s: %s",
+                                   self.path,
+                                   sys.exception())
+        finally:
+            db.close()
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-19 20:31:50 krylon>
+#
+# /data/code/python/wetterfrosch/test_alert.py
+# created on 19. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+wetterfrosch.test_alert
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import time
+import unittest
+from queue import Empty, SimpleQueue
+
+from wetterfrosch.alert import Alerter
+from wetterfrosch.data import WeatherWarning
+from wetterfrosch.generator import Generator
+
+
+def storm(n: int, events: list[str]) -> list[WeatherWarning]:
+    """Generate <n> warnings, cycling through <events>."""
+    warnings = list(Generator(seed=3).warnings(n))
+    for idx, w in enumerate(warnings):
+        w.event = events[idx % len(events)]
+        w.level = 2
+    return warnings
+
+
+class AlerterTest(unittest.TestCase):
+    """Test coalescing and rate-limiting notifications."""
+
+    def test_01_messages(self) -> None:
+        """Test grouping warnings into notifications."""
+        alerter = Alerter(print, limit=3)
+        single = storm(1, ["FROST"])
+        self.assertEqual(alerter.messages(single),
+                         [(single[0].headline, single[0].description)])
+
+        msg = alerter.messages(storm(20, ["STURMBÖEN", "GEWITTER"]))
+        self.assertEqual(len(msg), 2)
+        self.assertTrue(msg[0][0].startswith("10 Warnungen"))
+
+        # Too many groups, the least severe ones are summarized.
+        warnings = storm(5, ["A", "B", "C", "D", "E"])
+        warnings[4].level = 4
+        msg = alerter.messages(warnings)
+        self.assertEqual(len(msg), 3)
+        self.assertEqual(msg[0], (warnings[4].headline, warnings[4].description))
+        self.assertEqual(msg[2][0], "3 weitere Warnungen")
+
+    def test_02_coalesce(self) -> None:
+        """Test that a burst of warnings results in few notifications."""
+        sent: SimpleQueue = SimpleQueue()
+        alerter = Alerter(lambda s, b: sent.put(s), window=0.2, gap=0.5, limit=2)
+        alerter.start()
+        t1 = time.monotonic()
+        for w in storm(50, ["STURMBÖEN", "GEWITTER", "FROST"]):
+            alerter.alert(w)
+        first = [sent.get(timeout=2), sent.get(timeout=2)]
+        self.assertEqual(len(first), 2)
+        self.assertRaises(Empty, sent.get, timeout=0.3)
+
+        # The next batch has to wait for the gap.
+        alerter.alert(storm(1, ["FROST"])[0])
+        sent.get(timeout=2)
+        self.assertGreaterEqual(time.monotonic() - t1, 0.5)
+        alerter.stop()
+
+    def test_03_failure(self) -> None:
+        """Test that failing notifications do not stop the Alerter."""
+        calls: list[str] = []
+
+        def send(summary: str, _body: str) -> None:
+            calls.append(summary)
+            raise RuntimeError("D-Bus is gone")
+
+        alerter = Alerter(send, window=0, gap=0, backoff=60)
+        warnings = storm(3, ["A", "B", "C"])
+        alerter._dispatch(warnings[:2])  # pylint: disable-msg=W0212
+        # The second notification of the batch is not even tried.
+        self.assertEqual(len(calls), 1)
+        alerter._dispatch(warnings[2:])  # pylint: disable-msg=W0212
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(alerter.delay, 60)
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
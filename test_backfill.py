@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-19 11:52:40 krylon>
+#
+# /data/code/python/wetterfrosch/test_backfill.py
+# created on 19. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+wetterfrosch.test_backfill
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import os
+import unittest
+from datetime import datetime
+from typing import Final
+
+import krylib
+from krylib import isdir
+
+from wetterfrosch import common, database
+from wetterfrosch.backfill import Backfill, parse_file
+
+TEST_ROOT: str = "/tmp/"
+
+if isdir("/data/ram"):
+    TEST_ROOT = "/data/ram"
+
+sample_files: Final[list[str]] = [
+    "example.json",
+    "example_raw.json",
+    "warnings.json",
+]
+
+
+class BackfillTest(unittest.TestCase):
+    """Test importing archived warnings."""
+
+    folder: str
+    db: database.Database
+    files: list[str]
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        stamp = datetime.now()
+        folder_name = \
+            stamp.strftime("wetterfrosch_test_backfill_%Y%m%d_%H%M%S")
+        cls.folder = os.path.join(TEST_ROOT,
+                                  folder_name)
+        common.set_basedir(cls.folder)
+        cls.db = database.Database(common.path.db())
+        cls.files = [f for f in sample_files if krylib.fexist(f)]
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        os.system(f"/bin/rm -rf {cls.folder}")
+
+    def test_01_parse(self) -> None:
+        """Test parsing sample files, with and without envelope."""
+        if len(self.__class__.files) == 0:
+            self.skipTest("Sample files not found")
+        for f in self.__class__.files:
+            path, warnings, err = parse_file(f)
+            self.assertEqual(path, f)
+            self.assertEqual(err, "")
+            self.assertGreater(len(warnings), 0)
+
+        _, warnings, err = parse_file("does-not-exist.json")
+        self.assertEqual(len(warnings), 0)
+        self.assertNotEqual(err, "")
+
+    def test_02_import(self) -> None:
+        """Test importing the sample files."""
+        if len(self.__class__.files) == 0:
+            self.skipTest("Sample files not found")
+        db = self.__class__.db
+        bf = Backfill(db, workers=2, batch=100, defer_index=True)
+        added: int = bf.run(self.__class__.files)
+        self.assertGreater(added, 0)
+        self.assertEqual(len(db.warning_get_all()), added)
+        cur = db.db.cursor()
+        cur.execute(database.db_queries[database.Query.IndexGetByTable],
+                    ("warning", ))
+        self.assertEqual(len(cur.fetchall()), 5)
+
+    def test_03_import_again(self) -> None:
+        """Test that importing the same files twice adds nothing."""
+        if len(self.__class__.files) == 0:
+            self.skipTest("Sample files not found")
+        bf = Backfill(self.__class__.db, workers=2)
+        self.assertEqual(bf.run(self.__class__.files), 0)
+
+    def test_04_restore_index(self) -> None:
+        """Test that indices dropped by an interrupted import are
+        re-created when the database is opened again."""
+        db = database.Database(common.path.db())
+        self.assertEqual(len(db.index_drop("warning")), 5)
+        db.close()
+
+        db = database.Database(common.path.db())
+        cur = db.db.cursor()
+        cur.execute(database.db_queries[database.Query.IndexGetByTable],
+                    ("warning", ))
+        self.assertEqual(len(cur.fetchall()), 5)
+        db.close()
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-19 17:40:33 krylon>
+#
+# /data/code/python/wetterfrosch/test_backup.py
+# created on 19. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+wetterfrosch.test_backup
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import gzip
+import os
+import shutil
+import unittest
+from datetime import datetime
+from threading import Event, Thread
+
+from krylib import isdir
+
+from wetterfrosch import common, database
+from wetterfrosch.backup import Backup
+from wetterfrosch.generator import Generator
+
+TEST_ROOT: str = "/tmp/"
+
+if isdir("/data/ram"):
+    TEST_ROOT = "/data/ram"
+
+
+class BackupTest(unittest.TestCase):
+    """Test creating backups of the database."""
+
+    folder: str
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        stamp = datetime.now()
+        folder_name = \
+            stamp.strftime("wetterfrosch_test_backup_%Y%m%d_%H%M%S")
+        cls.folder = os.path.join(TEST_ROOT,
+                                  folder_name)
+        common.set_basedir(cls.folder)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        os.system(f"/bin/rm -rf {cls.folder}")
+
+    def test_01_backup(self) -> None:
+        """Test creating a backup while the database is being written to."""
+        db = database.Database(common.path.db())
+        gen = Generator(seed=7)
+        db.warning_add_batch(list(gen.warnings(2000)))
+
+        done = Event()
+
+        def writer() -> None:
+            wdb = database.Database(common.path.db())
+            for w in gen.warnings(200):
+                wdb.warning_add(w)
+                if done.is_set():
+                    break
+            wdb.close()
+
+        worker = Thread(target=writer)
+        worker.start()
+        bak = Backup(pages=4, pause=0.001)
+        path = bak.run()
+        done.set()
+        worker.join()
+
+        self.assertTrue(path.endswith(".db.gz"))
+        copy = os.path.join(self.__class__.folder, "restored.db")
+        with gzip.open(path, "rb") as src, open(copy, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        restored = database.Database(copy)
+        self.assertEqual(restored.quick_check(), ["ok"])
+        self.assertGreaterEqual(len(restored.warning_get_all()), 2000)
+        restored.close()
+        db.close()
+
+    def test_02_rotate(self) -> None:
+        """Test keeping only the most recent backups."""
+        bak = Backup(keep=2)
+        paths = [bak.run() for _ in range(3)]
+        self.assertEqual(bak.backups(), paths[1:])
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
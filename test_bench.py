@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-19 15:20:36 krylon>
+#
+# /data/code/python/wetterfrosch/test_bench.py
+# created on 19. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+wetterfrosch.test_bench
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import json
+import unittest
+
+from wetterfrosch.bench import Benchmark
+from wetterfrosch.generator import Generator
+
+
+class GeneratorTest(unittest.TestCase):
+    """Test generating synthetic data."""
+
+    def test_01_warnings(self) -> None:
+        """Test that generated warnings are unique and reproducible."""
+        warnings = list(Generator(seed=1).warnings(1000))
+        self.assertEqual(len(warnings), 1000)
+        self.assertEqual(len({w.cksum() for w in warnings}), 1000)
+        again = list(Generator(seed=1).warnings(1000))
+        self.assertEqual([w.cksum() for w in warnings],
+                         [w.cksum() for w in again])
+        gen = Generator(regions=50)
+        regions = {r[0] for r in gen.regions}
+        self.assertEqual(len(regions), 50)
+        for w in gen.warnings(1000):
+            self.assertIn(w.region_name, regions)
+
+    def test_02_forecasts(self) -> None:
+        """Test generating forecasts with hourly data."""
+        forecasts = list(Generator().forecasts(10, hours=24))
+        self.assertEqual(len(forecasts), 10)
+        for fc in forecasts:
+            self.assertEqual(len(fc.hourly), 24)
+            self.assertGreaterEqual(fc.temperature, -60)
+            self.assertLessEqual(fc.temperature, 50)
+
+
+class BenchmarkTest(unittest.TestCase):
+    """Run the benchmark at a very small scale."""
+
+    def test_01_run(self) -> None:
+        """Test that the benchmark runs and its results are serializable."""
+        res = Benchmark(warnings=500, forecasts=5, queries=10).run()
+        self.assertEqual(res["results"]["warning_add"]["rows"], 500)
+        self.assertEqual(res["results"]["hourly_add"]["rows"], 5 * 48)
+        self.assertEqual(res["results"]["warning_get_keys"]["keys"], 500)
+        self.assertGreater(res["results"]["db_size"], 0)
+        self.assertIsInstance(json.dumps(res), str)
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-19 22:03:18 krylon>
+#
+# /data/code/python/wetterfrosch/test_chart.py
+# created on 19. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+wetterfrosch.test_chart
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import unittest
+from typing import Any, Callable
+
+from wetterfrosch.chart import Metric, Plot, SeriesCache, series_of, thin
+from wetterfrosch.data import Forecast
+from wetterfrosch.generator import Generator
+
+
+def forecasts(n: int) -> list[Forecast]:
+    """Generate <n> Forecasts, ten minutes apart, with distinct IDs."""
+    result = list(Generator(seed=5).forecasts(n, hours=48))
+    for idx, fc in enumerate(result):
+        fc.fid = idx + 1
+    return result
+
+
+# pylint: disable-msg=R0903
+class Recorder:
+    """Recorder stands in for a Cairo context and counts the calls made to
+    it."""
+
+    calls: dict[str, int]
+
+    def __init__(self) -> None:
+        self.calls = {}
+
+    def __getattr__(self, name: str) -> Callable[..., None]:
+        def record(*_args: Any) -> None:
+            self.calls[name] = self.calls.get(name, 0) + 1
+        return record
+
+
+class ChartTest(unittest.TestCase):
+    """Test computing and drawing charts."""
+
+    def test_01_series(self) -> None:
+        """Test extracting series from a Forecast."""
+        fc = forecasts(1)[0]
+        series = series_of(fc)
+        self.assertEqual(set(series), set(Metric))
+        self.assertEqual(len(series[Metric.TEMPERATURE]), 48)
+        self.assertEqual(series[Metric.HUMIDITY][3],
+                         (fc.hourly[3].timestamp.timestamp(),
+                          float(fc.hourly[3].humidity)))
+
+        cache = SeriesCache(size=2)
+        fcs = forecasts(3)
+        for fc in fcs + fcs[-1:]:
+            cache.get(fc)
+        self.assertEqual(cache.misses, 3)
+        self.assertEqual(list(cache.cache), [2, 3])
+
+    def test_02_thin(self) -> None:
+        """Test picking Forecasts to overlay."""
+        fcs = forecasts(60)
+        picked = thin(fcs, step=3600)
+        self.assertIs(picked[-1], fcs[-1])
+        self.assertLessEqual(len(picked), 12)
+        self.assertEqual(thin([]), [])
+
+    def test_03_plot(self) -> None:
+        """Test that the layout is only computed when necessary."""
+        cache = SeriesCache()
+        plot = Plot(cache)
+        fcs = thin(forecasts(432))
+        self.assertTrue(plot.set_forecasts(fcs))
+        self.assertFalse(plot.set_forecasts(list(fcs)))
+
+        panels = plot.layout(800, 600)
+        self.assertEqual(len(panels), len(Metric))
+        for panel in panels:
+            x0, y0, w, h = panel["box"]
+            self.assertEqual(len(panel["lines"]), len(fcs))
+            for line in panel["lines"]:
+                for x, y in line:
+                    self.assertTrue(x0 <= x <= x0 + w)
+                    self.assertTrue(y0 <= y <= y0 + h)
+        self.assertIs(plot.layout(800, 600), panels)
+        self.assertIsNot(plot.layout(640, 480), panels)
+
+        cr = Recorder()
+        plot.paint(cr, 640, 480)
+        self.assertEqual(cr.calls["stroke"], len(Metric) * (len(fcs) + 1))
+        self.assertEqual(cache.misses, len(fcs))
+
+        # A new Forecast only costs one more series.
+        self.assertTrue(plot.set_forecasts(fcs[1:] + forecasts(433)[-1:]))
+        plot.paint(Recorder(), 640, 480)
+        self.assertEqual(cache.misses, len(fcs) + 1)
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-19 18:21:47 krylon>
+#
+# /data/code/python/wetterfrosch/test_checkpoint.py
+# created on 19. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+wetterfrosch.test_checkpoint
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import os
+import sqlite3
+import unittest
+from datetime import datetime
+
+from krylib import isdir
+
+from wetterfrosch import common, database
+from wetterfrosch.checkpoint import Checkpointer
+from wetterfrosch.generator import Generator
+
+TEST_ROOT: str = "/tmp/"
+
+if isdir("/data/ram"):
+    TEST_ROOT = "/data/ram"
+
+
+class CheckpointTest(unittest.TestCase):
+    """Test managing WAL checkpoints."""
+
+    folder: str
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        stamp = datetime.now()
+        folder_name = \
+            stamp.strftime("wetterfrosch_test_checkpoint_%Y%m%d_%H%M%S")
+        cls.folder = os.path.join(TEST_ROOT,
+                                  folder_name)
+        common.set_basedir(cls.folder)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        os.system(f"/bin/rm -rf {cls.folder}")
+
+    def test_01_checkpoint(self) -> None:
+        """Test checkpointing with and without a reader pinning the WAL."""
+        db = database.Database(common.path.db())
+        gen = Generator(seed=3)
+        db.warning_add_batch(list(gen.warnings(500)))
+        self.assertGreater(db.wal_size(), 0)
+
+        ckpt = Checkpointer(passive_size=1,
+                            truncate_size=1 << 40,
+                            idle=3600,
+                            pin_warn=10)
+
+        # A reader holding on to an old snapshot of the database.
+        reader = sqlite3.connect(common.path.db())
+        reader.execute("BEGIN")
+        reader.execute("SELECT COUNT(*) FROM warning").fetchone()
+        db.warning_add_batch(list(gen.warnings(500)))
+
+        self.assertEqual(ckpt.check(0.0), "PASSIVE")
+        busy, frames, done = ckpt.metrics()["last_result"]
+        self.assertEqual(busy, 0)
+        self.assertLess(done, frames)
+        with self.assertLogs(ckpt.log, "WARNING"):
+            ckpt.check(20.0)
+
+        reader.rollback()
+        reader.close()
+        self.assertEqual(ckpt.check(25.0), "PASSIVE")
+        busy, frames, done = ckpt.metrics()["last_result"]
+        self.assertEqual(done, frames)
+        # The WAL has not shrunk, but there is nothing left to copy.
+        self.assertGreater(db.wal_size(), 0)
+        self.assertIsNone(ckpt.check(26.0))
+
+        ckpt.truncate_size = 1
+        self.assertEqual(ckpt.check(30.0), "TRUNCATE")
+        self.assertEqual(db.wal_size(), 0)
+        metrics = ckpt.metrics()
+        self.assertEqual(metrics["wal_size"], 0)
+        self.assertEqual(metrics["checkpoints"], {"PASSIVE": 3, "TRUNCATE": 1})
+        self.assertEqual(metrics["pinned_for"], 0.0)
+        self.assertIsNone(ckpt.check(40.0))
+        db.close()
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
@@ -18,13 +18,16 @@ wetterfrosch.test_client
 """
 
 import os
+import re
 import unittest
 from datetime import datetime
+from threading import Thread
 from typing import Optional
 
 from wetterfrosch import common
-from wetterfrosch.client import Client
+from wetterfrosch.client import Client, LocationList, Matcher
 from wetterfrosch.data import WeatherWarning
+from wetterfrosch.generator import REGIONS
 
 TEST_DIR: str = os.path.join(
     datetime.now().strftime("wetterfrosch_test_client_%Y%m%d_%H%M%S"))
@@ -79,6 +82,24 @@ class ClientTest(unittest.TestCase):
         except Exception as e:  # pylint: disable-msg=W0718
             self.fail(f"Failed to fetch/parse data from DWD: {e}")
 
+    def test_03_notify(self) -> None:
+        """Test notifying subscribers when the data changes."""
+        c: Optional[Client] = self.__class__.client()
+        assert c is not None
+        versions: list[int] = []
+        c.subscribe(versions.append)
+        v0: int = c.data_version()
+        cnt: int = c.acknowledge_matching()
+        if cnt > 0:
+            self.assertEqual(versions, [v0 + 1])
+        else:
+            self.assertEqual(versions, [])
+        # Nothing is left to acknowledge, so nothing changes.
+        self.assertEqual(c.acknowledge_matching(), 0)
+        self.assertEqual(c.data_version(), v0 + len(versions))
+        c.unsubscribe(versions.append)
+        self.assertEqual(len(versions), 1 if cnt > 0 else 0)
+
     # def test_03_process_sample_data(self) -> None:
     #     """Test prcessing the sample data.
     #     This works even without a working Internet connection."""
@@ -100,6 +121,94 @@ class ClientTest(unittest.TestCase):
     #             except Exception as e:  # pylint: disable-msg=W0718
     #                 self.fail(f"Failed to process {f}: {e}")
 
+
+class MatcherTest(unittest.TestCase):
+    """Test matching locations against many patterns at once."""
+
+    def test_01_match(self) -> None:
+        """Test that the Matcher agrees with checking each pattern."""
+        sources = [
+            "Bielefeld",
+            "kreis lippe",
+            "^Stadt",
+            "Köln",
+            "M(ü|ue)nster",
+            "Stadt Hamm$",
+            "Kreis .* Land",
+        ]
+        patterns = [re.compile(p, re.I) for p in sources]
+        patterns.append(re.compile("Berlin"))
+        matcher = Matcher(patterns)
+        self.assertIn("bielefeld", matcher.literals)
+        self.assertNotIn("^stadt", matcher.literals)
+        self.assertIsNotNone(matcher.combined)
+        # Inline flags cannot be combined, the Matcher falls back to
+        # checking each pattern.
+        fallback = Matcher(patterns + [re.compile("(?i)Lemgo", re.I)])
+        self.assertIsNone(fallback.combined)
+        names = [r[0] for r in REGIONS] + \
+            ["Stadt Köln", "KREIS LIPPE", "berlin", "Berlin-Mitte",
+             "Muenster", "Stadt Hamm Süd", "LEMGO"]
+        for name in names:
+            expected = any(p.search(name) is not None for p in patterns)
+            self.assertEqual(matcher.match(name), expected, name)
+            self.assertEqual(fallback.match(name),
+                             expected or name == "LEMGO",
+                             name)
+
+        self.assertTrue(Matcher([]).match("Anywhere"))
+
+    def test_02_memo(self) -> None:
+        """Test that match results are remembered until the patterns
+        change."""
+        locations = LocationList.new()
+        saved = [p.pattern for p in locations.patterns]
+        try:
+            locations.replace(["Bielefeld", "^Kreis"])
+            self.assertTrue(locations.check("Kreis Lippe"))
+            self.assertFalse(locations.check("Stadt Hamburg"))
+            self.assertEqual(locations.memo,
+                             {"Kreis Lippe": True, "Stadt Hamburg": False})
+            self.assertFalse(locations.check("Stadt Hamburg"))
+
+            gen = locations.generation
+            locations.add("Hamburg")
+            self.assertGreater(locations.generation, gen)
+            self.assertTrue(locations.check("Stadt Hamburg"))
+            self.assertEqual(locations.memo, {"Stadt Hamburg": True})
+
+            locations.clear()
+            self.assertTrue(locations.check("Stadt Hamburg"))
+        finally:
+            locations.replace(saved)
+
+    def test_03_concurrent(self) -> None:
+        """Test reading the list while it is being changed."""
+        locations = LocationList.new()
+        saved = [p.pattern for p in locations.patterns]
+        errors: list[str] = []
+
+        def reader() -> None:
+            for _ in range(2000):
+                snap = locations.current
+                # Each set of patterns matches exactly one of the two names.
+                if snap.check("Kreis Lippe") == snap.check("Stadt Hamburg"):
+                    errors.append(f"Inconsistent snapshot {snap.generation}")
+
+        try:
+            locations.replace(["^Kreis"])
+            readers = [Thread(target=reader) for _ in range(4)]
+            for r in readers:
+                r.start()
+            for idx in range(200):
+                locations.replace(["^Stadt"] if idx % 2 == 0 else ["^Kreis"])
+            for r in readers:
+                r.join()
+            self.assertEqual(errors, [])
+            self.assertEqual(locations.cnt(), 1)
+        finally:
+            locations.replace(saved)
+
 # Local Variables: #
 # python-indent: 4 #
 # End: #
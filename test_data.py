@@ -77,9 +77,9 @@ class ForecastTest(unittest.TestCase):
     def test_02_from_db_row(self) -> None:
         """Test creating a Forecast from a database row (i.e. tuple)"""
         test_tuples: Final[list[tuple]] = [
-            (1, 1707083280, "52.0333/8.5333", "Rain", "rain",
+            (1, 1707083280, 52.0333, 8.5333, "Rain", "rain",
              75, 7, 7, 95, 5, 10),
-            (2, 1707083280+300, "52.0333/8.5333", "Rain", "rain",
+            (2, 1707083280+300, 52.0333, 8.5333, "Rain", "rain",
              67, 6, 3, 70, 15, 10),
         ]
 
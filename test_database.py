@@ -19,6 +19,7 @@ wetterfrosch.test_database
 
 import json
 import os
+import sqlite3
 import sys
 import unittest
 from datetime import datetime
@@ -29,6 +30,7 @@ from krylib import isdir
 
 from wetterfrosch import common, database
 from wetterfrosch.data import Forecast, WeatherWarning
+from wetterfrosch.generator import Generator
 
 TEST_ROOT: str = "/tmp/"
 
@@ -176,6 +178,359 @@ class DatabaseTest(unittest.TestCase):
         except Exception as e:  # pylint: disable-msg=W0718
             self.fail(f"Error fetching current forecast: {e}")
 
+    def test_08_forecast_hourly(self) -> None:
+        """Test loading the hourly data of several forecasts at once."""
+        sample_files = ["weather.json", "weather2.json"]
+        db = self.__get_db()
+        stored = {fc.timestamp: fc.fid for fc in db.forecast_get_recent(load_hourly=False)}
+        cnt: int = 0
+        for f in sample_files:
+            if not krylib.fexist(f):
+                continue
+            with open(f, "r", encoding="utf-8") as fh:
+                fc: Forecast = Forecast(json.load(fh))
+            fc.fid = stored[fc.timestamp]
+            with db:
+                db.hourly_add(fc)
+            cnt += 1
+
+        recent = db.forecast_get_recent()
+        self.assertEqual(len(recent), cnt)
+        for fc in recent:
+            self.assertGreater(len(fc.hourly), 0)
+            self.assertEqual(len(fc.hourly),
+                             len(db.hourly_get_by_forecast(fc.fid)))
+
+        t1 = min(stored.keys())
+        t2 = max(stored.keys())
+        period = db.forecast_get_by_period(t1, t2)
+        self.assertEqual([fc.fid for fc in period],
+                         [fid for _, fid in sorted(stored.items())])
+        streamed = list(db.forecast_iter_by_period(t1, t2, chunk=1))
+        self.assertEqual([fc.fid for fc in streamed], [fc.fid for fc in period])
+        for a, b in zip(streamed, period):
+            self.assertEqual([p.pid for p in a.hourly], [p.pid for p in b.hourly])
+
+    def test_09_migrate(self) -> None:
+        """Test bringing a database created by an older version up to date."""
+        path: Final[str] = os.path.join(self.__class__.folder, "legacy.db")
+        legacy = sqlite3.connect(path)
+        legacy.executescript(LEGACY_SCHEMA)
+        legacy.execute("""
+INSERT INTO forecast (id, timestamp, location, summary, icon, prob_rain,
+    temperature, temperature_apparent, humidity, wind_speed, visibility)
+VALUES (1, 1707083280, '52.0333/8.5333', 'Rain', 'rain', 75, 7, 7, 95, 5, 10)
+""")
+        legacy.execute("""
+INSERT INTO hourly (forecast_id, timestamp, icon, prob_rain, rain_amt,
+    temperature, humidity, pressure, wind_speed, cloud_cover, visibility)
+VALUES (1, 1707083280, 'rain', 75, 0.5, 7, 95, 1013.0, 5, 100, 10.0)
+""")
+        legacy.commit()
+        legacy.close()
+
+        db = database.Database(path)
+        cur = db.db.cursor()
+        cur.execute("PRAGMA user_version")
+        self.assertEqual(cur.fetchone()[0], len(database.MIGRATIONS))
+        cur.execute(database.db_queries[database.Query.IndexGetByTable],
+                    ("hourly", ))
+        self.assertIn("h_fc_idx", [row[0] for row in cur.fetchall()])
+
+        fc = db.forecast_get_current((52.0333, 8.5333))
+        self.assertIsNotNone(fc)
+        assert fc is not None
+        self.assertEqual(fc.location, (52.0333, 8.5333))
+        self.assertEqual(len(fc.hourly), 1)
+
+        # IDs are never handed out twice.
+        cur.execute("SELECT name, seq FROM sqlite_sequence")
+        seq = dict(cur.fetchall())
+        self.assertEqual((seq["forecast"], seq["hourly"]), (1, 1))
+        db.close()
+
+    def test_10_forecast_location(self) -> None:
+        """Test storing and looking up forecasts for several locations."""
+        if not krylib.fexist("weather.json"):
+            self.skipTest("Sample file not found")
+        db = self.__get_db()
+        with open("weather.json", "r", encoding="utf-8") as fh:
+            raw = json.load(fh)
+        here = Forecast(raw)
+        lid = db.location_add(here.location, "Here")
+        self.assertGreater(lid, 0)
+        self.assertEqual(db.location_add(here.location, "Still here"), lid)
+        self.assertEqual(db.location_add(here.location, "Still here"), lid)
+        self.assertEqual(db.location_add(here.location), lid)
+        self.assertIn((lid, "Still here", here.location), db.location_get_all())
+
+        raw["latitude"] += 1.0
+        there = Forecast(raw)
+        with db:
+            db.forecast_add(there)
+        self.assertGreater(there.fid, 0)
+
+        fc = db.forecast_get_current(there.location)
+        assert fc is not None
+        self.assertEqual(fc.fid, there.fid)
+        fc = db.forecast_get_current(here.location)
+        assert fc is not None
+        self.assertEqual(fc.location, here.location)
+        self.assertNotEqual(fc.fid, there.fid)
+
+        locations = db.location_get_all()
+        self.assertEqual(len(locations), 1)
+        self.assertEqual(locations[0], (lid, "Still here", here.location))
+
+    def test_11_query_stats(self) -> None:
+        """Test the collection of query statistics."""
+        db = self.__get_db()
+        stats = database.stats
+        stats.reset()
+        warnings = db.warning_get_all()
+        snap = stats.snapshot()
+        self.assertIn("WarningGetAll", snap)
+        self.assertEqual(snap["WarningGetAll"]["count"], 1)
+        self.assertEqual(snap["WarningGetAll"]["rows"], len(warnings))
+        self.assertEqual(sum(snap["WarningGetAll"]["histogram"].values()), 1)
+
+        # Methods returning an ID or a flag do not report it as rows, and
+        # nested calls are only counted as part of the outer one.
+        stats.reset()
+        db.warning_exist(warnings[0])
+        current = db.forecast_get_current()
+        snap = stats.snapshot()
+        self.assertEqual(snap["WarningExists"]["rows"], 0)
+        self.assertEqual(snap["ForecastGetCurrent"]["rows"], 0 if current is None else 1)
+        self.assertNotIn("HourlyGetByForecast", snap)
+
+        threshold = stats.slow_threshold
+        try:
+            stats.slow_threshold = 0.0
+            stats.explain = True
+            _ = list(db.forecast_iter_by_period(datetime(1970, 1, 2), datetime.now()))
+            slow = stats.slow_queries()
+            self.assertGreater(len(slow), 0)
+            self.assertEqual(slow[-1]["query"], "ForecastGetByPeriodPage")
+            if common.DEBUG:
+                self.assertGreater(len(slow[-1]["plan"]), 0)
+        finally:
+            stats.slow_threshold = threshold
+            stats.explain = False
+
+    def test_12_acknowledge_bulk(self) -> None:
+        """Test acknowledging many warnings at once."""
+        path: Final[str] = os.path.join(self.__class__.folder, "ack.db")
+        db = database.Database(path)
+        db.warning_add_batch(list(Generator(regions=3).warnings(300)))
+        warnings = db.warning_get_all()
+
+        ids = [w.wid for w in warnings[:10]]
+        self.assertEqual(db.warning_acknowledge_ids(ids), 10)
+        self.assertEqual(db.warning_acknowledge_ids(ids), 0)
+
+        region: Final[str] = warnings[0].region_name
+        expected = [w for w in warnings[10:] if w.region_name == region]
+        self.assertEqual(db.warning_acknowledge_matching(region=region),
+                         len(expected))
+        for w in db.warning_get_all():
+            self.assertEqual(w.acknowledged != 0,
+                             w.wid in ids or w.region_name == region)
+
+        w = warnings[-1]
+        cnt = db.warning_acknowledge_matching(event=w.event,
+                                              level=w.level,
+                                              begin=w.start,
+                                              end=w.end)
+        self.assertGreaterEqual(cnt, 0 if w.region_name == region else 1)
+        pending = [w for w in db.warning_get_all() if not w.acknowledged]
+        self.assertEqual(db.warning_acknowledge_matching(), len(pending))
+        self.assertTrue(all(w.acknowledged for w in db.warning_get_all()))
+        db.close()
+
+    def test_13_forecast_upsert(self) -> None:
+        """Test storing the same Forecast repeatedly."""
+        path: Final[str] = os.path.join(self.__class__.folder, "upsert.db")
+        db = database.Database(path)
+        records = list(Generator().forecast_records(1, hours=12))
+        fc = Forecast(records[0])
+        self.assertTrue(db.forecast_upsert(fc))
+        fid: Final[int] = fc.fid
+        self.assertGreater(fid, 0)
+
+        changes = db.db.total_changes
+        again = Forecast(records[0])
+        self.assertFalse(db.forecast_upsert(again))
+        self.assertEqual(again.fid, fid)
+        self.assertEqual(db.db.total_changes, changes)
+
+        records[0]["hourly"]["data"][3]["temperature"] += 5
+        self.assertTrue(db.forecast_upsert(Forecast(records[0])))
+        hourly = db.hourly_get_by_forecast(fid)
+        self.assertEqual(len(hourly), 12)
+        self.assertEqual(hourly[3].temperature,
+                         int(records[0]["hourly"]["data"][3]["temperature"]))
+
+        records[0]["currently"]["summary"] = "Changed"
+        self.assertTrue(db.forecast_upsert(Forecast(records[0])))
+        current = db.forecast_get_current()
+        assert current is not None
+        self.assertEqual((current.fid, current.summary), (fid, "Changed"))
+        self.assertEqual(len(current.hourly), 12)
+
+        # The location and the Forecast are stored together or not at all.
+        records[0]["latitude"] += 1.0
+        there = Forecast(records[0])
+        with self.assertRaises(RuntimeError):
+            with db:
+                db.location_add(there.location, "There")
+                db.forecast_upsert(there)
+                raise RuntimeError("Interrupted")
+        self.assertFalse(db.db.in_transaction)
+        self.assertNotIn(there.location, [loc[2] for loc in db.location_get_all()])
+        self.assertEqual(len(db.forecast_get_recent(10)), 1)
+
+        # Two Forecasts issued at the same time each get their hourly data.
+        self.assertTrue(db.forecast_upsert(there))
+        for n in (1, 2):
+            recent = db.forecast_get_recent(n)
+            self.assertEqual(len(recent), n)
+            for fc in recent:
+                self.assertEqual(len(fc.hourly), 12)
+        db.close()
+
+    def test_14_page(self) -> None:
+        """Test paging through warnings and forecasts."""
+        path: Final[str] = os.path.join(self.__class__.folder, "page.db")
+        db = database.Database(path)
+        gen = Generator(seed=11)
+        db.warning_add_batch(list(gen.warnings(250)))
+        for fc in gen.forecasts(30, hours=2):
+            db.forecast_add(fc)
+        warnings = db.warning_get_all()
+        expected = sorted(((int(w.start.timestamp()), w.wid) for w in warnings))
+
+        keys: list[tuple[int, int]] = []
+        page = db.warning_get_page(None, 100)
+        while len(page) > 0:
+            keys += [(int(w.start.timestamp()), w.wid) for w in page]
+            page = db.warning_get_page(keys[-1], 100)
+        self.assertEqual(keys, expected)
+
+        back = db.warning_get_page(None, 100, False)
+        self.assertEqual([(int(w.start.timestamp()), w.wid) for w in back],
+                         expected[-100:])
+        before = db.warning_get_page(expected[-100], 100, False)
+        self.assertEqual([(int(w.start.timestamp()), w.wid) for w in before],
+                         expected[-200:-100])
+
+        forecasts = db.forecast_get_page(None, 20)
+        self.assertEqual(len(forecasts), 20)
+        rest = db.forecast_get_page((int(forecasts[-1].timestamp.timestamp()),
+                                     forecasts[-1].fid),
+                                    20)
+        self.assertEqual(len(rest), 10)
+        self.assertEqual(db.forecast_get_page(None, 10, False)[-1].fid,
+                         rest[-1].fid)
+        db.close()
+
+    def test_15_transaction(self) -> None:
+        """Test grouping changes in nested with blocks."""
+        path: Final[str] = os.path.join(self.__class__.folder, "tx.db")
+        db = database.Database(path)
+        good, bad = list(Generator(seed=13).warnings(2))
+        bad.start, bad.end = bad.end, bad.start
+        with db:
+            with db:
+                db.warning_add(good)
+            # The inner block does not commit the outer one.
+            self.assertTrue(db.db.in_transaction)
+            with self.assertRaises(sqlite3.IntegrityError):
+                db.warning_add(bad)
+        self.assertFalse(db.db.in_transaction)
+        self.assertEqual([w.wid for w in db.warning_get_all()], [good.wid])
+
+        with self.assertRaises(RuntimeError):
+            with db:
+                with db:
+                    db.location_add((1.0, 2.0), "Nowhere")
+                raise RuntimeError("Interrupted")
+        self.assertEqual(db.location_get_all(), [])
+        db.close()
+
+
+LEGACY_SCHEMA: Final[str] = """
+CREATE TABLE warning (
+    id              INTEGER PRIMARY KEY,
+    state           TEXT NOT NULL,
+    wtype           INTEGER NOT NULL,
+    level           INTEGER NOT NULL,
+    start           INTEGER NOT NULL,
+    end             INTEGER NOT NULL,
+    region_name     TEXT NOT NULL,
+    description     TEXT NOT NULL,
+    event           TEXT NOT NULL,
+    headline        TEXT NOT NULL,
+    instruction     TEXT NOT NULL,
+    state_short     TEXT NOT NULL,
+    altitude_start  INTEGER,
+    altitude_end    INTEGER,
+    acknowledged    INTEGER NOT NULL DEFAULT 0,
+    key             TEXT GENERATED ALWAYS AS (
+                            start ||
+                            '--' ||
+                            end ||
+                            '--' ||
+                            region_name ||
+                            '--' ||
+                            event ||
+                            '--' ||
+                            description ||
+                            '--' ||
+                            level
+                    ) VIRTUAL,
+    CHECK           (start <= end),
+    CHECK           (altitude_start <= altitude_end),
+    UNIQUE (start, end, region_name, event, description, level)
+) STRICT;
+CREATE INDEX wrn_reg_idx ON warning (region_name);
+CREATE INDEX wrn_start_idx ON warning (start);
+CREATE INDEX wrn_end_idx ON warning (end);
+CREATE INDEX wrn_evt_idx ON warning (event);
+CREATE INDEX wrn_ack_idx ON warning (acknowledged);
+CREATE TABLE forecast (
+    id INTEGER PRIMARY KEY,
+    timestamp INTEGER UNIQUE NOT NULL,
+    location TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    icon TEXT NOT NULL,
+    prob_rain INTEGER NOT NULL,
+    temperature INTEGER NOT NULL,
+    temperature_apparent INTEGER NOT NULL,
+    humidity INTEGER NOT NULL,
+    wind_speed INTEGER NOT NULL,
+    visibility REAL NOT NULL
+) STRICT;
+CREATE UNIQUE INDEX fc_time_idx ON forecast (timestamp);
+CREATE TABLE hourly (
+    id INTEGER PRIMARY KEY,
+    forecast_id INTEGER NOT NULL,
+    timestamp INTEGER NOT NULL,
+    icon TEXT NOT NULL,
+    prob_rain INTEGER NOT NULL,
+    rain_amt REAL NOT NULL,
+    temperature INTEGER NOT NULL,
+    humidity INTEGER NOT NULL,
+    pressure REAL NOT NULL,
+    wind_speed INTEGER NOT NULL,
+    cloud_cover INTEGER NOT NULL,
+    visibility REAL NOT NULL,
+    FOREIGN KEY (forecast_id) REFERENCES forecast (id)
+      ON DELETE CASCADE
+      ON UPDATE RESTRICT
+) STRICT;
+CREATE INDEX h_time_idx ON hourly (timestamp);
+"""
 
 # Test data
 TEST_DATA: Final[str] = """
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-19 10:40:18 krylon>
+#
+# /data/code/python/wetterfrosch/test_export.py
+# created on 19. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+wetterfrosch.test_export
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import csv
+import json
+import os
+import unittest
+from datetime import datetime
+from typing import Final
+
+import krylib
+from krylib import isdir
+
+from wetterfrosch import common, database
+from wetterfrosch.data import WeatherWarning
+from wetterfrosch.export import Exporter, Format
+
+TEST_ROOT: str = "/tmp/"
+
+if isdir("/data/ram"):
+    TEST_ROOT = "/data/ram"
+
+example_warning: Final[str] = "example.json"
+
+
+class ExportTest(unittest.TestCase):
+    """Test exporting the database."""
+
+    folder: str
+    db: database.Database
+    cnt: int = 0
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        stamp = datetime.now()
+        folder_name = \
+            stamp.strftime("wetterfrosch_test_export_%Y%m%d_%H%M%S")
+        cls.folder = os.path.join(TEST_ROOT,
+                                  folder_name)
+        common.set_basedir(cls.folder)
+        cls.db = database.Database(common.path.db())
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        os.system(f"/bin/rm -rf {cls.folder}")
+
+    def __add_warnings(self) -> int:
+        if not krylib.fexist(example_warning):
+            self.skipTest("Sample JSON file not found")
+        db = self.__class__.db
+        cnt: int = 0
+        with open(example_warning, "r", encoding="utf-8") as fh:
+            raw = json.load(fh)
+        with db:
+            for block in raw["warnings"].values():
+                for item in block:
+                    w = WeatherWarning(item)
+                    if not db.warning_exist(w):
+                        db.warning_add(w)
+                        cnt += 1
+        return cnt
+
+    def test_01_export_ndjson(self) -> None:
+        """Test exporting warnings to NDJSON."""
+        self.__class__.cnt = self.__add_warnings()
+        ex = Exporter(self.__class__.db, fmt=Format.NDJSON, chunk=16)
+        counts = ex.export(("warning", ))
+        self.assertEqual(counts["warning"], self.__class__.cnt)
+        with open(os.path.join(common.path.export(), "warning.ndjson"),
+                  "r",
+                  encoding="utf-8") as fh:
+            lines = fh.readlines()
+        self.assertEqual(len(lines), self.__class__.cnt)
+        record = json.loads(lines[0])
+        self.assertIn("region_name", record)
+
+    def test_02_export_incremental(self) -> None:
+        """Test that an incremental export only writes new rows."""
+        ex = Exporter(self.__class__.db, fmt=Format.NDJSON, chunk=16)
+        counts = ex.export(("warning", ))
+        self.assertEqual(counts["warning"], 0)
+        marks = ex.watermarks()
+        self.assertIn("warning", marks)
+        self.assertGreater(marks["warning"], 0)
+
+    def test_03_export_csv(self) -> None:
+        """Test exporting warnings to CSV, limited to a period."""
+        ex = Exporter(self.__class__.db, fmt=Format.CSV)
+        counts = ex.export(("warning", ),
+                           begin=datetime(1970, 1, 2),
+                           incremental=False)
+        self.assertEqual(counts["warning"], self.__class__.cnt)
+        with open(os.path.join(common.path.export(), "warning.csv"),
+                  "r",
+                  encoding="utf-8",
+                  newline="") as fh:
+            rows = list(csv.reader(fh))
+        self.assertEqual(len(rows), self.__class__.cnt + 1)
+        self.assertEqual(rows[0][0], "id")
+
+        counts = ex.export(("warning", ),
+                           end=datetime(1970, 1, 2),
+                           incremental=False)
+        self.assertEqual(counts["warning"], 0)
+
+    def test_04_export_full(self) -> None:
+        """Test that a full export resets the watermark, so a following
+        incremental export does not duplicate rows."""
+        ex = Exporter(self.__class__.db, fmt=Format.NDJSON, chunk=16)
+        path: Final[str] = os.path.join(common.path.export(), "warning.ndjson")
+        ex.export(("warning", ), end=datetime(1970, 1, 2), incremental=False)
+        self.assertEqual(ex.watermarks()["warning"], 0)
+        self.assertEqual(os.path.getsize(path), 0)
+
+        counts = ex.export(("warning", ), incremental=False)
+        self.assertEqual(counts["warning"], self.__class__.cnt)
+        self.assertEqual(ex.export(("warning", ))["warning"], 0)
+        with open(path, "r", encoding="utf-8") as fh:
+            self.assertEqual(len(fh.readlines()), self.__class__.cnt)
+
+    def test_05_export_period(self) -> None:
+        """Test that an incremental export limited to a period does not
+        advance the watermark past rows outside of that period."""
+        ex = Exporter(self.__class__.db, fmt=Format.NDJSON, chunk=16)
+        ex.export(("warning", ), end=datetime(1970, 1, 2), incremental=False)
+        self.assertEqual(ex.watermarks()["warning"], 0)
+
+        latest: Final[datetime] = \
+            max(w.start for w in self.__class__.db.warning_get_all())
+        counts = ex.export(("warning", ), begin=latest)
+        self.assertGreater(counts["warning"], 0)
+        self.assertLess(counts["warning"], self.__class__.cnt)
+        self.assertEqual(ex.watermarks()["warning"], 0)
+
+        counts = ex.export(("warning", ))
+        self.assertEqual(counts["warning"], self.__class__.cnt)
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-19 21:14:06 krylon>
+#
+# /data/code/python/wetterfrosch/test_history.py
+# created on 19. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+wetterfrosch.test_history
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import unittest
+from typing import Optional
+
+from wetterfrosch.history import Key, Pager
+
+RECORDS: list[Key] = [(stamp, stamp % 7) for stamp in range(1000)]
+
+
+def fetch(key: Optional[Key], n: int, forward: bool) -> list[Key]:
+    """Stand-in for Database.warning_get_page."""
+    if forward:
+        rest = [r for r in RECORDS if key is None or r > key]
+        return rest[:n]
+    rest = [r for r in RECORDS if key is None or r < key]
+    return rest[-n:]
+
+
+class PagerTest(unittest.TestCase):
+    """Test the sliding window of the history browser."""
+
+    def load(self, pager: Pager, forward: bool) -> Optional[int]:
+        """Load a page, like HistoryView does."""
+        edge = pager.edge(forward)
+        return pager.add(forward, edge, fetch(edge, pager.page, forward))
+
+    def test_01_slide(self) -> None:
+        """Test scrolling back and forth through the records."""
+        pager = Pager(lambda r: r, page=100, size=300)
+        self.assertEqual(self.load(pager, False), 0)
+        self.assertEqual(list(pager.window), RECORDS[-100:])
+
+        for _ in range(10):
+            self.load(pager, False)
+            self.assertLessEqual(len(pager), 300)
+        self.assertEqual(list(pager.window), RECORDS[:300])
+        self.assertFalse(pager.wants(False))
+        self.assertTrue(pager.wants(True))
+
+        self.assertEqual(self.load(pager, True), 100)
+        self.assertEqual(list(pager.window), RECORDS[100:400])
+        self.assertTrue(pager.wants(False))
+
+    def test_02_stale(self) -> None:
+        """Test that pages loaded for an outdated window are ignored."""
+        pager = Pager(lambda r: r, page=100, size=300)
+        self.load(pager, False)
+        edge = pager.edge(True)
+        page = fetch(edge, 100, True)
+        self.load(pager, False)
+        self.load(pager, False)
+        self.load(pager, False)
+        # The window has slid, the page no longer fits.
+        self.assertIsNone(pager.add(True, edge, page))
+        self.assertEqual(list(pager.window), RECORDS[-400:-100])
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-19 19:12:05 krylon>
+#
+# /data/code/python/wetterfrosch/test_loader.py
+# created on 19. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+wetterfrosch.test_loader
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import unittest
+from queue import SimpleQueue
+from threading import Event
+from typing import Any, Callable
+
+from wetterfrosch.loader import Loader
+
+
+class LoaderTest(unittest.TestCase):
+    """Test loading data in the background."""
+
+    def test_01_stale(self) -> None:
+        """Test that superseded loads are dropped."""
+        # Stand-in for the main loop: glib.idle_add queues a call.
+        mainloop: SimpleQueue = SimpleQueue()
+
+        def dispatch(fn: Callable[..., Any], *args: Any) -> None:
+            mainloop.put((fn, args))
+
+        loader = Loader(dispatch)
+        loader.start()
+        blocked = Event()
+        results: list[str] = []
+
+        def slow() -> str:
+            blocked.wait(5)
+            return "slow"
+
+        loader.submit("warnings", slow, results.append)
+        loader.submit("forecast", lambda: "forecast", results.append)
+        loader.submit("warnings", lambda: "fast", results.append)
+        blocked.set()
+        loader.stop()
+        assert loader.worker is not None
+        loader.worker.join(5)
+
+        while not mainloop.empty():
+            fn, args = mainloop.get()
+            fn(*args)
+        # The result of the first load arrives after it has been
+        # superseded, so it never reaches the callback.
+        self.assertEqual(results, ["forecast", "fast"])
+
+    def test_02_error(self) -> None:
+        """Test that a failing load does not stop the Loader."""
+        results: list[int] = []
+        loader = Loader(lambda fn, *args: fn(*args))
+        loader.start()
+        loader.submit("a", lambda: 1 // 0, results.append)
+        loader.submit("b", lambda: 42, results.append)
+        loader.stop()
+        assert loader.worker is not None
+        loader.worker.join(5)
+        self.assertEqual(results, [42])
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
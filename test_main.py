@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-19 22:21:44 krylon>
+#
+# /data/code/python/wetterfrosch/test_main.py
+# created on 19. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+wetterfrosch.test_main
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import json
+import os
+import subprocess
+import sys
+import unittest
+from datetime import datetime
+from typing import Final
+
+from krylib import isdir
+
+import wetterfrosch
+
+TEST_ROOT: str = "/tmp/"
+
+if isdir("/data/ram"):
+    TEST_ROOT = "/data/ram"
+
+# The time (in seconds) importing the entry point may take.
+IMPORT_BUDGET: Final[float] = 0.5
+
+# Modules that only the GUI needs.
+GUI_MODULES: Final[list[str]] = ["gi", "cairo", "notify2", "wetterfrosch.gui"]
+
+PROBE: Final[str] = f"""
+import json, sys, time
+t1 = time.perf_counter()
+import wetterfrosch.main
+elapsed = time.perf_counter() - t1
+print(json.dumps({{"elapsed": elapsed,
+                  "loaded": [m for m in {GUI_MODULES!r} if m in sys.modules]}}))
+"""
+
+
+class MainTest(unittest.TestCase):
+    """Test starting the application without a GUI."""
+
+    folder: str
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        stamp = datetime.now()
+        folder_name = \
+            stamp.strftime("wetterfrosch_test_main_%Y%m%d_%H%M%S")
+        cls.folder = os.path.join(TEST_ROOT,
+                                  folder_name)
+        os.makedirs(cls.folder)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        os.system(f"/bin/rm -rf {cls.folder}")
+
+    def test_01_headless_import(self) -> None:
+        """Test that importing the entry point does not load the GUI, and
+        that it is quick about it."""
+        # Import in a fresh interpreter, so modules loaded by other tests
+        # do not count.
+        pkg_parent: Final[str] = \
+            os.path.dirname(os.path.dirname(os.path.abspath(wetterfrosch.__file__)))
+        env: Final[dict[str, str]] = dict(os.environ,
+                                          PYTHONPATH=pkg_parent,
+                                          HOME=self.__class__.folder)
+        best: float = float("inf")
+        for _ in range(3):
+            proc = subprocess.run([sys.executable, "-c", PROBE],
+                                  capture_output=True,
+                                  check=False,
+                                  env=env,
+                                  text=True)
+            self.assertEqual(proc.returncode, 0, proc.stderr)
+            result = json.loads(proc.stdout.strip().splitlines()[-1])
+            self.assertEqual(result["loaded"], [])
+            best = min(best, result["elapsed"])
+        self.assertLess(best, IMPORT_BUDGET)
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
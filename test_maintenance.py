@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-19 13:31:12 krylon>
+#
+# /data/code/python/wetterfrosch/test_maintenance.py
+# created on 19. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+wetterfrosch.test_maintenance
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import os
+import unittest
+from datetime import datetime
+
+from krylib import isdir
+
+from wetterfrosch import common, database
+from wetterfrosch.maintenance import Maintenance
+
+TEST_ROOT: str = "/tmp/"
+
+if isdir("/data/ram"):
+    TEST_ROOT = "/data/ram"
+
+
+class MaintenanceTest(unittest.TestCase):
+    """Test database maintenance."""
+
+    folder: str
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        stamp = datetime.now()
+        folder_name = \
+            stamp.strftime("wetterfrosch_test_maintenance_%Y%m%d_%H%M%S")
+        cls.folder = os.path.join(TEST_ROOT,
+                                  folder_name)
+        common.set_basedir(cls.folder)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        os.system(f"/bin/rm -rf {cls.folder}")
+
+    def test_01_run(self) -> None:
+        """Test running maintenance on a fresh database."""
+        db = database.Database(common.path.db())
+        db.close()
+        report = Maintenance(common.path.db()).run()
+        self.assertEqual(report["integrity"], ["ok"])
+        self.assertGreaterEqual(report["reclaimable"], 0)
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-19 15:58:02 krylon>
+#
+# /data/code/python/wetterfrosch/test_partition.py
+# created on 19. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+wetterfrosch.test_partition
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import os
+import stat
+import unittest
+from datetime import datetime
+from typing import Final
+
+from krylib import isdir
+
+from wetterfrosch import common, database
+from wetterfrosch.generator import Generator
+from wetterfrosch.partition import Partitioner, Scheme, period_of
+
+TEST_ROOT: str = "/tmp/"
+
+if isdir("/data/ram"):
+    TEST_ROOT = "/data/ram"
+
+# The synthetic data starts on January 30, so it spills over into February.
+START: Final[datetime] = datetime(2024, 1, 30)
+
+
+class PartitionTest(unittest.TestCase):
+    """Test moving closed periods to archive files."""
+
+    folder: str
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        stamp = datetime.now()
+        folder_name = \
+            stamp.strftime("wetterfrosch_test_partition_%Y%m%d_%H%M%S")
+        cls.folder = os.path.join(TEST_ROOT,
+                                  folder_name)
+        common.set_basedir(cls.folder)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        os.system(f"/bin/chmod -R u+w {cls.folder}")
+        os.system(f"/bin/rm -rf {cls.folder}")
+
+    def test_01_period(self) -> None:
+        """Test computing the boundaries of periods."""
+        self.assertEqual(period_of(datetime(2024, 12, 24, 18), Scheme.MONTH),
+                         (datetime(2024, 12, 1), datetime(2025, 1, 1)))
+        self.assertEqual(period_of(datetime(2024, 2, 29), Scheme.YEAR),
+                         (datetime(2024, 1, 1), datetime(2025, 1, 1)))
+
+    def test_02_rotate(self) -> None:
+        """Test archiving closed periods and querying across archives."""
+        db = database.Database(common.path.db())
+        gen = Generator(seed=23, regions=20, start=START)
+        with db:
+            db.warning_add_batch(list(gen.warnings(2000)))
+            for fc in gen.forecasts(200, hours=6):
+                db.forecast_add(fc)
+                db.hourly_add(fc)
+        t1: Final[datetime] = datetime(2024, 1, 1)
+        t2: Final[datetime] = datetime(2024, 4, 1)
+        warnings: Final[list[int]] = [w.wid for w in db.warning_get_by_period(t1, t2)]
+        forecasts: Final[list[int]] = [fc.fid for fc in db.forecast_get_by_period(t1, t2)]
+        hourly: Final[int] = sum(len(fc.hourly) for fc in db.forecast_get_by_period(t1, t2))
+
+        part = Partitioner(common.path.db(), Scheme.MONTH)
+        created = part.rotate(datetime(2024, 2, 10))
+        self.assertEqual(created, ["2024-01"])
+        self.assertEqual(part.rotate(datetime(2024, 2, 10)), [])
+
+        archives = db.archive_get_all()
+        self.assertEqual(len(archives), 1)
+        path = os.path.join(os.path.dirname(common.path.db()), archives[0][1])
+        self.assertFalse(os.stat(path).st_mode & stat.S_IWUSR)
+        self.assertFalse(os.path.exists(path + "-wal"))
+
+        # The hot database only holds what did not end in January anymore.
+        self.assertTrue(all(w.end >= datetime(2024, 2, 1) for w in db.warning_get_all()))
+        self.assertLess(len(db.warning_get_all()), len(warnings))
+
+        # But querying a period does not care where the data lives.
+        self.assertEqual([w.wid for w in db.warning_get_by_period(t1, t2)], warnings)
+        period = db.forecast_get_by_period(t1, t2)
+        self.assertEqual([fc.fid for fc in period], forecasts)
+        self.assertEqual(sum(len(fc.hourly) for fc in period), hourly)
+
+        # A period that lies entirely within the archive.
+        jan = db.warning_get_by_period(datetime(2024, 1, 30), datetime(2024, 1, 30, 6))
+        self.assertGreater(len(jan), 0)
+        db.close()
+
+    def test_03_memory(self) -> None:
+        """Test archiving from a database kept in memory."""
+        db = database.Database("file:/test_partition?vfs=memdb")
+        gen = Generator(seed=29, regions=20, start=START)
+        db.warning_add_batch(list(gen.warnings(500)))
+        total: Final[int] = len(db.warning_get_all())
+        counts = db.archive_period(os.path.join("memory", "2024-01.db"),
+                                   "memory-2024-01",
+                                   datetime(2024, 1, 1),
+                                   datetime(2024, 2, 1))
+        self.assertGreater(counts["warning"], 0)
+        self.assertTrue(os.path.exists(os.path.join(common.path.base(),
+                                                    "memory",
+                                                    "2024-01.db")))
+        self.assertEqual(len(db.warning_get_all()), total - counts["warning"])
+        period = db.warning_get_by_period(datetime(2024, 1, 1), datetime(2024, 4, 1))
+        self.assertEqual(len(period), total)
+
+        # New warnings do not reuse the IDs of archived ones, even if the
+        # most recent warnings have been archived.
+        db.archive_period(os.path.join("memory", "rest.db"),
+                          "memory-rest",
+                          datetime(2024, 2, 1),
+                          datetime(2100, 1, 1))
+        self.assertEqual(len(db.warning_get_all()), 0)
+        db.warning_add_batch(list(Generator(seed=31, regions=20, start=START).warnings(3)))
+        period = db.warning_get_by_period(datetime(2024, 1, 1), datetime(2100, 1, 1))
+        self.assertEqual(len(period), total + 3)
+        self.assertEqual(len({w.wid for w in period}), len(period))
+        db.close()
+
+    def test_04_page(self) -> None:
+        """Test paging through warnings and Forecasts across archives."""
+        db = database.Database(common.path.db())
+        self.assertEqual(len(db.archive_get_all()), 1)
+        t1: Final[datetime] = datetime(2024, 1, 1)
+        t2: Final[datetime] = datetime(2024, 4, 1)
+        warnings: Final[list[int]] = [w.wid for w in db.warning_get_by_period(t1, t2)]
+        forecasts: Final[list[int]] = [fc.fid for fc in db.forecast_get_by_period(t1, t2)]
+
+        keys: list[tuple[int, int]] = []
+        page = db.warning_get_page(None, 128)
+        while len(page) > 0:
+            keys.extend((int(w.start.timestamp()), w.wid) for w in page)
+            page = db.warning_get_page(keys[-1], 128)
+        self.assertEqual(keys, sorted(keys))
+        self.assertEqual(sorted(k[1] for k in keys), sorted(warnings))
+        back = db.warning_get_page(keys[40], 16, False)
+        self.assertEqual([(int(w.start.timestamp()), w.wid) for w in back], keys[24:40])
+        first = db.forecast_get_page(None, len(forecasts))
+        self.assertEqual(sorted(fc.fid for fc in first), sorted(forecasts))
+        db.close()
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
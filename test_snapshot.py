@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-19 16:51:17 krylon>
+#
+# /data/code/python/wetterfrosch/test_snapshot.py
+# created on 19. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+wetterfrosch.test_snapshot
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import os
+import threading
+import time
+import unittest
+from datetime import datetime
+from typing import Final
+
+from krylib import isdir
+
+from wetterfrosch import common, database
+from wetterfrosch.generator import Generator
+from wetterfrosch.snapshot import Snapshotter
+
+TEST_ROOT: str = "/tmp/"
+
+if isdir("/data/ram"):
+    TEST_ROOT = "/data/ram"
+
+MEMORY_URI: Final[str] = "file:/test_snapshot?vfs=memdb"
+
+
+class SnapshotTest(unittest.TestCase):
+    """Test running the database in memory."""
+
+    folder: str
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        stamp = datetime.now()
+        folder_name = \
+            stamp.strftime("wetterfrosch_test_snapshot_%Y%m%d_%H%M%S")
+        cls.folder = os.path.join(TEST_ROOT,
+                                  folder_name)
+        common.set_basedir(cls.folder)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        os.system(f"/bin/rm -rf {cls.folder}")
+
+    def test_01_shared(self) -> None:
+        """Test sharing one in-memory database between connections."""
+        self.assertTrue(database.is_memory(MEMORY_URI))
+        self.assertTrue(database.is_memory(":memory:"))
+        self.assertFalse(database.is_memory(common.path.db()))
+
+        snap = Snapshotter(database.Database(MEMORY_URI))
+        self.assertFalse(snap.load())
+        db = database.Database(MEMORY_URI)
+        added = db.warning_add_batch(list(Generator().warnings(100)))
+        self.assertEqual(added, 100)
+        db.close()
+
+        other = database.Database(MEMORY_URI)
+        self.assertEqual(len(other.warning_get_all()), added)
+        other.close()
+        snap.stop()
+        self.assertTrue(os.path.exists(common.path.snapshot()))
+
+        # With the last connection closed, the database is gone.
+        fresh = database.Database(MEMORY_URI)
+        self.assertEqual(len(fresh.warning_get_all()), 0)
+        fresh.close()
+
+    def test_02_restore(self) -> None:
+        """Test loading the database from a snapshot."""
+        snap = Snapshotter(database.Database(MEMORY_URI))
+        self.assertTrue(snap.load())
+        db = database.Database(MEMORY_URI)
+        self.assertEqual(len(db.warning_get_all()), 100)
+        db.close()
+        snap.stop()
+
+    def test_03_periodic(self) -> None:
+        """Test saving snapshots from the background thread."""
+        path: Final[str] = os.path.join(self.folder, "periodic.db")
+        db = database.Database(MEMORY_URI)
+        db.restore(common.path.snapshot())
+        snap = Snapshotter(db, path, interval=0.05)
+        snap.start()
+        deadline: Final[float] = time.time() + 5
+        while not os.path.exists(path) and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertTrue(os.path.exists(path))
+        snap.stop()
+        self.assertFalse(os.path.exists(f"{path}.tmp"))
+
+        restored = database.Database(MEMORY_URI)
+        restored.restore(path)
+        self.assertEqual(len(restored.warning_get_all()), 100)
+        restored.close()
+
+    def test_04_writers(self) -> None:
+        """Test that connections to the in-memory database wait for each
+        other's transactions instead of failing."""
+        holder = database.Database(MEMORY_URI)
+        other = database.Database(MEMORY_URI)
+        gen = Generator(seed=37)
+        started = threading.Event()
+
+        def write() -> None:
+            db = database.Database(MEMORY_URI)
+            with db:
+                db.warning_add_batch(list(gen.warnings(10)))
+                started.set()
+                time.sleep(0.2)
+            db.close()
+
+        worker = threading.Thread(target=write)
+        worker.start()
+        started.wait()
+        # Reads and writes wait for the batch to be committed.
+        self.assertEqual(len(other.warning_get_all()), 10)
+        self.assertEqual(other.warning_add_batch(list(gen.warnings(5))), 5)
+        worker.join()
+        self.assertEqual(len(other.warning_get_all()), 15)
+        other.close()
+        holder.close()
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-19 19:40:12 krylon>
+#
+# /data/code/python/wetterfrosch/test_treemodel.py
+# created on 19. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+wetterfrosch.test_treemodel
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import unittest
+from typing import Any
+
+from wetterfrosch.treemodel import ListSync, WarningFilter, When, rebuild
+
+
+# pylint: disable-msg=R0903
+class Row:
+    """A row in a FakeStore. Like the iters of a Gtk.ListStore, it stays
+    valid as long as the row exists."""
+
+    __slots__ = ["values"]
+
+    values: list[Any]
+
+    def __init__(self, values: list[Any]) -> None:
+        self.values = values
+
+
+class FakeStore:
+    """FakeStore implements the part of the Gtk.ListStore API used by
+    ListSync and counts the calls that modify it."""
+
+    types: list[type]
+    rows: list[Row]
+    calls: int
+
+    def __init__(self, *types: type) -> None:
+        self.types = list(types)
+        self.rows = []
+        self.calls = 0
+
+    def get_n_columns(self) -> int:
+        """Return the number of columns."""
+        return len(self.types)
+
+    def get_column_type(self, idx: int) -> type:
+        """Return the type of column <idx>."""
+        return self.types[idx]
+
+    def append(self, values: list[Any]) -> Row:
+        """Add a row with <values> at the end."""
+        return self.insert(len(self.rows), values)
+
+    def insert(self, pos: int, values: list[Any]) -> Row:
+        """Insert a row with <values> at <pos>."""
+        self.calls += 1
+        row = Row(values)
+        self.rows.insert(pos, row)
+        return row
+
+    def remove(self, row: Row) -> None:
+        """Remove <row>."""
+        self.calls += 1
+        self.rows.remove(row)
+
+    def set(self, row: Row, columns: list[int], values: list[Any]) -> None:
+        """Set the given <columns> of <row> to <values>."""
+        self.calls += 1
+        for col, val in zip(columns, values):
+            row.values[col] = val
+
+    def move_before(self, row: Row, sibling: Row) -> None:
+        """Move <row> in front of <sibling>."""
+        self.calls += 1
+        self.rows.remove(row)
+        self.rows.insert(self.rows.index(sibling), row)
+
+    def clear(self) -> None:
+        """Remove all rows."""
+        self.calls += 1
+        self.rows.clear()
+
+    def content(self) -> list[list[Any]]:
+        """Return the values of all rows."""
+        return [r.values for r in self.rows]
+
+
+class FakeView:
+    """FakeView stands in for a Gtk.TreeView."""
+
+    model: Any
+    swaps: int
+
+    def __init__(self, model: Any) -> None:
+        self.model = model
+        self.swaps = 0
+
+    def set_model(self, model: Any) -> None:
+        """Display <model>."""
+        self.model = model
+        self.swaps += 1
+
+
+class ListSyncTest(unittest.TestCase):
+    """Test keeping a ListStore in sync with a list of records."""
+
+    def test_01_sync(self) -> None:
+        """Test adding, updating, moving and removing rows."""
+        formatted: list[int] = []
+
+        def fmt(rec: tuple[int, str]) -> tuple:
+            formatted.append(rec[0])
+            return (rec[0], rec[1].upper())
+
+        store = FakeStore()
+        sync = ListSync(store, lambda r: r[0], fmt, lambda r: r[1])
+        data = [(1, "a"), (2, "b"), (3, "c")]
+        self.assertEqual(sync.sync(data), (3, 0, 0))
+        self.assertEqual(store.content(), [[1, "A"], [2, "B"], [3, "C"]])
+
+        # An unchanged list neither touches the store nor formats rows again.
+        first = store.rows[0]
+        calls = store.calls
+        formatted.clear()
+        self.assertEqual(sync.sync(list(data)), (0, 0, 0))
+        self.assertEqual(store.calls, calls)
+        self.assertEqual(formatted, [])
+
+        data = [(4, "d"), (3, "c"), (1, "x")]
+        self.assertEqual(sync.sync(data), (1, 1, 1))
+        self.assertEqual(store.content(), [[4, "D"], [3, "C"], [1, "X"]])
+        self.assertEqual(sorted(formatted), [1, 4])
+        # Rows that were kept are the same rows as before.
+        self.assertIs(store.rows[2], first)
+
+        self.assertEqual(sync.sync([]), (0, 0, 3))
+        self.assertEqual(store.content(), [])
+
+    def test_02_rebuild(self) -> None:
+        """Test filling a new model off-screen and swapping it in."""
+        old = FakeStore(int, str)
+        old.append([1, "a"])
+        view = FakeView(old)
+        store = rebuild(view, old, ((i, str(i)) for i in range(48)))
+        self.assertIsNot(store, old)
+        self.assertIs(view.model, store)
+        self.assertEqual(view.swaps, 1)
+        self.assertEqual(store.types, [int, str])
+        self.assertEqual(len(store.content()), 48)
+        self.assertEqual(old.content(), [[1, "a"]])
+
+        wrapped = rebuild(view, store, [(1, "x")], lambda m: ("sorted", m))
+        self.assertEqual(view.model, ("sorted", wrapped))
+        self.assertEqual(wrapped.content(), [[1, "x"]])
+
+    def test_03_filter(self) -> None:
+        """Test deciding which warnings are visible."""
+        now = 1_000_000.0
+        active = (2, "Stadt Bielefeld", "FROST", now - 60, now + 60)
+        upcoming = (3, "Kreis Lippe", "GEWITTER", now + 600, now + 3600)
+
+        flt = WarningFilter()
+        self.assertTrue(flt.is_empty())
+        self.assertTrue(flt.match(*active, now))
+        self.assertTrue(flt.match(*upcoming, now))
+
+        cases = [
+            (WarningFilter(level=3), False, True),
+            (WarningFilter(event="FROST"), True, False),
+            (WarningFilter(text=" bielefeld"), True, False),
+            (WarningFilter(text="kreis", level=4), False, False),
+            (WarningFilter(when=When.ACTIVE), True, False),
+            (WarningFilter(when=When.UPCOMING), False, True),
+        ]
+        for flt, show_active, show_upcoming in cases:
+            self.assertFalse(flt.is_empty())
+            self.assertEqual(flt.match(*active, now), show_active)
+            self.assertEqual(flt.match(*upcoming, now), show_upcoming)
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
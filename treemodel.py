@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-19 19:31:44 krylon>
+#
+# /data/code/python/wetterfrosch/treemodel.py
+# created on 19. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+wetterfrosch.treemodel
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+from collections.abc import Hashable, Iterable, Sequence
+from enum import Enum
+from typing import Any, Callable, Final, Optional
+
+
+class When(Enum):
+    """When selects warnings by their period of validity."""
+    ALL = "all"
+    ACTIVE = "active"
+    UPCOMING = "upcoming"
+
+
+def rebuild(view: Any,
+            store: Any,
+            rows: Iterable[Sequence],
+            wrap: Optional[Callable[[Any], Any]] = None) -> Any:
+    """Replace the content of <view> with <rows>.
+    Instead of refilling <store> while the view displays it, which costs a
+    signal and a relayout of the view per row, a new store with the same
+    columns is filled off-screen and then handed to the view in one step.
+    If <wrap> is given, it is called with the new store and returns the model
+    to display, e.g. a TreeModelFilter or TreeModelSort on top of it.
+    Returns the new store."""
+    types: Final[list[Any]] = [store.get_column_type(i)
+                               for i in range(store.get_n_columns())]
+    fresh: Final[Any] = type(store)(*types)
+    for row in rows:
+        fresh.append(list(row))
+    view.set_model(wrap(fresh) if wrap is not None else fresh)
+    return fresh
+
+
+# pylint: disable-msg=R0902
+class ListSync:
+    """ListSync keeps a Gtk.ListStore in sync with a list of records.
+    Rows are identified by a key (e.g. the ID of a WeatherWarning). When
+    the list changes, only the rows that were added, removed, moved or
+    modified are touched, so the view keeps its selection and scroll
+    position.
+    Formatting a record into a row is cached per key, and only repeated
+    if the record's stamp changes (e.g. when a warning is acknowledged).
+    ListStore iters stay valid as long as their row exists, so ListSync
+    remembers the iter of each row."""
+
+    __slots__ = [
+        "store",
+        "key",
+        "fmt",
+        "stamp",
+        "cache",
+        "iters",
+        "order",
+        "shown",
+    ]
+
+    store: Any
+    key: Callable[[Any], Hashable]
+    fmt: Callable[[Any], tuple]
+    stamp: Callable[[Any], Hashable]
+    cache: dict[Hashable, tuple[Hashable, tuple]]
+    iters: dict[Hashable, Any]
+    order: list[Hashable]
+    shown: dict[Hashable, tuple]
+
+    def __init__(self,
+                 store: Any,
+                 key: Callable[[Any], Hashable],
+                 fmt: Callable[[Any], tuple],
+                 stamp: Optional[Callable[[Any], Hashable]] = None) -> None:
+        self.store = store
+        self.key = key
+        self.fmt = fmt
+        self.stamp = stamp if stamp is not None else lambda _: None
+        self.cache = {}
+        self.iters = {}
+        self.order = []
+        self.shown = {}
+
+    def row(self, record: Any) -> tuple:
+        """Return the row for <record>, formatting it only if necessary."""
+        k: Final[Hashable] = self.key(record)
+        stamp: Final[Hashable] = self.stamp(record)
+        cached = self.cache.get(k)
+        if cached is None or cached[0] != stamp:
+            cached = (stamp, self.fmt(record))
+            self.cache[k] = cached
+        return cached[1]
+
+    def clear(self) -> None:
+        """Remove all rows."""
+        self.store.clear()
+        self.cache.clear()
+        self.iters.clear()
+        self.order.clear()
+        self.shown.clear()
+
+    def sync(self, records: list[Any]) -> tuple[int, int, int]:
+        """Make the store display <records>, in that order.
+        Returns the number of rows added, updated and removed."""
+        keys: Final[list[Hashable]] = [self.key(r) for r in records]
+        rows: Final[dict[Hashable, tuple]] = {k: self.row(r) for k, r in zip(keys, records)}
+        if keys == self.order and \
+           all(rows[k] is self.shown[k] for k in keys):
+            return (0, 0, 0)
+
+        wanted: Final[set[Hashable]] = set(keys)
+        removed: int = 0
+        for k in self.order:
+            if k not in wanted:
+                self.store.remove(self.iters.pop(k))
+                del self.shown[k]
+                self.cache.pop(k, None)
+                removed += 1
+        current: Final[list[Hashable]] = [k for k in self.order if k in wanted]
+
+        added: int = 0
+        updated: int = 0
+        for idx, k in enumerate(keys):
+            row = rows[k]
+            if k not in self.iters:
+                self.iters[k] = self.store.insert(idx, list(row))
+                current.insert(idx, k)
+                added += 1
+            else:
+                if current[idx] != k:
+                    self.store.move_before(self.iters[k], self.iters[current[idx]])
+                    current.remove(k)
+                    current.insert(idx, k)
+                if row is not self.shown[k] and row != self.shown[k]:
+                    self.store.set(self.iters[k], list(range(len(row))), list(row))
+                    updated += 1
+            self.shown[k] = row
+
+        self.order = current
+        return (added, updated, removed)
+
+
+class WarningFilter:
+    """WarningFilter decides which rows of the warning list are visible.
+    It selects warnings of at least <level>, of the given <event> (all if
+    empty), in regions whose name contains <text>, ignoring case, and that
+    are active or upcoming, depending on <when>."""
+
+    __slots__ = [
+        "level",
+        "event",
+        "text",
+        "when",
+    ]
+
+    level: int
+    event: str
+    text: str
+    when: When
+
+    def __init__(self,
+                 level: int = 0,
+                 event: str = "",
+                 text: str = "",
+                 when: When = When.ALL) -> None:
+        self.level = level
+        self.event = event
+        self.text = text.strip().casefold()
+        self.when = when
+
+    def is_empty(self) -> bool:
+        """Return True if the filter lets every warning pass."""
+        return self.level == 0 and self.event == "" and self.text == "" \
+            and self.when == When.ALL
+
+    # pylint: disable-msg=R0911,R0913,R0917
+    def match(self,
+              level: int,
+              region: str,
+              event: str,
+              start: float,
+              end: float,
+              now: float) -> bool:
+        """Return True if a warning passes the filter. <start>, <end> and
+        <now> are given as Unix timestamps."""
+        if level < self.level:
+            return False
+        if self.event not in ("", event):
+            return False
+        if self.text != "" and self.text not in region.casefold():
+            return False
+        match self.when:
+            case When.ACTIVE:
+                return start <= now <= end
+            case When.UPCOMING:
+                return now < start
+        return True
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #